@@ -0,0 +1,374 @@
+"""
+Benchmark Cases
+Goal: Run one benchmark case over its fixed corpus and print what it measured as JSON, for suite.py.
+
+Usage:
+    python cases.py sudoku.bitmask
+    python cases.py wordle.entropy --step 10
+
+Each case runs in a process of its own, started by suite.py. The games are imported by the names of their
+modules (every game has its own demo.py), so a process only ever puts the directory of one game on its path,
+and the peak memory of the process is that of the case alone.
+
+The corpora are:
+    sudoku        corpora/sudoku.txt, 25 easy, medium, hard and expert puzzles each (made by generator.py
+                  with --seed 1), every tier sorted from the least to the most work for backtracking.
+    wordle        every answer in five_letter_words.txt, played once each. --step plays every step-th one.
+    tic-tac-toe   every position reachable from the empty board that is not over yet (4520 of them).
+
+What is timed is the API of each game: Board.solve for every sudoku engine (solve_array for the vectorized
+one, which solves the corpus as one batch), guess() of wordle's demo.py for every turn of a game, and
+minimax and find_best_move of tic-tac-toe's demo.py, along with the Search of bitboard.py they run on.
+
+Most passes over a corpus take well under a second, which is too short to time on a busy machine, so a
+case repeats passes until MIN_SECONDS of them were timed (one pass for the slow cases). It keeps the
+fastest pass for the throughput and the fastest time of every item for the latencies.
+
+Every case prints items, seconds (of the fastest pass), throughput (items per second), p50_ms and p99_ms
+(latency per item), passes and peak_rss_kb. Where the search is counted it prints nodes, the search nodes
+over the whole corpus, which are counted apart from the timed passes so that counting never adds to the
+times: Board.profile for backtracking, the guesses and backtracks of the bitmask and scalable engines, the
+nodes of the iterative one and those of Search for tic-tac-toe (find_best_move through analyze, which
+runs the same search). The dlx and vectorized engines do not count their search. The wordle cases add
+mean_guesses and failures.
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPORA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpora')
+
+# the backtracking engine takes over a minute for the whole sudoku corpus, so it gets the first (easiest)
+# puzzles of each tier only
+BACKTRACKING_PER_TIER = 10
+
+# passes over a corpus are repeated until this many seconds of them were timed, up to MAX_PASSES of them
+MIN_SECONDS = 1.0
+MAX_PASSES = 50
+
+# the seed the random wordle strategy picks with
+WORDLE_SEED = 0
+
+
+def use_game(directory):
+    """
+    Puts the directory of a game first on the path, so that its modules can be imported.
+    """
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def best_of_passes(run_pass):
+    """
+    Calls run_pass, which makes one pass over the corpus and returns the seconds taken by every item (or
+    batch), until MIN_SECONDS were timed or MAX_PASSES were made. Returns a tuple of (seconds of the
+    fastest pass, fastest seconds of every item, number of passes).
+    """
+    fastest_pass = None
+    fastest_items = None
+    timed = 0.0
+    passes = 0
+
+    while passes == 0 or (timed < MIN_SECONDS and passes < MAX_PASSES):
+        latencies = run_pass()
+        seconds = sum(latencies)
+        timed += seconds
+        passes += 1
+
+        if fastest_pass is None:
+            fastest_pass, fastest_items = seconds, latencies
+        else:
+            fastest_pass = min(fastest_pass, seconds)
+            fastest_items = [min(best, latency) for best, latency in zip(fastest_items, latencies)]
+
+    return (fastest_pass, fastest_items, passes)
+
+
+def summarize(run_pass, items, **extra):
+    """
+    Times the passes of run_pass (see best_of_passes) over a corpus of items, and returns the metrics of
+    the case as a dictionary. extra is added as it is.
+    """
+    seconds, latencies, passes = best_of_passes(run_pass)
+    latencies = sorted(latencies)
+
+    metrics = {
+        'items': items,
+        'seconds': round(seconds, 6),
+        'throughput': round(items / seconds, 3) if seconds else 0.0,
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 4),
+        'passes': passes,
+    }
+    metrics.update(extra)
+    # on Linux ru_maxrss is in kilobytes
+    metrics['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return metrics
+
+
+def sudoku_corpus(per_tier=None):
+    """
+    Returns the puzzles of the sudoku corpus as a list of (81 character string, tier), only the first
+    per_tier of each tier if given.
+    """
+    puzzles = []
+    taken = {}
+
+    with open(os.path.join(CORPORA, 'sudoku.txt')) as file:
+        for line in file:
+            if not line.strip():
+                continue
+            text, tier = line.split()
+            if per_tier is not None and taken.get(tier, 0) >= per_tier:
+                continue
+            taken[tier] = taken.get(tier, 0) + 1
+            puzzles.append((text, tier))
+
+    return puzzles
+
+
+def sudoku_nodes(engine, cells):
+    """
+    Returns the search nodes engine takes to solve the cells, or None for an engine that does not count them.
+    """
+    from bitmask import BitmaskSolver
+    from demo import Board
+    from iterative import IterativeSolver
+    from scalable import ScalableSolver
+
+    if engine == 'backtracking':
+        return Board.from_cells(bytearray(cells)).profile().nodes
+    if engine == 'bitmask':
+        solver = BitmaskSolver(list(cells))
+        solver.solve()
+        return solver.guesses + solver.backtracks
+    if engine == 'iterative':
+        solver = IterativeSolver(list(cells))
+        solver.run()
+        return solver.nodes
+    if engine == 'scalable':
+        solver = ScalableSolver(list(cells))
+        solver.solve()
+        return solver.guesses + solver.backtracks
+
+    return None
+
+
+def run_sudoku(engine, _arguments):
+    use_game('sudoku')
+    from demo import Board
+
+    puzzles = [text for text, _tier in sudoku_corpus(BACKTRACKING_PER_TIER if engine == 'backtracking' else None)]
+
+    def run_pass():
+        # solving changes the boards, so every pass starts from new ones
+        boards = [Board.from_string(text) for text in puzzles]
+        latencies = []
+
+        for text, board in zip(puzzles, boards):
+            start = time.perf_counter()
+            solved = board.solve(engine)
+            latencies.append(time.perf_counter() - start)
+
+            if not solved:
+                raise RuntimeError(f'{engine} did not solve {text}')
+
+        return latencies
+
+    counts = [sudoku_nodes(engine, Board.from_string(text).cells) for text in puzzles]
+    extra = {} if None in counts else {'nodes': sum(counts)}
+
+    return summarize(run_pass, len(puzzles), **extra)
+
+
+def run_vectorized(_arguments):
+    use_game('sudoku')
+    from vectorized import solve_array
+
+    puzzles = [[int(digit) for digit in text] for text, _tier in sudoku_corpus()]
+
+    def run_pass():
+        start = time.perf_counter()
+        _result, solved = solve_array(puzzles)
+        seconds = time.perf_counter() - start
+
+        if not solved.all():
+            raise RuntimeError(f'vectorized left {int((~solved).sum())} puzzles unsolved')
+
+        return [seconds]
+
+    # the whole corpus is one batch, so its latency is that of the batch
+    metrics = summarize(run_pass, len(puzzles))
+    metrics['latency_per'] = 'batch'
+    return metrics
+
+
+def run_wordle(strategy, arguments):
+    use_game('wordle')
+    from demo import guess
+    from solver import Solver
+    from word_index import clues
+
+    start = time.perf_counter()
+    solver = Solver.from_file(os.path.join(ROOT, 'wordle', 'five_letter_words.txt'), strategy)
+    setup_seconds = time.perf_counter() - start
+
+    answers = range(0, len(solver.words), arguments.step)
+    won = []
+
+    def run_pass():
+        won.clear()
+        latencies = []
+
+        for answer_id in answers:
+            answer = solver.words[answer_id]
+
+            start = time.perf_counter()
+            session = solver.session(random.Random(WORDLE_SEED * len(solver.words) + answer_id))
+            word = guess(session)
+            for attempt in range(1, arguments.max_guesses + 1):
+                if word == answer:
+                    won.append(attempt)
+                    break
+                if attempt < arguments.max_guesses:
+                    word = guess(session, word, *clues(word, answer))
+            latencies.append(time.perf_counter() - start)
+
+        return latencies
+
+    metrics = summarize(run_pass, len(answers))
+    metrics.update(
+        setup_seconds=round(setup_seconds, 6),
+        mean_guesses=round(sum(won) / len(won), 4) if won else 0.0,
+        failures=len(answers) - len(won),
+    )
+    return metrics
+
+
+def tictactoe_corpus():
+    from bench_nodes import decisions
+    return decisions()
+
+
+def run_search(_arguments):
+    use_game('tic-tac-toe')
+    from bitboard import Search
+
+    positions = tictactoe_corpus()
+    nodes = 0
+
+    def run_pass():
+        latencies = []
+
+        for mine, theirs in positions:
+            start = time.perf_counter()
+            Search().best_move(mine, theirs)
+            latencies.append(time.perf_counter() - start)
+
+        return latencies
+
+    for mine, theirs in positions:
+        search = Search()
+        search.best_move(mine, theirs)
+        nodes += search.nodes
+
+    return summarize(run_pass, len(positions), nodes=nodes)
+
+
+def run_minimax(_arguments):
+    use_game('tic-tac-toe')
+    from bitboard import FULL, Search, to_board
+    from demo import get_board_definitions, minimax
+
+    X, empty, O = get_board_definitions()
+    positions = tictactoe_corpus()
+    boards = [to_board(mine, theirs, X, O, empty) for mine, theirs in positions]
+    depths = [(FULL ^ (mine | theirs)).bit_count() for mine, theirs in positions]
+    nodes = 0
+
+    def run_pass():
+        latencies = []
+
+        for board, depth in zip(boards, depths):
+            start = time.perf_counter()
+            minimax(board, depth, float('-inf'), float('inf'), True, X, O)
+            latencies.append(time.perf_counter() - start)
+
+        return latencies
+
+    # minimax of demo.py runs a Search of its own and does not hand it out, so the same search is counted here
+    for (mine, theirs), depth in zip(positions, depths):
+        search = Search()
+        search.minimax(mine, theirs, depth, float('-inf'), float('inf'), True)
+        nodes += search.nodes
+
+    return summarize(run_pass, len(boards), nodes=nodes)
+
+
+def run_find_best_move(_arguments):
+    use_game('tic-tac-toe')
+    from bitboard import to_board
+    from demo import analyze, find_best_move, get_board_definitions
+
+    X, empty, O = get_board_definitions()
+    boards = [to_board(mine, theirs, X, O, empty) for mine, theirs in tictactoe_corpus()]
+
+    def run_pass():
+        latencies = []
+
+        for board in boards:
+            start = time.perf_counter()
+            find_best_move(board, X, O)
+            latencies.append(time.perf_counter() - start)
+
+        return latencies
+
+    # analyze searches the same way as find_best_move, and also tells how many positions it visited
+    nodes = sum(analyze(board, X, O)[3] for board in boards)
+
+    return summarize(run_pass, len(boards), nodes=nodes)
+
+
+# the name of every case and the function that runs it
+CASES = {
+    **{f'sudoku.{engine}': (lambda engine: lambda arguments: run_sudoku(engine, arguments))(engine)
+       for engine in ('backtracking', 'bitmask', 'dlx', 'iterative', 'scalable')},
+    'sudoku.vectorized': run_vectorized,
+    'wordle.random': lambda arguments: run_wordle('random', arguments),
+    'wordle.entropy': lambda arguments: run_wordle('entropy', arguments),
+    'tic-tac-toe.search': run_search,
+    'tic-tac-toe.minimax': run_minimax,
+    'tic-tac-toe.find_best_move': run_find_best_move,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run one benchmark case and print its metrics as JSON.')
+    parser.add_argument('case', choices=CASES, help='the case to run')
+    parser.add_argument('--step', type=int, default=1, help='wordle: play against every step-th answer only')
+    parser.add_argument('--max-guesses', type=int, default=6, help='wordle: guesses before a game is lost')
+    arguments = parser.parse_args()
+
+    if arguments.step < 1:
+        parser.error('--step has to be at least 1')
+
+    metrics = CASES[arguments.case](arguments)
+    if arguments.case.startswith('wordle.'):
+        metrics['step'] = arguments.step
+
+    print(json.dumps(metrics))
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Benchmark Suite
+Goal: Tell whether a change made the sudoku, wordle or tic-tac-toe solvers faster or slower, by running
+every benchmark case over fixed corpora and comparing what they measured against a baseline.
+
+Usage:
+    python suite.py list
+    python suite.py run -o baseline.json
+    python suite.py run -o current.json --cases sudoku.bitmask tic-tac-toe.search --repeat 5
+    python suite.py compare baseline.json current.json --threshold 0.1
+
+run starts every case (see cases.py) in a process of its own, --repeat times (3 by default), and writes
+what they measured to a JSON file along with the Python version and the machine, which makes the
+baseline. Every metric keeps its best value over the runs, as the machine only ever makes a run slower,
+and the spread of each timing metric (how much worse its worst run was than its best, as a fraction) is
+kept along with it. The whole suite takes about ten minutes, most of it playing every wordle answer with
+the entropy strategy. --quick plays every 10th answer instead, which takes it down to about two.
+
+compare goes through the metrics of every case in both files. A metric whose change goes the wrong way
+by more than the threshold (a fraction of the baseline) is a regression: throughput going down, or
+latency, peak memory or setup time going up. The threshold of a timing metric is --threshold, or the
+spread the metric had in either file if that is bigger, so that a metric is never flagged for moving no
+more than it moved between runs of the same code. Latencies and setup times that move by less than
+NOISE are left alone. The metrics that do not depend on timing (search nodes, mean guesses and failures)
+are regressions as soon as they go up at all. The exit status is 1 if anything regressed, so that
+compare can fail a build. Cases run over different corpora (such as one with --quick and one without)
+are not compared.
+
+Everything runs offline, on a single core, the corpora are in corpora/ or made by the cases themselves.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from cases import CASES
+
+CASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cases.py')
+
+# the version of the baseline file
+VERSION = 2
+
+# the wordle answers --quick plays, every QUICK_STEP-th one
+QUICK_STEP = 10
+
+# the metrics compared, and whether higher (1) or lower (-1) is better
+DIRECTIONS = {
+    'throughput': 1,
+    'p50_ms': -1,
+    'p99_ms': -1,
+    'peak_rss_kb': -1,
+    'setup_seconds': -1,
+    'nodes': -1,
+    'mean_guesses': -1,
+    'failures': -1,
+}
+
+# the metrics that come out the same on every run, so any change in them is real
+EXACT = {'nodes', 'mean_guesses', 'failures'}
+
+# changes in timing smaller than these are noise whatever the threshold, as some items take microseconds
+NOISE = {'p50_ms': 0.05, 'p99_ms': 0.05, 'setup_seconds': 0.005}
+
+# the metrics that tell which corpus a case ran over, cases that differ in them are not compared
+CORPUS = ('items', 'step', 'latency_per')
+
+
+def run_case(name, arguments):
+    """
+    Runs one case in a process of its own and returns its metrics as a dictionary.
+    """
+    command = [sys.executable, CASES_PATH, name]
+    if arguments.quick:
+        command += ['--step', str(QUICK_STEP)]
+
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'case {name} failed:\n{result.stderr}')
+
+    return json.loads(result.stdout)
+
+
+def best_metrics(runs):
+    """
+    Returns the metrics of several runs of a case, with the best value of every metric compared (the
+    smallest of any other number) and the spread of the timing ones under 'spread'.
+    """
+    metrics = dict(runs[0])
+    spread = {}
+
+    for key, value in runs[0].items():
+        if not isinstance(value, (int, float)) or key in CORPUS:
+            continue
+
+        values = [run[key] for run in runs]
+        if DIRECTIONS.get(key) == 1:
+            best, worst = max(values), min(values)
+        else:
+            best, worst = min(values), max(values)
+        metrics[key] = best
+
+        if key in DIRECTIONS and key not in EXACT:
+            spread[key] = round(abs(worst - best) / abs(best), 4) if best else 0.0
+
+    metrics['spread'] = spread
+    return metrics
+
+
+def run(arguments):
+    names = arguments.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise SystemExit(f'unknown cases: {", ".join(unknown)} (see: python suite.py list)')
+
+    cases = {}
+    for name in names:
+        start = time.perf_counter()
+        cases[name] = best_metrics([run_case(name, arguments) for _ in range(arguments.repeat)])
+        print(f'{name:<28} {time.perf_counter() - start:>8.2f} s  {cases[name]["throughput"]:>12.1f} items/sec', flush=True)
+
+    baseline = {
+        'version': VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'repeat': arguments.repeat,
+        'cases': cases,
+    }
+
+    with open(arguments.output, 'w') as file:
+        json.dump(baseline, file, indent=2)
+        file.write('\n')
+
+    print(f'wrote {len(cases)} cases to {arguments.output}')
+
+
+def change_of(metric, old, new, threshold):
+    """
+    Returns a tuple of (relative change, status) of a metric going from old to new, where the status is
+    'regression', 'improved' or 'ok'. A positive change is always for the better. threshold is the change
+    allowed for timing metrics, the others are allowed none.
+    """
+    if old == new:
+        return (0.0, 'ok')
+    if abs(new - old) <= NOISE.get(metric, 0):
+        return ((new - old) / abs(old) * DIRECTIONS[metric] if old else 0.0, 'ok')
+    if old == 0:
+        change = float('inf') if new > 0 else float('-inf')
+    else:
+        change = (new - old) / abs(old)
+    change *= DIRECTIONS[metric]
+
+    limit = 0.0 if metric in EXACT else threshold
+    if change < -limit:
+        return (change, 'regression')
+    if change > limit:
+        return (change, 'improved')
+    return (change, 'ok')
+
+
+def compare(arguments):
+    with open(arguments.baseline) as file:
+        old = json.load(file)
+    with open(arguments.current) as file:
+        new = json.load(file)
+
+    for name in ('python', 'platform', 'cpus'):
+        if old.get(name) != new.get(name):
+            print(f'warning: {name} differs, {old.get(name)} against {new.get(name)}')
+
+    regressions = 0
+    print(f'{"case":<28} {"metric":<14} {"baseline":>12} {"current":>12} {"change":>9}  status')
+
+    for name, old_metrics in old['cases'].items():
+        new_metrics = new['cases'].get(name)
+        if new_metrics is None:
+            print(f'{name:<28} missing from {arguments.current}')
+            continue
+
+        corpus = [key for key in CORPUS if old_metrics.get(key) != new_metrics.get(key)]
+        if corpus:
+            print(f'{name:<28} not compared, the corpus differs ({", ".join(corpus)})')
+            continue
+
+        for metric in DIRECTIONS:
+            if metric not in old_metrics or metric not in new_metrics:
+                continue
+
+            # a metric that moved that much between runs of the same code is allowed to move as much here
+            threshold = max(
+                arguments.threshold,
+                old_metrics.get('spread', {}).get(metric, 0.0),
+                new_metrics.get('spread', {}).get(metric, 0.0),
+            )
+            change, status = change_of(metric, old_metrics[metric], new_metrics[metric], threshold)
+            if status == 'regression':
+                regressions += 1
+            if status != 'ok' or arguments.all:
+                print(
+                    f'{name:<28} {metric:<14} {old_metrics[metric]:>12g} {new_metrics[metric]:>12g} '
+                    f'{change:>+9.1%}  {status.upper() if status == "regression" else status}'
+                    + (f' (threshold {threshold:.0%})' if metric not in EXACT and threshold > arguments.threshold else '')
+                )
+
+    for name in new['cases']:
+        if name not in old['cases']:
+            print(f'{name:<28} new, not in {arguments.baseline}')
+
+    print(f'{regressions} regressions beyond {arguments.threshold:.0%} (or the spread between runs, if bigger)')
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sudoku, wordle and tic-tac-toe solvers.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='list the cases')
+
+    run_parser = commands.add_parser('run', help='run the cases and write their metrics to a baseline')
+    run_parser.add_argument('-o', '--output', default='baseline.json', help='the JSON file to write')
+    run_parser.add_argument('--cases', nargs='+', help='the cases to run, all of them if omitted')
+    run_parser.add_argument('--repeat', type=int, default=3, help='runs of every case, each metric keeps its best value')
+    run_parser.add_argument('--quick', action='store_true', help=f'play every {QUICK_STEP}th wordle answer only')
+
+    compare_parser = commands.add_parser('compare', help='compare two baselines and flag regressions')
+    compare_parser.add_argument('baseline', help='the JSON file to compare against')
+    compare_parser.add_argument('current', help='the JSON file to compare')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='the change allowed in timing and memory, as a fraction')
+    compare_parser.add_argument('--all', action='store_true', help='also print the metrics that are within the threshold')
+
+    arguments = parser.parse_args()
+
+    if arguments.command == 'list':
+        for name in CASES:
+            print(name)
+    elif arguments.command == 'run':
+        if arguments.repeat < 1:
+            parser.error('--repeat has to be at least 1')
+        run(arguments)
+    else:
+        sys.exit(compare(arguments))
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Batch Sudoku Solver
+Goal: Solve a stream of sudoku boards, one per line, using every core of the machine.
+
+Usage:
+    python batch.py puzzles.txt -o solutions.txt
+    cat puzzles.txt | python batch.py --workers 4 --engine dlx > solutions.txt
+
+Each input line holds 81 characters in row-major order, where 1-9 are the given digits and 0 or . are
+empty cells. With the engines that solve any size (see ANY_SIZE_ENGINES in demo.py) a line can also hold
+a 16x16 board in 256 characters or a 25x25 one in 625, where A-P are the digits 10-25; the other engines
+reject those lines, with the line number, before anything is solved. Blank lines are skipped. Each output line holds the solved board in the same format and in
+the same order as the input. A board that has no solution is written back as it was given, the same way
+Board.solve leaves the matrix as it is.
+
+Approach: The lines are grouped into chunks which are handed to a pool of worker processes. The results
+come back in input order and are written out as soon as each chunk is done. Only a fixed number of chunks
+are allowed to be in flight at a time, so the memory used stays the same no matter how long the input is.
+At the end the number of puzzles per second and a histogram of the time spent on each puzzle are reported.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from multiprocessing import Pool
+
+from demo import ANY_SIZE_ENGINES, Board, ENGINES
+
+
+def solve_chunk(lines, engine):
+    """
+    Solves a list of lines in a worker process. Returns a list of (output line, solved, seconds) tuples.
+    """
+    results = []
+
+    for line in lines:
+        board = Board.from_string(line)
+
+        start = time.perf_counter()
+        solved = board.solve(engine)
+        elapsed = time.perf_counter() - start
+
+        results.append((board.to_string(), solved, elapsed))
+
+    return results
+
+
+def read_chunks(stream, chunk_size, slots, engine='bitmask'):
+    """
+    Generator of lists of at most chunk_size puzzle lines read from stream. It waits on the slots semaphore
+    before handing out a chunk, so that the pool cannot read further ahead than the writer allows.
+    Raises a ValueError with the line number for a line that is not a board engine can solve.
+    """
+    chunk = []
+
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            board = Board.from_string(line)
+        except ValueError as error:
+            raise ValueError(f'line {number}: {error}') from None
+
+        if board.geometry.side != 9 and engine not in ANY_SIZE_ENGINES:
+            raise ValueError(
+                f'line {number}: expected 81 characters, the {engine} engine only solves 9x9 boards '
+                f'(use one of {ANY_SIZE_ENGINES} for bigger ones)'
+            )
+
+        chunk.append(line)
+
+        if len(chunk) == chunk_size:
+            slots.acquire()
+            yield chunk
+            chunk = []
+
+    if chunk:
+        slots.acquire()
+        yield chunk
+
+
+class LatencyHistogram:
+    def __init__(self):
+        """
+        Constructor for the histogram. Bucket n counts the latencies between 2^(n-1) and 2^n microseconds,
+        so the memory used does not depend on the number of latencies recorded.
+        """
+        self.buckets = []
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds):
+        """
+        Records one latency given in seconds.
+        """
+        bucket = int(seconds * 1_000_000).bit_length()
+
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, fraction):
+        """
+        Returns the upper bound in seconds of the bucket that holds the given fraction of latencies.
+        """
+        target = fraction * self.count
+        seen = 0
+
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return (1 << bucket) / 1_000_000
+
+        return 0.0
+
+    def __str__(self):
+        """
+        This method is called when the histogram is passed on to the builtin str function.
+        """
+        result = ''
+        widest = max(self.buckets, default=0)
+
+        for bucket, count in enumerate(self.buckets):
+            if count == 0:
+                continue
+
+            low = (1 << bucket) >> 1
+            high = 1 << bucket
+            bar = '#' * max(1, round(40 * count / widest))
+            result += f'{low:>9} - {high:<9} us {count:>10}  {bar}\n'
+
+        return result
+
+
+def solve_stream(source, destination, engine='bitmask', workers=None, chunk_size=256, pending_chunks=None):
+    """
+    Solves every puzzle line of source and writes the results to destination in input order.
+    Returns a tuple of (puzzles solved, puzzles without a solution, seconds taken, LatencyHistogram).
+    """
+    workers = workers or os.cpu_count() or 1
+    slots = threading.Semaphore(pending_chunks or workers * 4)
+    histogram = LatencyHistogram()
+    unsolved = 0
+
+    start = time.perf_counter()
+
+    with Pool(workers) as pool:
+        chunks = read_chunks(source, chunk_size, slots, engine)
+        for results in pool.imap(_solve_chunk_star, ((chunk, engine) for chunk in chunks)):
+            destination.write(''.join(line + '\n' for line, _solved, _elapsed in results))
+            destination.flush()
+            slots.release()
+
+            for _line, solved, elapsed in results:
+                histogram.add(elapsed)
+                unsolved += not solved
+
+    elapsed = time.perf_counter() - start
+    return (histogram.count - unsolved, unsolved, elapsed, histogram)
+
+
+def _solve_chunk_star(arguments):
+    return solve_chunk(*arguments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve sudoku boards given as lines of 81 characters (256 or 625 for bigger boards).')
+    parser.add_argument('input', nargs='?', help='file with one puzzle per line, stdin if omitted')
+    parser.add_argument('-o', '--output', help='file to write the solutions to, stdout if omitted')
+    parser.add_argument('--engine', default='bitmask', choices=['backtracking', *ENGINES], help='solver engine to use')
+    parser.add_argument('--workers', type=int, help='number of worker processes, defaults to the number of cores')
+    parser.add_argument('--chunk-size', type=int, default=256, help='puzzles handed to a worker at a time')
+    arguments = parser.parse_args()
+
+    source = open(arguments.input, 'r') if arguments.input else sys.stdin
+    destination = open(arguments.output, 'w') if arguments.output else sys.stdout
+
+    try:
+        solved, unsolved, elapsed, histogram = solve_stream(
+            source, destination, arguments.engine, arguments.workers, arguments.chunk_size
+        )
+    except ValueError as error:
+        parser.exit(1, f'error: {error}\n')
+    finally:
+        if arguments.input:
+            source.close()
+        if arguments.output:
+            destination.close()
+
+    total = solved + unsolved
+    rate = total / elapsed if elapsed else 0.0
+
+    report = f'Puzzles: {total} ({solved} solved, {unsolved} without a solution)\n'
+    report += f'Elapsed: {elapsed:.3f} s, {rate:.1f} puzzles/sec\n'
+    if total:
+        report += f'Latency: mean {histogram.total / total * 1000:.3f} ms, '
+        report += f'p50 <= {histogram.percentile(0.5) * 1000:.3f} ms, '
+        report += f'p99 <= {histogram.percentile(0.99) * 1000:.3f} ms, '
+        report += f'max {histogram.maximum * 1000:.3f} ms\n'
+        report += str(histogram)
+
+    sys.stderr.write(report)
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Sudoku Cache Benchmark
+Goal: Measure the hit rate of cache.py on traffic made of repeated and equivalent puzzles, and what the
+canonical forms cost next to solving every puzzle directly.
+
+Usage:
+    python bench_cache.py --requests 2000 --distinct 200 --seed 1
+    python bench_cache.py --store /tmp/solutions.db
+
+The traffic is made of requests for a number of distinct generated puzzles. Each request picks one of them
+at random, and is sent as it is or, with probability --shuffled, as a random equivalent of it (relabeled,
+transposed and with rows, columns, bands and stacks swapped). The same requests are solved once with
+Board.solve and once through the cache, and the solutions are checked against each other.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from cache import SolveCache
+from canonical import shuffle
+from demo import Board
+from generator import generate
+
+
+def make_requests(arguments, rng):
+    """
+    Returns the list of puzzle cells to solve, see the top part of this program.
+    """
+    puzzles = [generate(None, rng)[0].cells for _ in range(arguments.distinct)]
+    requests = []
+
+    for _ in range(arguments.requests):
+        cells = rng.choice(puzzles)
+        requests.append(shuffle(cells, rng) if rng.random() < arguments.shuffled else bytearray(cells))
+
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the canonical form cache of sudoku solutions.')
+    parser.add_argument('--requests', type=int, default=2000, help='puzzles to solve')
+    parser.add_argument('--distinct', type=int, default=200, help='distinct puzzles the requests are made from')
+    parser.add_argument('--shuffled', type=float, default=0.8, help='fraction of requests sent as an equivalent puzzle')
+    parser.add_argument('--capacity', type=int, default=10_000, help='solutions kept in memory')
+    parser.add_argument('--store', help='dbm file to keep the solutions in, none if omitted')
+    parser.add_argument('--engine', default='scalable', help='engine used to solve')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the puzzles and the traffic')
+    arguments = parser.parse_args()
+
+    requests = make_requests(arguments, random.Random(arguments.seed))
+
+    start = time.perf_counter()
+    direct = []
+    for cells in requests:
+        board = Board.from_cells(bytearray(cells))
+        board.solve(arguments.engine)
+        direct.append(board.cells)
+    direct_seconds = time.perf_counter() - start
+
+    cache = SolveCache(arguments.capacity, arguments.store, arguments.engine)
+    start = time.perf_counter()
+    cached = []
+    for cells in requests:
+        board = Board.from_cells(bytearray(cells))
+        cache.solve(board)
+        cached.append(board.cells)
+    cached_seconds = time.perf_counter() - start
+    cache.close()
+
+    # puzzles with a unique solution must come back with exactly that solution
+    mismatches = sum(1 for first, second in zip(direct, cached) if first != second)
+
+    count = len(requests)
+    print(f'{"solver":<8} {"seconds":>9} {"puzzles/sec":>12} {"ms/puzzle":>10}')
+    print(f'{"direct":<8} {direct_seconds:>9.3f} {count / direct_seconds:>12.1f} {direct_seconds / count * 1000:>10.3f}')
+    print(f'{"cached":<8} {cached_seconds:>9.3f} {count / cached_seconds:>12.1f} {cached_seconds / count * 1000:>10.3f}')
+
+    for name, value in cache.stats().items():
+        print(f'{name}: {value:.3f}' if isinstance(value, float) else f'{name}: {value}')
+    print(f'solutions that differ: {mismatches}')
+
+    if arguments.store:
+        print(f'store size: {sum(os.path.getsize(path) for path in store_files(arguments.store))} bytes')
+
+
+def store_files(path):
+    """
+    Returns the files a dbm store at path is made of, which depends on the dbm module in use.
+    """
+    directory = os.path.dirname(path) or '.'
+    name = os.path.basename(path)
+    return [os.path.join(directory, entry) for entry in os.listdir(directory) if entry.startswith(name)]
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Sudoku Generator Benchmark
+Goal: Measure how many graded puzzles generator.py makes per second, for each difficulty tier.
+
+Usage:
+    python bench_generator.py --count 200 --seed 1
+
+For every tier, count puzzles of exactly that tier are generated and the puzzles per second, the time per
+puzzle and the average number of clues are reported. A last row does the same for untargeted generation,
+where every puzzle is kept whatever its tier, along with how the tiers were distributed.
+
+Easy, medium, hard and untargeted puzzles come out at thousands per minute, expert ones at around a
+hundred, see the top part of generator.py for why.
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from generator import DIFFICULTIES, generate
+
+
+def run(count, difficulty, rng):
+    """
+    Generates count puzzles of the given difficulty (any if None).
+    Returns a tuple of (seconds taken, average clues, Counter of tiers).
+    """
+    tiers = Counter()
+    clues = 0
+
+    start = time.perf_counter()
+    for _ in range(count):
+        board, tier = generate(difficulty, rng)
+        tiers[tier] += 1
+        clues += 81 - board.cells.count(0)
+    elapsed = time.perf_counter() - start
+
+    return (elapsed, clues / count, tiers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sudoku puzzle generation per difficulty tier.')
+    parser.add_argument('--count', type=int, default=100, help='puzzles to generate per tier')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random number generator')
+    parser.add_argument('--tiers', nargs='+', choices=DIFFICULTIES, default=DIFFICULTIES, help='tiers to benchmark')
+    arguments = parser.parse_args()
+
+    rng = random.Random(arguments.seed)
+
+    print(f'{"tier":<8} {"puzzles":>8} {"seconds":>9} {"puzzles/sec":>12} {"puzzles/min":>12} {"ms/puzzle":>10} {"clues":>6}')
+
+    for difficulty in [*arguments.tiers, None]:
+        elapsed, clues, tiers = run(arguments.count, difficulty, rng)
+        rate = arguments.count / elapsed
+
+        print(
+            f'{difficulty or "any":<8} {arguments.count:>8} {elapsed:>9.3f} {rate:>12.1f} {rate * 60:>12.0f} '
+            f'{elapsed / arguments.count * 1000:>10.2f} {clues:>6.1f}'
+        )
+
+    print('tiers of untargeted puzzles: ' + ', '.join(f'{tier} {tiers[tier]}' for tier in DIFFICULTIES))
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Vectorized Solver Benchmark
+Goal: Measure how many puzzles per second vectorized.py solves for each batch size, next to solving the
+same puzzles one board at a time with the bitmask engine.
+
+Usage:
+    python bench_vectorized.py --count 1000 --sizes 1 10 100 1000
+    python bench_vectorized.py --puzzles puzzles.txt
+
+The puzzles are generated with generator.py (untargeted, so every difficulty tier shows up) or read from a
+file with one 81 character puzzle per line, the same as batch.py takes. For every batch size the puzzles
+are split into batches of that size and each batch is solved with one call of solve_array. Every row also
+says how many of the puzzles propagation could not finish on its own and had to be searched one by one.
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+import bitmask
+from demo import Board
+from generator import generate
+from vectorized import STUCK, propagate, solve_array
+
+
+def load_puzzles(arguments):
+    """
+    Returns the puzzles to benchmark as an (N, 81) uint8 array.
+    """
+    if arguments.puzzles:
+        with open(arguments.puzzles, 'r') as puzzles_file:
+            boards = [Board.from_string(line.strip()) for line in puzzles_file if line.strip()]
+    else:
+        rng = random.Random(arguments.seed)
+        boards = [generate(None, rng)[0] for _ in range(arguments.count)]
+
+    return np.frombuffer(b''.join(board.cells for board in boards), dtype=np.uint8).reshape(-1, 81)
+
+
+def run_batches(grids, size):
+    """
+    Solves the puzzles in batches of size puzzles. Returns the seconds taken.
+    """
+    start = time.perf_counter()
+    for first in range(0, len(grids), size):
+        solve_array(grids[first:first + size])
+    return time.perf_counter() - start
+
+
+def run_one_by_one(grids):
+    """
+    Solves the puzzles one at a time with the bitmask engine. Returns the seconds taken.
+    """
+    puzzles = grids.tolist()
+
+    start = time.perf_counter()
+    for cells in puzzles:
+        bitmask.solve(cells)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vectorized sudoku solver per batch size.')
+    parser.add_argument('--puzzles', help='file with one puzzle per line, generated puzzles if omitted')
+    parser.add_argument('--count', type=int, default=1000, help='puzzles to generate')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated puzzles')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000], help='batch sizes to benchmark')
+    arguments = parser.parse_args()
+
+    grids = load_puzzles(arguments)
+    count = len(grids)
+
+    _work, status = propagate(grids)
+    print(f'{count} puzzles, {np.count_nonzero(status == STUCK)} need a search after propagation')
+
+    print(f'{"engine":<12} {"batch":>6} {"seconds":>9} {"puzzles/sec":>12} {"ms/puzzle":>10}')
+
+    elapsed = run_one_by_one(grids)
+    print(f'{"bitmask":<12} {1:>6} {elapsed:>9.3f} {count / elapsed:>12.1f} {elapsed / count * 1000:>10.3f}')
+
+    for size in arguments.sizes:
+        elapsed = run_batches(grids, size)
+        print(f'{"vectorized":<12} {size:>6} {elapsed:>9.3f} {count / elapsed:>12.1f} {elapsed / count * 1000:>10.3f}')
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
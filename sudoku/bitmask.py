@@ -0,0 +1,237 @@
+"""
+Bitmask Constraint-Propagation Sudoku Solver
+Goal: Solve the same boards as Board.solve in demo.py without rescanning the row, column and
+3x3 sub-grid of a cell for every digit that is tested.
+
+Approach: Constraint propagation over bitmasks, with backtracking only as a last resort.
+Steps:
+    1. Keep one bitmask per row, column and 3x3 sub-grid with the digits already used in it.
+    The candidates of an empty cell are then simply the digits missing from all three masks.
+    2. Naked singles: any empty cell with exactly one candidate gets that candidate.
+    3. Hidden singles: any digit that fits in exactly one cell of a row, column or sub-grid goes there.
+    4. Repeat steps 2-3 until nothing changes. If a cell has no candidates or a digit has no place
+    in a unit, the board is contradictory and we go back.
+    5. If empty cells remain, pick the one with the fewest candidates (minimum remaining values),
+    try each of its candidates and go back to step 2 for each of them.
+
+More Details:
+    Every digit d is stored as the bit (1 << d), so a set of digits is a single integer and testing,
+    adding or removing a digit is one bitwise operation. Placements are recorded on a trail so that
+    going back is a matter of popping the trail and clearing the bits again, instead of copying boards.
+
+    For a board with exactly one solution the result is the same as Board.solve. When a board has
+    several solutions both solvers return a valid one, but not necessarily the same one as this solver
+    does not try the cells in the same order.
+"""
+
+# every digit d is represented by the bit (1 << d), ALL_DIGITS is the set {1, 2, ..., 9}
+ALL_DIGITS = 0b1111111110
+
+# the row, column and 3x3 sub-grid each of the 81 cells (indexed as y * 9 + x) belongs to
+ROW_OF = [index // 9 for index in range(81)]
+COLUMN_OF = [index % 9 for index in range(81)]
+BOX_OF = [(index // 27) * 3 + (index % 9) // 3 for index in range(81)]
+
+# the 27 units (9 rows, 9 columns, 9 sub-grids) as lists of cell indices
+UNITS = (
+    [[y * 9 + x for x in range(9)] for y in range(9)] +
+    [[y * 9 + x for y in range(9)] for x in range(9)] +
+    [[index for index in range(81) if BOX_OF[index] == box] for box in range(9)]
+)
+
+# lookup tables so that we never have to loop over the bits of a mask
+BIT_COUNT = [bin(mask).count('1') for mask in range(1024)]
+DIGITS = [[digit for digit in range(1, 10) if mask & (1 << digit)] for mask in range(1024)]
+
+
+class BitmaskSolver:
+    def __init__(self, cells):
+        """
+        Constructor for the solver. Cells is a sequence of 81 digits in row-major order where 0 is an empty cell.
+        The solver works on its own copy of the cells.
+        """
+        self.cells = list(cells)
+        self.rows = [0] * 9
+        self.columns = [0] * 9
+        self.boxes = [0] * 9
+
+        # indices of the cells placed by the solver in the order they were placed
+        self.trail = []
+
+        # a board whose givens already repeat a digit in some unit can never be solved
+        self.valid = True
+
+        # how much work the solver had to do, used to grade how difficult a board is
+        self.naked_singles = 0
+        self.hidden_singles = 0
+        self.guesses = 0
+        self.backtracks = 0
+
+        for index, digit in enumerate(self.cells):
+            if digit == 0:
+                continue
+
+            bit = 1 << digit
+            row, column, box = ROW_OF[index], COLUMN_OF[index], BOX_OF[index]
+
+            if (self.rows[row] | self.columns[column] | self.boxes[box]) & bit:
+                self.valid = False
+
+            self.rows[row] |= bit
+            self.columns[column] |= bit
+            self.boxes[box] |= bit
+
+    def candidates(self, index):
+        """
+        Returns the bitmask of digits that can still be placed on the empty cell at index.
+        """
+        return ALL_DIGITS & ~(self.rows[ROW_OF[index]] | self.columns[COLUMN_OF[index]] | self.boxes[BOX_OF[index]])
+
+    def place(self, index, digit):
+        """
+        Places a digit on an empty cell and records it on the trail.
+        """
+        bit = 1 << digit
+        self.cells[index] = digit
+        self.rows[ROW_OF[index]] |= bit
+        self.columns[COLUMN_OF[index]] |= bit
+        self.boxes[BOX_OF[index]] |= bit
+        self.trail.append(index)
+
+    def undo(self, length):
+        """
+        Empties the cells placed after the trail had the given length.
+        """
+        cells, trail = self.cells, self.trail
+
+        while len(trail) > length:
+            index = trail.pop()
+            bit = 1 << cells[index]
+            cells[index] = 0
+            self.rows[ROW_OF[index]] ^= bit
+            self.columns[COLUMN_OF[index]] ^= bit
+            self.boxes[BOX_OF[index]] ^= bit
+
+    def propagate(self):
+        """
+        Fills in naked and hidden singles until no more can be found. Returns None if the board turned out
+        to be contradictory, (-1, 0) if the board got filled, otherwise a tuple (index, candidates) of the
+        empty cell with the fewest candidates.
+        """
+        cells = self.cells
+        rows, columns, boxes = self.rows, self.columns, self.boxes
+
+        while True:
+            progress = False
+            best_index = -1
+            best_count = 10
+            best_mask = 0
+
+            # naked singles, while also looking for the empty cell with the fewest candidates
+            for index in range(81):
+                if cells[index]:
+                    continue
+
+                mask = ALL_DIGITS & ~(rows[ROW_OF[index]] | columns[COLUMN_OF[index]] | boxes[BOX_OF[index]])
+                count = BIT_COUNT[mask]
+
+                if count == 0:
+                    return None
+
+                if count == 1:
+                    self.place(index, DIGITS[mask][0])
+                    self.naked_singles += 1
+                    progress = True
+                elif count < best_count:
+                    best_index, best_count, best_mask = index, count, mask
+
+            if progress:
+                continue
+
+            if best_index == -1:
+                return (-1, 0)
+
+            # hidden singles, a digit that fits only one cell of a unit
+            for unit in UNITS:
+                placed = 0
+                seen_once = 0
+                seen_twice = 0
+
+                for index in unit:
+                    digit = cells[index]
+                    if digit:
+                        placed |= 1 << digit
+                        continue
+
+                    mask = self.candidates(index)
+                    seen_twice |= seen_once & mask
+                    seen_once |= mask
+
+                # some digit cannot be placed anywhere in this unit
+                if (seen_once | placed) != ALL_DIGITS:
+                    return None
+
+                hidden = seen_once & ~seen_twice
+                if not hidden:
+                    continue
+
+                for digit in DIGITS[hidden]:
+                    bit = 1 << digit
+                    for index in unit:
+                        if cells[index] == 0 and self.candidates(index) & bit:
+                            self.place(index, digit)
+                            self.hidden_singles += 1
+                            break
+                    else:
+                        # an earlier placement took the only cell this digit had
+                        return None
+
+                progress = True
+
+            if not progress:
+                return (best_index, best_mask)
+
+    def search(self):
+        """
+        Propagates and then tries the candidates of the most constrained cell recursively.
+        Returns a boolean indicating whether the cells were solved.
+        """
+        branch = self.propagate()
+        if branch is None:
+            return False
+
+        index, mask = branch
+        if index == -1:
+            return True
+
+        self.guesses += 1
+        length = len(self.trail)
+        for digit in DIGITS[mask]:
+            self.place(index, digit)
+            if self.search():
+                return True
+            self.undo(length)
+            self.backtracks += 1
+
+        return False
+
+    def solve(self):
+        """
+        Use this to solve the cells. Returns a boolean indicating whether they were solved,
+        if they were not the cells stay as they were given.
+        """
+        if self.valid and self.search():
+            return True
+
+        self.undo(0)
+        return False
+
+
+def solve(cells):
+    """
+    Solves a sequence of 81 digits in row-major order where 0 is an empty cell.
+    Returns the solved cells as a new list, or None if there is no solution.
+    """
+    solver = BitmaskSolver(cells)
+    return solver.cells if solver.solve() else None
+
@@ -0,0 +1,143 @@
+"""
+Sudoku Solution Cache
+Goal: Solve each puzzle only once, even when it comes back relabeled, transposed or with its rows and
+columns shuffled, since all of those are solved the same way.
+
+Approach: A cache in front of Board.solve, keyed by the canonical form of the board (see canonical.py).
+Steps:
+    1. Turn the board into its canonical form, keeping the transform that did it.
+    2. Look the canonical form up in a bounded cache of recent solutions in memory, and when it is not
+    there, in the store on disk if one was given.
+    3. If neither has it, solve the canonical form with the engine and remember its solution, or that it
+    has none, in both.
+    4. Turn the solution back with the inverse of the transform and fill in the board with it.
+
+More Details:
+    The memory cache keeps the capacity most recently used forms and drops the least recently used one past
+    that. The store on disk is a dbm file that is never trimmed, so that solutions survive restarts and can
+    be shared by processes that run one after another. A form found on disk is brought back into memory.
+
+    The metrics count the lookups, the hits from memory and from disk, the misses and the time spent on
+    canonical forms and on solving, so that the hit rate can be weighed against what the forms cost.
+
+Usage:
+    cache = SolveCache(capacity=10_000, path='solutions.db')
+    solved = cache.solve(board)     same as board.solve('scalable'), but cached
+    print(cache.stats())
+    cache.close()
+"""
+
+import dbm
+import time
+from collections import OrderedDict
+
+from canonical import canonicalize
+from demo import Board
+
+# the value stored for a form that has no solution
+NO_SOLUTION = b''
+
+
+class SolveCache:
+    def __init__(self, capacity=10_000, path=None, engine='scalable'):
+        """
+        Constructor for the cache. capacity is the most solutions kept in memory, path the file of the
+        store on disk (None for no store), and engine the one Board.solve is called with on a miss.
+        """
+        self.capacity = capacity
+        self.engine = engine
+        self.entries = OrderedDict()
+        self.store = dbm.open(path, 'c') if path else None
+
+        self.lookups = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.canonical_seconds = 0.0
+        self.solve_seconds = 0.0
+
+    def lookup(self, form):
+        """
+        Returns the stored solution of a canonical form, NO_SOLUTION for one without any, or None if it is
+        in neither the memory cache nor the store.
+        """
+        solution = self.entries.get(form)
+        if solution is not None:
+            self.entries.move_to_end(form)
+            self.memory_hits += 1
+            return solution
+
+        if self.store is not None:
+            solution = self.store.get(form)
+            if solution is not None:
+                self.disk_hits += 1
+                self.remember(form, solution, False)
+                return solution
+
+        return None
+
+    def remember(self, form, solution, store=True):
+        """
+        Keeps the solution of a canonical form in memory, and on disk too if store is True.
+        """
+        self.entries[form] = solution
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+        if store and self.store is not None:
+            self.store[form] = solution
+
+    def solve(self, board):
+        """
+        Use this to solve a Board through the cache. Mutates board.cells only when the board was solved,
+        returns a boolean value indicating whether it was, the same way Board.solve does.
+        """
+        self.lookups += 1
+
+        start = time.perf_counter()
+        form, transform = canonicalize(board.cells, board.geometry.box)
+        self.canonical_seconds += time.perf_counter() - start
+
+        solution = self.lookup(form)
+
+        if solution is None:
+            self.misses += 1
+
+            start = time.perf_counter()
+            canonical_board = Board.from_cells(bytearray(form), board.geometry.box)
+            solution = bytes(canonical_board.cells) if canonical_board.solve(self.engine) else NO_SOLUTION
+            self.solve_seconds += time.perf_counter() - start
+
+            self.remember(form, solution)
+
+        if solution == NO_SOLUTION:
+            return False
+
+        board.cells[:] = transform.invert(solution)
+        board.write_back()
+        return True
+
+    def stats(self):
+        """
+        Use this to get what the cache has done so far as a dictionary of totals.
+        """
+        hits = self.memory_hits + self.disk_hits
+
+        return {
+            'lookups': self.lookups,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': hits / self.lookups if self.lookups else 0.0,
+            'entries': len(self.entries),
+            'mean_canonical_ms': self.canonical_seconds / self.lookups * 1000 if self.lookups else 0.0,
+            'mean_solve_ms': self.solve_seconds / self.misses * 1000 if self.misses else 0.0,
+        }
+
+    def close(self):
+        """
+        Use this to close the store on disk, when there is one.
+        """
+        if self.store is not None:
+            self.store.close()
+            self.store = None
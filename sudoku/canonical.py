@@ -0,0 +1,231 @@
+"""
+Sudoku Canonical Forms
+Goal: Give every sudoku board a canonical form, the same for all the boards that are equivalent under the
+symmetries of sudoku, along with the transform that turns the board into it and back.
+
+The symmetries are relabeling the digits, transposing the board, swapping rows within a band (the rows of
+one row of sub-grids), swapping whole bands, and the same for columns within stacks and whole stacks. Any
+combination of them turns a board into one that is solved the same way, and a solution of one into a
+solution of the other.
+
+Approach: Take the smallest key over every board the symmetries can make, where the key is made so that
+most of those boards can be ruled out without ever being built.
+Steps:
+    1. Give every row a signature that does not change under relabeling or any column symmetry: its number
+    of clues, and for each clue the number of clues in its column and how often its digit is given. Give
+    every column a signature the same way.
+    2. Order the bands by the sorted signatures of their rows and the rows of each band by their signature,
+    then the stacks and columns the same way. Try both the board and its transpose, and keep the one whose
+    row and column signatures come out smaller.
+    3. Only where signatures tie is there a choice left. Go through every ordering of the tied rows,
+    columns, bands and stacks, relabel the digits in the order they first appear, and keep the smallest
+    board that comes out.
+
+More Details:
+    The key of a board is (its row signatures, its column signatures, its relabeled digits) in that order.
+    The signatures move with their rows and columns but are otherwise fixed, so sorting them picks out every
+    arrangement with the smallest first two parts of the key at once, and only those are built and relabeled.
+    Two equivalent boards have the same set of arrangements and so end up with the same canonical form.
+
+    The signatures tell the rows and columns of most boards apart, so few arrangements are built. Boards with
+    a lot of symmetry can tie almost everywhere, so at most MAX_ARRANGEMENTS are tried. Past that the board
+    itself, only relabeled, is used as its form, which is still correct but only matches that exact board.
+"""
+
+import itertools
+from math import factorial
+
+from scalable import box_size_of
+
+# the most arrangements tried before a board is taken as its own canonical form
+MAX_ARRANGEMENTS = 2_000
+
+
+class Transform:
+    # how the cells and digits of a board move to make its canonical form
+    __slots__ = ('side', 'sources', 'labels', 'originals')
+
+    def __init__(self, side, sources, labels):
+        """
+        Constructor for the transform. sources[index] is the index of the cell of the board that goes to
+        index in the canonical form, and labels[digit] is the digit it becomes there (0 stays 0).
+        """
+        self.side = side
+        self.sources = sources
+        self.labels = labels
+        self.originals = [0] * len(labels)
+        for digit, label in enumerate(labels):
+            self.originals[label] = digit
+
+    def apply(self, cells):
+        """
+        Use this to turn the cells of a board into the cells of its canonical form. Returns a bytearray.
+        """
+        labels = self.labels
+        return bytearray(labels[cells[source]] for source in self.sources)
+
+    def invert(self, cells):
+        """
+        Use this to turn cells in the canonical form, such as its solution, back into cells of the original
+        board. Returns a bytearray.
+        """
+        result = bytearray(len(cells))
+        originals = self.originals
+        for index, source in enumerate(self.sources):
+            result[source] = originals[cells[index]]
+        return result
+
+
+def signatures(cells, side, transposed):
+    """
+    Returns the signatures of the rows and of the columns of the board (of its transpose if transposed is
+    True) as two lists, see step 1 at the top part of this program.
+    """
+    def at(y, x):
+        return cells[x * side + y] if transposed else cells[y * side + x]
+
+    frequency = [0] * (side + 1)
+    for digit in cells:
+        frequency[digit] += 1
+
+    row_clues = [sum(1 for x in range(side) if at(y, x)) for y in range(side)]
+    column_clues = [sum(1 for y in range(side) if at(y, x)) for x in range(side)]
+
+    rows = [
+        (row_clues[y], tuple(sorted((column_clues[x], frequency[at(y, x)]) for x in range(side) if at(y, x))))
+        for y in range(side)
+    ]
+    columns = [
+        (column_clues[x], tuple(sorted((row_clues[y], frequency[at(y, x)]) for y in range(side) if at(y, x))))
+        for x in range(side)
+    ]
+
+    return (rows, columns)
+
+
+def tied_permutations(keys, items):
+    """
+    Generator of every ordering of items sorted by keys, where items with equal keys come in any order.
+    """
+    groups = [list(group) for _key, group in itertools.groupby(sorted(items, key=keys.__getitem__), keys.__getitem__)]
+
+    for choice in itertools.product(*(itertools.permutations(group) for group in groups)):
+        yield [item for group in choice for item in group]
+
+
+def line_orders(line_signatures, box):
+    """
+    Returns the sorted signatures of the lines (rows or columns) and the list of every ordering of the
+    lines that sorts them by band and then within each band, see step 2 at the top part of this program.
+    Returns None instead of the list when there are more than MAX_ARRANGEMENTS of them.
+    """
+    bands = [list(range(band * box, band * box + box)) for band in range(box)]
+    band_keys = [tuple(sorted(line_signatures[line] for line in lines)) for lines in bands]
+
+    count = 1
+    for keys in [band_keys, *band_keys]:
+        for _key, group in itertools.groupby(sorted(keys)):
+            count *= factorial(len(list(group)))
+
+    ordered = [key for band_key in sorted(band_keys) for key in band_key]
+    if count > MAX_ARRANGEMENTS:
+        return (ordered, None)
+
+    orders = []
+    for band_order in tied_permutations(band_keys, range(box)):
+        for choice in itertools.product(*(tied_permutations(line_signatures, bands[band]) for band in band_order)):
+            orders.append([line for lines in choice for line in lines])
+
+    return (ordered, orders)
+
+
+def relabeled(cells, sources, side):
+    """
+    Returns the cells taken from sources with the digits relabeled in the order they first appear,
+    and the labels used, as a tuple (bytes, list of labels by digit).
+    """
+    labels = [0] * (side + 1)
+    next_label = 1
+    result = bytearray(len(sources))
+
+    for index, source in enumerate(sources):
+        digit = cells[source]
+        if digit:
+            if not labels[digit]:
+                labels[digit] = next_label
+                next_label += 1
+            result[index] = labels[digit]
+
+    # the digits that are not given get the labels left over, so that the labels are a relabeling of all digits
+    for digit in range(1, side + 1):
+        if not labels[digit]:
+            labels[digit] = next_label
+            next_label += 1
+
+    return (bytes(result), labels)
+
+
+def canonicalize(cells, box=None):
+    """
+    Use this to get the canonical form of the cells of a board, box is the size of its sub-grids (taken
+    from the number of cells if omitted). Returns a tuple of (the canonical cells as bytes, Transform).
+    """
+    cells = bytes(cells)
+    box = box or box_size_of(len(cells))
+    side = box * box
+
+    candidates = []
+    for transposed in (False, True):
+        rows, columns = signatures(cells, side, transposed)
+        row_key, row_orders = line_orders(rows, box)
+        column_key, column_orders = line_orders(columns, box)
+        candidates.append(((row_key, column_key), transposed, row_orders, column_orders))
+
+    best_key = min(candidate[0] for candidate in candidates)
+    best = None
+
+    for key, transposed, row_orders, column_orders in candidates:
+        if key != best_key:
+            continue
+
+        # too many ties to go through, so the board is its own form
+        if row_orders is None or column_orders is None or len(row_orders) * len(column_orders) > MAX_ARRANGEMENTS:
+            form, labels = relabeled(cells, range(len(cells)), side)
+            return (form, Transform(side, list(range(len(cells))), labels))
+
+        for row_order in row_orders:
+            for column_order in column_orders:
+                if transposed:
+                    sources = [x * side + y for y in row_order for x in column_order]
+                else:
+                    sources = [y * side + x for y in row_order for x in column_order]
+
+                form, labels = relabeled(cells, sources, side)
+                if best is None or form < best[0]:
+                    best = (form, sources, labels)
+
+    form, sources, labels = best
+    return (form, Transform(side, sources, labels))
+
+
+def shuffle(cells, rng, box=None):
+    """
+    Use this to get a random board equivalent to the cells of a board, made with random symmetries.
+    Returns a bytearray, the board's cells are left as they are.
+    """
+    box = box or box_size_of(len(cells))
+    side = box * box
+
+    def random_order():
+        bands = rng.sample(range(box), box)
+        return [band * box + offset for band in bands for offset in rng.sample(range(box), box)]
+
+    rows, columns = random_order(), random_order()
+    labels = [0] + rng.sample(range(1, side + 1), side)
+
+    if rng.random() < 0.5:
+        sources = [x * side + y for y in rows for x in columns]
+    else:
+        sources = [y * side + x for y in rows for x in columns]
+
+    return Transform(side, sources, labels).apply(cells)
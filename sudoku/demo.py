@@ -23,9 +23,22 @@ More Details:
     So for each empty cell that is currently being worked on, if any digit is found to work (remember this occurs in an iteration of the 
     digits 1-9), proceed to the next empty cell (meaning that the iteration is halted to the current digit), if there are no possible 
     valid digits, go back to the previous cell (meaning the previous iteration and steps that have been halted will continue).
+
+    Boards do not have to be 9x9. A board whose sub-grids are b cells wide has b * b rows and columns and
+    the digits 1 to b * b, so a box size of 4 makes a 16x16 board and 5 a 25x25 board. The backtracking 
+    algorithm works the same on any of them, but it is far too slow beyond 9x9, so use the 'scalable' engine
+    of scalable.py for those.
 """
 
-# If there is a solution, the matrix will be solved, otherwise it will stay as it is.
+import json
+import time
+
+import bitmask
+import dlx
+import iterative
+import scalable
+
+# If there is a solution, the board and the matrix it was made from will be solved, otherwise both stay as they are.
 # The solve method returns a boolean indicating whether the board was solved or not.
 # This board and its solution can be found at https://dingo.sbs.arizona.edu/~sandiway/sudoku/examples.html
 inputs = [
@@ -40,43 +53,324 @@ inputs = [
     [7, 0, 3, 0, 1, 8, 0, 0, 0]
 ]
 
+class Geometry:
+    # one instance per box size is shared by every board of that size
+    __slots__ = ('box', 'side', 'size', 'peers')
+
+    def __init__(self, box):
+        """
+        Constructor for the shape of a board whose sub-grids are box cells wide. The board is stored as 
+        side * side cells in row-major order, so the cell at (x, y) is at index y * side + x. 
+        peers[index] has the indices of the other cells in the same row, column and sub-grid, these are
+        precomputed once so that testing an answer never has to build rows, columns or sub-grids again.
+        """
+        side = box * box
+        self.box = box
+        self.side = side
+        self.size = side * side
+
+        # the peers are gathered from the units of the scalable engine rather than by comparing every pair
+        # of cells, which would take a noticeable moment on a 25x25 board
+        self.peers = [
+            sorted({peer for unit in units for peer in unit} - {index})
+            for index, units in enumerate(scalable.layout(box).units_of)
+        ]
+
+    @classmethod
+    def of(cls, box):
+        """
+        Use this to get the geometry of a box size, 3 for a 9x9 board. Raises a ValueError for box sizes
+        the scalable engine does not support.
+        """
+        if box not in GEOMETRIES:
+            GEOMETRIES[box] = cls(box)
+
+        return GEOMETRIES[box]
+
+    @classmethod
+    def of_size(cls, size):
+        """
+        Use this to get the geometry of a board of size cells, 81 for a 9x9 board. Raises a ValueError 
+        if no board has that many cells.
+        """
+        return cls.of(scalable.box_size_of(size))
+
+# The geometries made so far by box size, the 9x9 one is made up front
+GEOMETRIES = {}
+
+# The peers of the 81 cells of a 9x9 board
+PEERS = Geometry.of(3).peers
+
+# Tables for bytes.translate, converting the characters 0-9, A-P (or a-p) for the digits 10-25 and . to 
+# digits and back. Any other character becomes 255 which is never a valid digit.
+DIGIT_TEXT = '0123456789ABCDEFGHIJKLMNOP'
+TEXT_TO_DIGITS = bytes(
+    DIGIT_TEXT.index(chr(code).upper()) if chr(code).upper() in DIGIT_TEXT else 0 if chr(code) == '.' else 255
+    for code in range(256)
+)
+DIGITS_TO_TEXT = bytes(ord(DIGIT_TEXT[code]) if code < len(DIGIT_TEXT) else ord('?') for code in range(256))
+
+class SolveStats:
+    # the counters are fixed, so instances skip the per-instance __dict__ like Board does
+    __slots__ = ('solved', 'nodes', 'tests', 'placements', 'backtracks', 'max_depth', 'elapsed')
+
+    def __init__(self):
+        """
+        Constructor for the statistics of one Board.profile run. 
+        nodes counts the calls of the backtracking step, tests the calls of test_answer_at, placements and
+        backtracks the answers placed and taken back, max_depth the most answers on hold at once and 
+        elapsed the wall time in seconds.
+        """
+        self.solved = False
+        self.nodes = 0
+        self.tests = 0
+        self.placements = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.elapsed = 0.0
+
+    def to_dict(self):
+        """
+        Use this to get the statistics as a dictionary.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_json(self):
+        """
+        Use this to get the statistics as a single line of JSON.
+        """
+        return json.dumps(self.to_dict())
+
+    def __repr__(self):
+        """
+        This method is called when any instance of the SolveStats class is passed on to the builtin repr function.
+        """
+        return f'SolveStats({self.to_json()})'
+
+class BoardRow:
+    # one row of a board, reading and writing the board's cells, so that changes go to the board
+    __slots__ = ('board', 'y')
+
+    def __init__(self, board, y):
+        self.board = board
+        self.y = y
+
+    def index_of(self, x):
+        """
+        Returns the index in the board's cells of the cell at x on this row, x can be negative like a list's.
+        Raises an IndexError if there is no such cell.
+        """
+        side = self.board.geometry.side
+        if not -side <= x < side:
+            raise IndexError('row index out of range')
+        return self.y * side + x % side
+
+    def __len__(self):
+        return self.board.geometry.side
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return list(self)[x]
+        return self.board.cells[self.index_of(x)]
+
+    def __setitem__(self, x, digit):
+        if isinstance(x, slice):
+            raise TypeError('assign the cells of a row one at a time')
+        if not 0 <= digit <= self.board.geometry.side:
+            raise ValueError(f'expected a digit 0-{self.board.geometry.side}, got {digit!r}')
+        self.board.cells[self.index_of(x)] = digit
+
+    def __iter__(self):
+        side = self.board.geometry.side
+        return iter(self.board.cells[self.y * side:self.y * side + side])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+class BoardMatrix:
+    # the rows of a board as a 2-dimensional array, see Board.matrix
+    __slots__ = ('board',)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __len__(self):
+        return self.board.geometry.side
+
+    def __getitem__(self, y):
+        side = self.board.geometry.side
+        if isinstance(y, slice):
+            return [BoardRow(self.board, row) for row in range(side)[y]]
+        if not -side <= y < side:
+            raise IndexError('matrix index out of range')
+        return BoardRow(self.board, y % side)
+
+    def __setitem__(self, y, row):
+        target = self[y]
+        row = list(row)
+        if len(row) != len(target):
+            raise ValueError(f'expected a row of {len(target)} digits')
+        for x, digit in enumerate(row):
+            target[x] = digit
+
+    def __iter__(self):
+        return (BoardRow(self.board, y) for y in range(self.board.geometry.side))
+
+    def __eq__(self, other):
+        return [list(row) for row in self] == [list(row) for row in other]
+
+    def __repr__(self):
+        return repr([list(row) for row in self])
+
 class Board:
-    def __init__(self, matrix):
+    # a board is nothing more than its cells, its shared geometry and the matrix it was made from (if any),
+    # so instances skip the per-instance __dict__
+    __slots__ = ('cells', 'geometry', 'source')
+
+    def __init__(self, matrix, box_size=None):
+        """
+        Constructor for the sudoku board. Matrix is a 2-dimensional array with both arrays having a length of 9,
+        or of box_size * box_size for other sizes (the box size is taken from the matrix if omitted).
+        The digits are copied into self.cells, a bytearray in row-major order. When the rows of the matrix
+        are lists, solving the board also writes the solution back into them, so a caller that reads its own
+        matrix after solve still finds it solved in place.
+        """
+        self.set_matrix(matrix, box_size)
+
+    def set_matrix(self, matrix, box_size=None):
+        """
+        Use this to replace the digits of the board with those of a 2-dimensional array, checked the same way
+        the constructor checks them. Raises a ValueError if the matrix is not square or its size is not that
+        of a sudoku board.
+        """
+        cells = bytearray(cell for row in matrix for cell in row)
+        geometry = Geometry.of(box_size) if box_size else Geometry.of_size(len(cells))
+
+        if len(matrix) != geometry.side or len(cells) != geometry.size or any(len(row) != geometry.side for row in matrix):
+            raise ValueError(f'expected a {geometry.side}x{geometry.side} matrix')
+
+        self.cells = cells
+        self.geometry = geometry
+        # the rows of a matrix that are lists can take the solution back, see write_back
+        self.source = matrix if all(isinstance(row, list) for row in matrix) else None
+
+    def write_back(self):
+        """
+        Use this to copy the digits of the board back into the matrix it was made from, when it was made from
+        one whose rows are lists. The solving methods call it whenever they solve the board.
+        """
+        if self.source is None:
+            return
+
+        side = self.geometry.side
+        for y, row in enumerate(self.source):
+            row[:] = self.cells[y * side:y * side + side]
+
+    @classmethod
+    def from_cells(cls, cells, box_size=None):
+        """
+        Use this to make a board from 81 digits in row-major order, or box_size^4 digits for other sizes 
+        (the box size is taken from the number of cells if omitted). A bytearray is used as the board's cells 
+        as it is (no copy is made, so changes to either are shared), anything else is copied into a bytearray.
+        """
+        board = cls.__new__(cls)
+        board.cells = cells if isinstance(cells, bytearray) else bytearray(cells)
+        board.source = None
+
+        try:
+            board.geometry = Geometry.of(box_size) if box_size else Geometry.of_size(len(board.cells))
+        except ValueError:
+            raise ValueError(f'expected 81 cells, got {len(board.cells)}') from None
+
+        if len(board.cells) != board.geometry.size:
+            raise ValueError(f'expected {board.geometry.size} cells, got {len(board.cells)}')
+
+        return board
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Use this to make a board from 81 bytes where each byte is a digit 0-9 (or box_size^4 bytes of the
+        digits of a bigger board). This is the inverse of to_bytes.
+        """
+        return cls.from_cells(data)
+
+    @classmethod
+    def from_string(cls, text):
+        """
+        Use this to make a board from an 81 character string in row-major order, where 1-9 are digits 
+        and 0 or . are empty cells. Bigger boards use A-P for the digits 10-25, a 16x16 board is 256 characters
+        long. This is the inverse of to_string. Raises a ValueError if the text is malformed.
+        """
+        try:
+            cells = bytearray(text, 'ascii').translate(TEXT_TO_DIGITS)
+            board = cls.from_cells(cells)
+        except ValueError:
+            board = None
+
+        if board is None or max(cells, default=0) > board.geometry.side:
+            raise ValueError(f'expected 81 characters of digits or dots, got {text!r}')
+
+        return board
+
+    def to_bytes(self):
         """
-        Constructor for the sudoku board. Matrix is a 2-dimensional array with both arrays having a length of 9.
+        Use this to get the board as 81 bytes where each byte is a digit 0-9, bigger boards have a byte per cell too.
         """
-        self.matrix = matrix
+        return bytes(self.cells)
+
+    def to_string(self):
+        """
+        Use this to get the board as an 81 character string in row-major order, where 0 is an empty cell.
+        Bigger boards use A-P for the digits 10-25.
+        """
+        return self.cells.translate(DIGITS_TO_TEXT).decode('ascii')
+
+    @property
+    def matrix(self):
+        """
+        The board as a 2-dimensional array. It is a view of self.cells, so board.matrix[y][x] = digit changes
+        the board, and a whole new matrix can be assigned to replace all of its digits (see set_matrix).
+        """
+        return BoardMatrix(self)
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self.set_matrix(matrix)
 
     def __str__(self):
         """
         This method is called when any instance of the Board class
         is passed on to the builtin str function.
         """
-        height = len(self.matrix)
-        width = len(self.matrix[0])
-
         result = ''
+        box, side = self.geometry.box, self.geometry.side
         
-        for y in range(height):
+        for y in range(side):
 
-            # This is used to add horizontal dividers to emphasize the 3x3 sub-grids
-            if y % 3 == 0 and y != 0:
-                line_symbol = ' - ' * 3
-                line = ' '.join([line_symbol for n in range(3)])
+            # This is used to add horizontal dividers to emphasize the sub-grids
+            if y % box == 0 and y != 0:
+                line_symbol = ' - ' * box
+                line = ' '.join([line_symbol for n in range(box)])
                 result += line + '\n'
 
-            for x in range(width):
+            for x in range(side):
 
-                # This is used to add vertical dividers to emphasize the 3x3 sub-grids.
-                if x % 3 == 0 and x != 0:
+                # This is used to add vertical dividers to emphasize the sub-grids.
+                if x % box == 0 and x != 0:
                     result += '|'
 
+                cell = self.cells[y * side + x]
+
                 # Empty cells will show up as a ? instead of 0
-                if self.matrix[y][x] == 0:
+                if cell == 0:
                     result += ' ? '
                 else:
                     # Filled cells will show up as they are
-                    result += f'{self.matrix[y][x]:^3}'
+                    result += f'{cell:^3}'
                 
             result += '\n'
 
@@ -95,34 +389,13 @@ class Board:
         otherwise returns False. Note: This ignores checking for the cell where the answer will be placed at.
         """
 
-        # checking if the corresponding row has no occurence of that digit yet
-        # the extra condition (index != x) makes it so that it skips the current
-        # cell that is being tested the answer for from being checked.
-        row = self.matrix[y]
-        for index, cell in enumerate(row):
-            if answer == cell and index != x:
-                return False
-
-        # checking if the corresponding column has no occurence of that digit yet
-        # the extra condition (index != y) makes it so that it skips the current cell
-        # that is being tested the answer for from being checked.
-        column = [ row[x] for row in self.matrix ]
-        for index, cell in enumerate(column):
-            if answer == cell and index != y:
+        # checking if the corresponding row, column and sub-grid have no occurence of that digit yet,
+        # the peers of a cell are exactly those cells minus the current cell that is being tested the answer for.
+        cells = self.cells
+        for peer in self.geometry.peers[y * self.geometry.side + x]:
+            if cells[peer] == answer:
                 return False
 
-        # checking if the corresponding 3x3 subgrid has no occurence of that digit yet
-        # anchor point has the coordinates of the corresponding sub-grid's top-and-left-most element
-        # in the format (y-coordinate, x-coordinate)
-        anchor_point = (y - (y % 3), x - (x % 3))
-
-        for row in range(anchor_point[0], anchor_point[0] + 3):
-            for column in range(anchor_point[1], anchor_point[1] + 3):
-                # the extra condition is to prevent the current cell being tested on 
-                # from being checked
-                if self.matrix[row][column] == answer and (row, column) != (y, x):
-                    return False
-
         return True 
 
     def find_empty_cell(self):
@@ -131,21 +404,30 @@ class Board:
         x is the cell's position on x-axis and y is the cell's position on the y-axis.
         If no empty cell is found, this returns a (-1, -1)
         """
+        index = self.cells.find(0)
 
-        for y, row in enumerate(self.matrix):
-            for x, cell in enumerate(row):
-                if cell == 0:
-                    return (x, y)
+        if index == -1:
+            return (-1, -1)
 
-        return (-1, -1)
+        side = self.geometry.side
+        return (index % side, index // side)
 
-    def solve(self):
+    def solve(self, engine='backtracking'):
         """
         Use this to solve the sudoku board. 
-        Mutates self.matrix (solves the board in-place), 
+        Mutates self.cells (solves the board in-place), 
         returns a boolean value indicating whether board 
         was solved or not.
+
+        The engine is the name of the algorithm to use, 'backtracking' is the one
+        explained at the top part of this program, any other name is looked up in ENGINES.
+        Boards other than 9x9 can only be solved with the engines of ANY_SIZE_ENGINES.
         """
+        if self.geometry.side != 9 and engine not in ANY_SIZE_ENGINES:
+            raise ValueError(f'the {engine} engine only solves 9x9 boards, use one of {ANY_SIZE_ENGINES}')
+
+        if engine != 'backtracking':
+            return self.solve_with(ENGINES[engine])
 
         # this function is explained at the top part of this program
         # Step 1: Find an empty cell, if there are no empty cells skip to step 5.
@@ -156,28 +438,158 @@ class Board:
         # This is because a position of (-1, -1) means there's no more empty position, hence the board is filled.
         # On the loop we have, remember that we only use working answers, hence filled = solved.
         if current_position == (-1, -1):
+            self.write_back()
             return True
 
         x, y = current_position
+        side = self.geometry.side
+        index = y * side + x
 
-        # Step 2: Test the possible digits (1-9) on that cell
-        for answer in range(1, 10):
+        # Step 2: Test the possible digits (1-9 on a 9x9 board) on that cell
+        for answer in range(1, side + 1):
             if self.test_answer_at(x, y, answer):
-                self.matrix[y][x] = answer
+                self.cells[index] = answer
 
                 # Step 3: If any working digit is found, go proceed to step 1 again but
                 # on a new "stack" (put the current step 2 on hold as it is still valid).
                 if self.solve():
                     return True
  
-                self.matrix[y][x] = 0
+                self.cells[index] = 0
 
         # 4. If no working digit is found meaning all (1-9) digits have been tried, set the current cell 
-        # back to empty (hence self.matrix[y][x] = 0), and go back to the previous cell that has been filled which
+        # back to empty (hence self.cells[index] = 0), and go back to the previous cell that has been filled which
         # will also now be empty and try the next working digit on it (step 2), in short we go back to step 2 of that 
         # previous cell. Do NOT proceed to step 5 from this step.
         return False
 
+    def profile(self, on_event=None):
+        """
+        Use this to solve the sudoku board with the backtracking algorithm, the same way solve does, while 
+        counting the work it takes. Returns a SolveStats. If on_event is given, it is called as 
+        on_event(event, x, y, answer, depth) whenever an answer is placed (event is 'place') or 
+        taken back (event is 'undo'). solve itself is left without any counting, so it stays as fast as it was.
+        """
+        stats = SolveStats()
+
+        start = time.perf_counter()
+        stats.solved = self.profile_step(stats, 0, on_event)
+        stats.elapsed = time.perf_counter() - start
+
+        return stats
+
+    def profile_step(self, stats, depth, on_event):
+        """
+        The steps of solve with counting in between, depth is the number of answers on hold.
+        """
+        stats.nodes += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+
+        x, y = self.find_empty_cell()
+        if x == -1:
+            self.write_back()
+            return True
+
+        side = self.geometry.side
+        index = y * side + x
+
+        for answer in range(1, side + 1):
+            stats.tests += 1
+            if self.test_answer_at(x, y, answer):
+                self.cells[index] = answer
+                stats.placements += 1
+                if on_event:
+                    on_event('place', x, y, answer, depth)
+
+                if self.profile_step(stats, depth + 1, on_event):
+                    return True
+
+                self.cells[index] = 0
+                stats.backtracks += 1
+                if on_event:
+                    on_event('undo', x, y, answer, depth)
+
+        return False
+
+    def solve_with(self, engine):
+        """
+        Use this to solve the sudoku board with an engine function. The engine receives the
+        board as its digits in row-major order and returns the solved digits, or None when there is no solution.
+        Mutates self.cells only when the board was solved, returns a boolean value indicating whether it was.
+        """
+        solution = engine(self.cells)
+
+        if solution is None:
+            return False
+
+        self.cells[:] = bytes(solution)
+        self.write_back()
+        return True
+
+    def solve_within(self, timeout=None, max_nodes=None):
+        """
+        Use this to solve the sudoku board without recursion, giving up after timeout seconds or max_nodes 
+        steps of the search (None means no limit). Returns iterative.SOLVED, iterative.UNSOLVABLE or 
+        iterative.TIMED_OUT. Mutates self.cells only when the board was solved. To pause and resume a 
+        search instead of giving up, use iterative.IterativeSolver directly. Only 9x9 boards are supported.
+        """
+        self.require_nine_by_nine('solve_within')
+
+        solver = iterative.IterativeSolver(self.cells)
+        status = solver.run(timeout, max_nodes)
+
+        if status == iterative.SOLVED:
+            self.cells[:] = bytes(solver.cells)
+            self.write_back()
+
+        return status
+
+    def iter_solutions(self):
+        """
+        Use this to go through every solution of the sudoku board. This is a generator that lazily
+        yields each solution as a new Board, self.cells is left as it is. Only 9x9 boards are supported.
+        """
+        self.require_nine_by_nine('iter_solutions')
+
+        for solution in dlx.iter_solutions(self.cells):
+            yield Board.from_cells(solution)
+
+    def count_solutions(self, limit=2):
+        """
+        Use this to count the solutions of the sudoku board, stopping once limit solutions have been found.
+        With the default limit, 0 means it has no solution, 1 a unique solution and 2 more than one solution.
+        Boards other than 9x9 are counted with the scalable engine.
+        """
+        if self.geometry.side != 9:
+            return scalable.count_solutions(self.cells, limit, self.geometry.box)
+
+        return dlx.count_solutions(self.cells, limit)
+
+    def has_unique_solution(self):
+        """
+        Use this to check that the sudoku board has exactly one solution. Returns a boolean.
+        """
+        return self.count_solutions(2) == 1
+
+    def require_nine_by_nine(self, name):
+        """
+        Raises a ValueError naming the method if the board is not 9x9.
+        """
+        if self.geometry.side != 9:
+            raise ValueError(f'{name} only supports 9x9 boards, this board is {self.geometry.side}x{self.geometry.side}')
+
+# The alternative engines that can be passed by name to Board.solve
+ENGINES = {
+    'bitmask': bitmask.solve,
+    'dlx': dlx.solve,
+    'iterative': iterative.solve,
+    'scalable': scalable.solve,
+}
+
+# The engines that solve boards of any size, the others only solve 9x9 boards
+ANY_SIZE_ENGINES = ('backtracking', 'scalable')
+
 if __name__ == '__main__':
     board = Board(inputs)
     print(f'Given Board:\n{board}')
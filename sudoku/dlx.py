@@ -0,0 +1,283 @@
+"""
+Dancing Links Sudoku Solver
+Goal: Find, count or enumerate the solutions of a sudoku board, so that a board with exactly one
+solution can be told apart from an ambiguous one without solving it again from scratch.
+
+Approach: Knuth's Algorithm X on an exact cover matrix stored as dancing links.
+Steps:
+    1. Turn the board into an exact cover problem. Every empty cell must get exactly one digit,
+    and every row, column and 3x3 sub-grid must get each missing digit exactly once. These 4 kinds of
+    constraints are the columns of the matrix, and every (cell, digit) pair that does not clash with
+    a given digit is a row of the matrix that satisfies exactly 4 of those columns.
+    2. Pick the column satisfied by the fewest rows. If no column is left, the chosen rows are a solution.
+    3. Try each row of that column: cover every column the row satisfies (removing all the rows that
+    would satisfy them a second time) and go back to step 2.
+    4. After a row has been tried, uncover its columns in reverse order and try the next row.
+
+More Details:
+    The matrix is sparse, so only the 1s are stored as nodes that are linked to their left, right, up and
+    down neighbours in circular lists. Covering a column unlinks it from its neighbours, but the unlinked
+    nodes still remember where they were, so uncovering is a matter of relinking them in reverse order.
+    That is the "dance" that makes backtracking cheap.
+
+    The nodes are stored in flat lists instead of objects, and the search is done with an explicit stack
+    so that the solutions can be handed out lazily through a generator.
+"""
+
+from itertools import islice
+
+
+class DancingLinks:
+    def __init__(self, column_count):
+        """
+        Constructor for an empty exact cover matrix. Node 0 is the root, nodes 1 to column_count are
+        the column headers and every row added afterwards appends one node per column it satisfies.
+        """
+        headers = column_count + 1
+
+        self.left = [index - 1 for index in range(headers)]
+        self.right = [index + 1 for index in range(headers)]
+        self.left[0] = column_count
+        self.right[column_count] = 0
+
+        self.up = list(range(headers))
+        self.down = list(range(headers))
+        self.column = list(range(headers))
+
+        # number of nodes still linked in each column, and the row each node belongs to
+        self.size = [0] * headers
+        self.row_of = [None] * headers
+
+    def add_row(self, row, columns):
+        """
+        Adds a row to the matrix. The row can be any value, it is what the solutions are made of.
+        Columns are the header indices (1 to column_count) that the row satisfies.
+        """
+        left, right, up, down = self.left, self.right, self.up, self.down
+        first = len(left)
+
+        for column in columns:
+            node = len(left)
+
+            # link the node as the new bottom of its column
+            up.append(up[column])
+            down.append(column)
+            down[up[column]] = node
+            up[column] = node
+
+            # link the node as the new rightmost of its row
+            left.append(node - 1 if node != first else node)
+            right.append(first)
+            right[left[node]] = node
+            left[first] = node
+
+            self.column.append(column)
+            self.row_of.append(row)
+            self.size[column] += 1
+
+    def cover(self, column):
+        """
+        Removes a column from the header list and every row that satisfies it from the other columns.
+        """
+        left, right, up, down = self.left, self.right, self.up, self.down
+        node_column, size = self.column, self.size
+
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+
+        row = down[column]
+        while row != column:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[node_column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, column):
+        """
+        Undoes cover, relinking everything in the reverse order it was unlinked.
+        """
+        left, right, up, down = self.left, self.right, self.up, self.down
+        node_column, size = self.column, self.size
+
+        row = up[column]
+        while row != column:
+            node = left[row]
+            while node != row:
+                size[node_column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+
+        right[left[column]] = column
+        left[right[column]] = column
+
+    def choose_column(self):
+        """
+        Returns the uncovered column satisfied by the fewest rows.
+        """
+        right, size = self.right, self.size
+
+        best = right[0]
+        column = right[best]
+        while column != 0 and size[best] > 1:
+            if size[column] < size[best]:
+                best = column
+            column = right[column]
+
+        return best
+
+    def select(self, node):
+        """
+        Covers the other columns of the row that node is a part of.
+        """
+        right, column = self.right, self.column
+
+        other = right[node]
+        while other != node:
+            self.cover(column[other])
+            other = right[other]
+
+    def deselect(self, node):
+        """
+        Undoes select.
+        """
+        left, column = self.left, self.column
+
+        other = left[node]
+        while other != node:
+            self.uncover(column[other])
+            other = left[other]
+
+    def solutions(self):
+        """
+        Generator of the solutions of the matrix, each one a list with the rows that were chosen.
+        The matrix is restored once the generator runs out, but not if it is closed early.
+        """
+        down, node_column, size, row_of = self.down, self.column, self.size, self.row_of
+
+        if self.right[0] == 0:
+            yield []
+            return
+
+        # the node of the row chosen at each level of the search
+        chosen = []
+
+        column = self.choose_column()
+        self.cover(column)
+        node = down[column]
+
+        while True:
+            if node == column:
+                # every row of this level's column has been tried, go back to the previous level
+                self.uncover(column)
+                if not chosen:
+                    return
+
+                node = chosen.pop()
+                column = node_column[node]
+                self.deselect(node)
+                node = down[node]
+                continue
+
+            chosen.append(node)
+            self.select(node)
+
+            if self.right[0] == 0:
+                yield [row_of[row] for row in chosen]
+            else:
+                next_column = self.choose_column()
+                if size[next_column] > 0:
+                    # go one level deeper
+                    self.cover(next_column)
+                    column = next_column
+                    node = down[column]
+                    continue
+
+            # either a solution was handed out or a column cannot be satisfied anymore, try the next row
+            chosen.pop()
+            self.deselect(node)
+            node = down[node]
+
+
+def build(cells):
+    """
+    Builds the exact cover matrix of a sequence of 81 digits in row-major order where 0 is an empty cell.
+    The rows of the matrix are (index, digit) pairs. Returns None if the given digits already clash.
+    """
+    used = set()
+    for index, digit in enumerate(cells):
+        if digit == 0:
+            continue
+
+        y, x = divmod(index, 9)
+        box = (y // 3) * 3 + x // 3
+        constraints = (('row', y, digit), ('column', x, digit), ('box', box, digit))
+
+        if used.intersection(constraints):
+            return None
+
+        used.update(constraints)
+
+    # only the constraints that the given digits do not satisfy yet become columns
+    headers = {}
+    rows = []
+    for index, digit in enumerate(cells):
+        if digit != 0:
+            continue
+
+        y, x = divmod(index, 9)
+        box = (y // 3) * 3 + x // 3
+        headers[('cell', index)] = len(headers) + 1
+
+        for answer in range(1, 10):
+            constraints = (('row', y, answer), ('column', x, answer), ('box', box, answer))
+            if used.isdisjoint(constraints):
+                rows.append(((index, answer), ('cell', index)) + constraints)
+
+    for digit in range(1, 10):
+        for unit in range(9):
+            for kind in ('row', 'column', 'box'):
+                if (kind, unit, digit) not in used:
+                    headers[(kind, unit, digit)] = len(headers) + 1
+
+    links = DancingLinks(len(headers))
+    for row, *constraints in rows:
+        links.add_row(row, [headers[constraint] for constraint in constraints])
+
+    return links
+
+
+def iter_solutions(cells):
+    """
+    Generator of every solution of a sequence of 81 digits in row-major order where 0 is an empty cell.
+    Each solution is a new list of 81 digits.
+    """
+    links = build(cells)
+    if links is None:
+        return
+
+    for rows in links.solutions():
+        solution = list(cells)
+        for index, digit in rows:
+            solution[index] = digit
+        yield solution
+
+
+def count_solutions(cells, limit=2):
+    """
+    Counts the solutions of a sequence of 81 digits, stopping once limit solutions have been found.
+    With the default limit, 0 means no solution, 1 a unique solution and 2 an ambiguous board.
+    """
+    return sum(1 for _ in islice(iter_solutions(cells), limit))
+
+
+def solve(cells):
+    """
+    Solves a sequence of 81 digits in row-major order where 0 is an empty cell.
+    Returns the solved cells as a new list, or None if there is no solution.
+    """
+    return next(iter_solutions(cells), None)
@@ -0,0 +1,154 @@
+"""
+Sudoku Puzzle Generator
+Goal: Make random sudoku boards that have exactly one solution, and tell how difficult each of them is.
+
+Approach: Start from a random full grid and remove clues for as long as the puzzle stays unique.
+Steps:
+    1. Fill the three 3x3 sub-grids on the diagonal with random permutations of 1-9. They share no row
+    or column, so they can never clash with each other.
+    2. Solve that board with the bitmask engine, the result is a random full grid.
+    3. Go through the cells in a random order and remove each clue, unless that makes the puzzle ambiguous
+    or more difficult than asked for, in which case the clue is put back.
+    4. Grade the puzzle by the techniques the bitmask engine needed to solve it.
+
+More Details:
+    Removing a clue keeps the puzzle unique exactly when no digit other than the removed one fits in that
+    cell. We already know one solution (the full grid), so instead of counting solutions we place each of
+    the other candidate digits in the cell and ask the solver for any solution at all. These searches
+    nearly always end after a few rounds of propagation, which is what keeps generation fast.
+
+    The difficulty tiers are, from easiest to hardest:
+        easy: solved by naked singles alone (cells with only one candidate).
+        medium: also needs hidden singles (digits with only one place in a row, column or sub-grid).
+        hard: needs a few guesses, with at most HARD_BACKTRACKS wrong guesses undone.
+        expert: needs more backtracking than that.
+
+    Puzzles of a tier are made by generating puzzles until one of that tier comes out. On one core that
+    is thousands per minute for easy, medium and hard puzzles and for untargeted ones, but only around a
+    hundred for expert ones: fewer than one in ten puzzles comes out expert, so most of the work is thrown
+    away. Making puzzles harder step by step (putting a clue back and removing others in a new order while
+    the backtracking does not go down) was tried and came out slower, as the backtracking plateaus.
+"""
+
+import argparse
+import random
+
+import bitmask
+from demo import Board
+
+DIFFICULTIES = ('easy', 'medium', 'hard', 'expert')
+
+# the most wrong guesses a puzzle can need before it is graded expert instead of hard
+HARD_BACKTRACKS = 8
+
+# removing clues from a full grid gets stuck long before this, it only stops runaway loops
+MAX_ATTEMPTS = 1000
+
+
+def generate_grid(rng=random):
+    """
+    Returns a random full grid as a list of 81 digits in row-major order.
+    """
+    cells = [0] * 81
+
+    for box in (0, 4, 8):
+        digits = rng.sample(range(1, 10), 9)
+        anchor = (box // 3) * 27 + (box % 3) * 3
+        for offset, digit in enumerate(digits):
+            cells[anchor + (offset // 3) * 9 + offset % 3] = digit
+
+    return bitmask.solve(cells)
+
+
+def grade(cells):
+    """
+    Returns the difficulty tier of a puzzle given as 81 digits, see the top part of this program.
+    """
+    solver = bitmask.BitmaskSolver(cells)
+    solver.solve()
+
+    if solver.guesses == 0:
+        return 'easy' if solver.hidden_singles == 0 else 'medium'
+
+    return 'hard' if solver.backtracks <= HARD_BACKTRACKS else 'expert'
+
+
+def is_unique_without(puzzle, index, digit):
+    """
+    Tests if the puzzle, which has the cell at index emptied and whose solution has digit there, still has
+    exactly one solution. Returns True if no other digit placed on that cell leads to a solution.
+    """
+    solver = bitmask.BitmaskSolver(puzzle)
+
+    for other in bitmask.DIGITS[solver.candidates(index)]:
+        if other == digit:
+            continue
+
+        solver.place(index, other)
+        if solver.search():
+            return False
+        solver.undo(0)
+
+    return True
+
+
+def make_puzzle(grid, rng=random, difficulty=None, min_clues=17):
+    """
+    Removes clues from a full grid in random order while the puzzle stays unique, does not get harder
+    than difficulty (any difficulty if None) and keeps at least min_clues clues. Returns a new list of 81 digits.
+    """
+    puzzle = list(grid)
+    clues = 81
+    limit = DIFFICULTIES.index(difficulty) if difficulty else len(DIFFICULTIES) - 1
+
+    for index in rng.sample(range(81), 81):
+        if clues <= min_clues:
+            break
+
+        digit = puzzle[index]
+        puzzle[index] = 0
+
+        # grading is only needed when the puzzle could get harder than what was asked for
+        if is_unique_without(puzzle, index, digit) and (
+            limit == len(DIFFICULTIES) - 1 or DIFFICULTIES.index(grade(puzzle)) <= limit
+        ):
+            clues -= 1
+        else:
+            puzzle[index] = digit
+
+    return puzzle
+
+
+def generate(difficulty=None, rng=random, min_clues=17):
+    """
+    Generates a unique puzzle. If difficulty is given, puzzles are generated until one of exactly that tier
+    comes out. Returns a tuple of (Board, difficulty).
+    """
+    for _attempt in range(MAX_ATTEMPTS):
+        puzzle = make_puzzle(generate_grid(rng), rng, difficulty, min_clues)
+        tier = grade(puzzle)
+
+        if difficulty is None or tier == difficulty:
+            return (Board.from_cells(puzzle), tier)
+
+    raise RuntimeError(f'could not generate a {difficulty} puzzle in {MAX_ATTEMPTS} attempts')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate unique sudoku puzzles as 81 character lines.')
+    parser.add_argument('count', type=int, nargs='?', default=1, help='number of puzzles to generate')
+    parser.add_argument('--difficulty', choices=DIFFICULTIES, help='only output puzzles of this tier')
+    parser.add_argument('--min-clues', type=int, default=17, help='never remove clues below this count')
+    parser.add_argument('--seed', type=int, help='seed for a reproducible sequence of puzzles')
+    arguments = parser.parse_args()
+
+    rng = random.Random(arguments.seed)
+
+    for _ in range(arguments.count):
+        board, tier = generate(arguments.difficulty, rng, arguments.min_clues)
+        print(board.to_string(), tier)
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
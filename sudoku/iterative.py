@@ -0,0 +1,157 @@
+"""
+Iterative Sudoku Solver
+Goal: Solve a sudoku board without recursion, in slices of work that can be limited by a deadline or a
+node budget, so that one pathological board can never block its caller for an unbounded time.
+
+Approach: The backtracking algorithm of demo.py with an explicit stack instead of the call stack.
+Steps:
+    1. Pick the empty cell with the fewest candidates. If there are no empty cells, the board is solved.
+    2. Push a frame for that cell holding the bitmask of candidates that have not been tried yet.
+    3. Take the next untried candidate from the frame on top of the stack, place it and go back to step 1.
+    4. If the frame on top of the stack has no untried candidates left, empty its cell, pop it and go back
+    to step 3 for the frame below it. If the stack is empty, the board has no solution.
+
+More Details:
+    Each pass through the loop is a node, and between nodes the whole state of the search is in the cells,
+    the row, column and sub-grid bitmasks and the stack. When the deadline passes or the node budget runs out,
+    run returns TIMED_OUT and simply keeps that state, so calling run again continues exactly where it stopped.
+    All of it is made of plain lists, so a paused solver can also be pickled and resumed somewhere else.
+"""
+
+import time
+
+from bitmask import ALL_DIGITS, BIT_COUNT, BOX_OF, COLUMN_OF, ROW_OF
+
+# the statuses returned by IterativeSolver.run
+SOLVED = 'solved'
+UNSOLVABLE = 'unsolvable'
+TIMED_OUT = 'timed_out'
+
+# the deadline is only checked every this many nodes, as reading the clock costs more than a node
+CLOCK_INTERVAL = 64
+
+
+class IterativeSolver:
+    def __init__(self, cells):
+        """
+        Constructor for the solver. Cells is a sequence of 81 digits in row-major order where 0 is an empty cell.
+        The solver works on its own copy of the cells.
+        """
+        self.cells = list(cells)
+        self.rows = [0] * 9
+        self.columns = [0] * 9
+        self.boxes = [0] * 9
+
+        # each frame is [index, untried candidates] for a cell that the search has placed a digit on
+        self.stack = []
+
+        # True when the top frame's digit has just been placed and the next cell has to be picked
+        self.descending = True
+
+        self.nodes = 0
+        self.status = None
+
+        for index, digit in enumerate(self.cells):
+            if digit == 0:
+                continue
+
+            bit = 1 << digit
+            row, column, box = ROW_OF[index], COLUMN_OF[index], BOX_OF[index]
+
+            # the givens already repeat a digit in some unit
+            if (self.rows[row] | self.columns[column] | self.boxes[box]) & bit:
+                self.status = UNSOLVABLE
+
+            self.rows[row] |= bit
+            self.columns[column] |= bit
+            self.boxes[box] |= bit
+
+    def run(self, timeout=None, max_nodes=None):
+        """
+        Use this to solve, or continue solving, the cells. Stops after timeout seconds or after max_nodes more
+        nodes, whichever comes first (None means no limit). Returns SOLVED, UNSOLVABLE or TIMED_OUT,
+        in the last case run can be called again to resume.
+        """
+        if self.status in (SOLVED, UNSOLVABLE):
+            return self.status
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        budget = -1 if max_nodes is None else max_nodes
+
+        cells, stack = self.cells, self.stack
+        rows, columns, boxes = self.rows, self.columns, self.boxes
+
+        while True:
+            if budget == 0 or (
+                deadline is not None and self.nodes % CLOCK_INTERVAL == 0 and time.perf_counter() >= deadline
+            ):
+                self.status = TIMED_OUT
+                return self.status
+
+            budget -= 1
+            self.nodes += 1
+
+            if self.descending:
+                # Step 1: pick the empty cell with the fewest candidates
+                best_index = -1
+                best_count = 10
+                best_mask = 0
+
+                for index in range(81):
+                    if cells[index]:
+                        continue
+
+                    mask = ALL_DIGITS & ~(rows[ROW_OF[index]] | columns[COLUMN_OF[index]] | boxes[BOX_OF[index]])
+                    count = BIT_COUNT[mask]
+
+                    if count < best_count:
+                        best_index, best_count, best_mask = index, count, mask
+                        if count <= 1:
+                            break
+
+                if best_index == -1:
+                    self.status = SOLVED
+                    return self.status
+
+                # Step 2: push a frame, a cell without candidates gets an empty frame that step 4 pops right away
+                stack.append([best_index, best_mask])
+                self.descending = False
+                continue
+
+            index, mask = stack[-1]
+            row, column, box = ROW_OF[index], COLUMN_OF[index], BOX_OF[index]
+
+            # take back the digit this frame placed before, if any
+            digit = cells[index]
+            if digit:
+                bit = 1 << digit
+                cells[index] = 0
+                rows[row] ^= bit
+                columns[column] ^= bit
+                boxes[box] ^= bit
+
+            if mask == 0:
+                # Step 4: every candidate of this cell was tried, go back to the frame below
+                stack.pop()
+                if not stack:
+                    self.status = UNSOLVABLE
+                    return self.status
+                continue
+
+            # Step 3: place the lowest untried candidate
+            bit = mask & -mask
+            stack[-1][1] = mask ^ bit
+            cells[index] = bit.bit_length() - 1
+            rows[row] |= bit
+            columns[column] |= bit
+            boxes[box] |= bit
+            self.descending = True
+
+
+def solve(cells):
+    """
+    Solves a sequence of 81 digits in row-major order where 0 is an empty cell, without any limits.
+    Returns the solved cells as a new list, or None if there is no solution.
+    """
+    solver = IterativeSolver(cells)
+    return solver.cells if solver.run() == SOLVED else None
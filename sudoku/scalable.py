@@ -0,0 +1,419 @@
+"""
+Scalable Sudoku Solver
+Goal: Solve sudoku boards of any box size, 9x9 as well as 16x16 and 25x25, fast enough that a hard 16x16
+board takes well under a second.
+
+Approach: Constraint propagation over a bitmask of candidates per cell, with backtracking only as a last resort.
+Steps:
+    1. Keep the candidates of every empty cell as a bitmask. Placing a digit removes it from the candidates
+    of every cell in the same row, column and sub-grid.
+    2. Naked singles: any empty cell left with exactly one candidate gets that candidate.
+    3. Hidden singles: any digit that fits in exactly one cell of a row, column or sub-grid goes there.
+    4. Locked candidates: where the places of a digit in a sub-grid are all in one row (or column), the digit
+    is removed from the rest of that row (or column), and where its places in a row (or column) are all in
+    one sub-grid, it is removed from the rest of that sub-grid.
+    5. Repeat steps 2-4 until nothing changes. If a cell has no candidates or a digit has no place
+    in a unit, the board is contradictory and we go back.
+    6. If empty cells remain, pick the one with the fewest candidates (minimum remaining values),
+    try each of its candidates and go back to step 2 for each of them.
+
+More Details:
+    A board with a box size of b has a side of n = b * b cells, n * n cells in all, and the digits 1 to n.
+    Every digit d is the bit (1 << d), so even the 25 digits of a 25x25 board fit in one integer. The lookup
+    tables of bitmask.py would need 2^(n + 1) entries, so the bits of a mask are counted with int.bit_count
+    and its digits are taken off one lowest bit at a time instead.
+
+    The singles and the unit checks of bitmask.py are enough for 9x9 boards, but hard 16x16 boards need
+    thousands of guesses with them alone. Locked candidates cut that down by an order of magnitude, and they
+    need the candidates of each cell to be kept rather than worked out from the row, column and sub-grid.
+    A cell whose candidates drop to one goes on a queue, so naked singles never rescan the board.
+
+    The tables of each box size (which units a cell is in, and how sub-grids meet rows and columns) are
+    built once and shared by every solver of that size. Besides those, a solver holds the cells, one mask
+    per cell and a trail of the masks it changed, at most one entry per cell and candidate, so its memory
+    grows linearly with the number of cells. Going back is popping the trail and restoring the masks.
+
+    For a board with exactly one solution the result is the same as the other engines. When a board has
+    several solutions a valid one is returned, but not necessarily the same one.
+"""
+
+from math import isqrt
+
+# the smallest and largest box sizes, a 4x4 board up to a 25x25 board
+MIN_BOX_SIZE = 2
+MAX_BOX_SIZE = 5
+
+
+class Layout:
+    # the tables of one box size, shared by every solver of that size
+    __slots__ = ('box', 'side', 'size', 'all_digits', 'units', 'units_of', 'segments')
+
+    def __init__(self, box):
+        """
+        Constructor for the tables of a board whose sub-grids are box cells wide.
+        """
+        side = box * box
+        self.box = box
+        self.side = side
+        self.size = side * side
+        self.all_digits = ((1 << side) - 1) << 1
+
+        row_of = [index // side for index in range(self.size)]
+        column_of = [index % side for index in range(self.size)]
+        box_of = [(index // (side * box)) * box + (index % side) // box for index in range(self.size)]
+
+        rows = [[y * side + x for x in range(side)] for y in range(side)]
+        columns = [[y * side + x for y in range(side)] for x in range(side)]
+        boxes = [[index for index in range(self.size) if box_of[index] == number] for number in range(side)]
+
+        # the 3n units (n rows, n columns, n sub-grids) as lists of cell indices
+        self.units = rows + columns + boxes
+
+        # the row, column and sub-grid of each cell
+        self.units_of = [(rows[row_of[index]], columns[column_of[index]], boxes[box_of[index]]) for index in range(self.size)]
+
+        # every place where a sub-grid meets a row or a column, as a tuple of (the cells they share,
+        # the other cells of the row or column, the other cells of the sub-grid)
+        self.segments = []
+        for number, cells in enumerate(boxes):
+            for line_of, lines in ((row_of, rows), (column_of, columns)):
+                for line in sorted({line_of[index] for index in cells}):
+                    self.segments.append((
+                        [index for index in cells if line_of[index] == line],
+                        [index for index in lines[line] if box_of[index] != number],
+                        [index for index in cells if line_of[index] != line],
+                    ))
+
+
+# the layouts made so far, by box size
+LAYOUTS = {}
+
+
+def layout(box):
+    """
+    Returns the Layout of a box size, building it the first time it is asked for.
+    Raises a ValueError for box sizes outside MIN_BOX_SIZE to MAX_BOX_SIZE.
+    """
+    if box not in LAYOUTS:
+        if not MIN_BOX_SIZE <= box <= MAX_BOX_SIZE:
+            raise ValueError(f'box size must be between {MIN_BOX_SIZE} and {MAX_BOX_SIZE}, got {box}')
+        LAYOUTS[box] = Layout(box)
+
+    return LAYOUTS[box]
+
+
+def box_size_of(size):
+    """
+    Returns the box size of a board of size cells, 3 for 81 cells, 4 for 256 and 5 for 625.
+    Raises a ValueError if no board has that many cells.
+    """
+    side = isqrt(size)
+    box = isqrt(side)
+
+    if box * box != side or side * side != size or not MIN_BOX_SIZE <= box <= MAX_BOX_SIZE:
+        raise ValueError(f'{size} cells do not make a sudoku board')
+
+    return box
+
+
+def digits_of(mask):
+    """
+    Returns the digits of a mask as a list, from lowest to highest.
+    """
+    digits = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        digits.append(bit.bit_length() - 1)
+    return digits
+
+
+class ScalableSolver:
+    def __init__(self, cells, box=None):
+        """
+        Constructor for the solver. Cells is a sequence of n * n digits in row-major order where 0 is an
+        empty cell, and box the size of its sub-grids, taken from the number of cells if omitted.
+        The solver works on its own copy of the cells.
+        """
+        givens = list(cells)
+        self.layout = layout(box or box_size_of(len(givens)))
+
+        if len(givens) != self.layout.size:
+            raise ValueError(f'expected {self.layout.size} cells, got {len(givens)}')
+
+        self.cells = [0] * self.layout.size
+        # the candidates of each empty cell, 0 for a filled cell
+        self.masks = [self.layout.all_digits] * self.layout.size
+
+        # (index, mask before) for every mask changed by the solver in the order they were changed,
+        # a cell that got a digit is the one entry whose mask went from candidates to 0
+        self.trail = []
+        # cells whose candidates went down to one (or none) since they were last looked at
+        self.singles = []
+
+        # a board whose givens repeat a digit in some unit or use digits it cannot have is never solved
+        self.valid = True
+
+        self.guesses = 0
+        self.backtracks = 0
+
+        for index, digit in enumerate(givens):
+            if digit and not (0 < digit <= self.layout.side and self.masks[index] >> digit & 1 and self.place(index, digit)):
+                self.valid = False
+
+        # the givens are never taken back
+        self.trail.clear()
+
+    def place(self, index, digit):
+        """
+        Places a digit on an empty cell and removes it from the candidates of the cells in the same units.
+        Returns False if that leaves one of those cells without candidates.
+        """
+        masks, trail, singles = self.masks, self.trail, self.singles
+        bit = 1 << digit
+        consistent = True
+
+        trail.append((index, masks[index]))
+        self.cells[index] = digit
+        masks[index] = 0
+
+        for unit in self.layout.units_of[index]:
+            for peer in unit:
+                mask = masks[peer]
+                if mask & bit:
+                    trail.append((peer, mask))
+                    mask ^= bit
+                    masks[peer] = mask
+                    if mask & (mask - 1) == 0:
+                        consistent = consistent and mask != 0
+                        singles.append(peer)
+
+        return consistent
+
+    def eliminate(self, cells, bits):
+        """
+        Removes the digits of bits from the candidates of the given cells.
+        Returns False if that leaves one of them without candidates.
+        """
+        masks, trail, singles = self.masks, self.trail, self.singles
+        consistent = True
+
+        for index in cells:
+            mask = masks[index]
+            if mask & bits:
+                trail.append((index, mask))
+                mask &= ~bits
+                masks[index] = mask
+                if mask & (mask - 1) == 0:
+                    consistent = consistent and mask != 0
+                    singles.append(index)
+
+        return consistent
+
+    def undo(self, length):
+        """
+        Restores the masks changed after the trail had the given length, emptying the cells placed since.
+        """
+        masks, cells, trail = self.masks, self.cells, self.trail
+
+        while len(trail) > length:
+            index, mask = trail.pop()
+            if cells[index] and masks[index] == 0:
+                cells[index] = 0
+            masks[index] = mask
+
+        self.singles.clear()
+
+    def propagate(self):
+        """
+        Fills in singles and removes locked candidates until nothing changes. Returns None if the board turned
+        out to be contradictory, -1 if the board got filled, otherwise the index of the empty cell with
+        the fewest candidates.
+        """
+        layout = self.layout
+        cells, masks, singles = self.cells, self.masks, self.singles
+        all_digits = layout.all_digits
+
+        while True:
+            # naked singles, only the cells whose candidates went down to one
+            while singles:
+                index = singles.pop()
+                mask = masks[index]
+                if mask & (mask - 1) == 0:
+                    if mask == 0:
+                        if cells[index] == 0:
+                            return None
+                    elif not self.place(index, mask.bit_length() - 1):
+                        return None
+
+            progress = False
+
+            # hidden singles, a digit that fits only one cell of a unit
+            for unit in layout.units:
+                placed = 0
+                seen_once = 0
+                seen_twice = 0
+
+                for index in unit:
+                    digit = cells[index]
+                    if digit:
+                        placed |= 1 << digit
+                        continue
+
+                    mask = masks[index]
+                    seen_twice |= seen_once & mask
+                    seen_once |= mask
+
+                # some digit cannot be placed anywhere in this unit
+                if (seen_once | placed) != all_digits:
+                    return None
+
+                hidden = seen_once & ~seen_twice
+                if not hidden:
+                    continue
+
+                for digit in digits_of(hidden):
+                    bit = 1 << digit
+                    for index in unit:
+                        if masks[index] & bit:
+                            if not self.place(index, digit):
+                                return None
+                            break
+                    else:
+                        # an earlier placement took the only cell this digit had
+                        return None
+
+                progress = True
+
+            if progress:
+                continue
+
+            # locked candidates, where a sub-grid meets a row or a column
+            for shared, line_rest, box_rest in layout.segments:
+                inside = 0
+                for index in shared:
+                    inside |= masks[index]
+                if not inside:
+                    continue
+
+                line = 0
+                for index in line_rest:
+                    line |= masks[index]
+                box = 0
+                for index in box_rest:
+                    box |= masks[index]
+
+                # only in this row or column within the sub-grid, so nowhere else in the row or column
+                pointing = inside & line & ~box
+                # only in this sub-grid within the row or column, so nowhere else in the sub-grid
+                claiming = inside & box & ~line
+
+                if pointing:
+                    if not self.eliminate(line_rest, pointing):
+                        return None
+                    progress = True
+                if claiming:
+                    if not self.eliminate(box_rest, claiming):
+                        return None
+                    progress = True
+
+            if progress or singles:
+                continue
+
+            # the empty cell with the fewest candidates, no empty cell has fewer than two by now
+            best_index = -1
+            best_count = layout.side + 1
+            for index, mask in enumerate(masks):
+                if mask:
+                    count = mask.bit_count()
+                    if count < best_count:
+                        best_index, best_count = index, count
+                        if count == 2:
+                            break
+
+            return best_index
+
+    def search(self):
+        """
+        Propagates and then tries the candidates of the most constrained cell recursively.
+        Returns a boolean indicating whether the cells were solved.
+        """
+        index = self.propagate()
+        if index is None:
+            return False
+
+        if index == -1:
+            return True
+
+        self.guesses += 1
+        length = len(self.trail)
+        for digit in digits_of(self.masks[index]):
+            if self.place(index, digit) and self.search():
+                return True
+            self.undo(length)
+            self.backtracks += 1
+
+        return False
+
+    def search_count(self, limit):
+        """
+        Same as search, but keeps going after a solution is found. Returns the number of solutions found,
+        stopping once it reaches limit. The cells are left as they were before the call.
+        """
+        length = len(self.trail)
+        index = self.propagate()
+
+        if index is None:
+            found = 0
+        elif index == -1:
+            found = 1
+        else:
+            found = 0
+            branch_length = len(self.trail)
+
+            for digit in digits_of(self.masks[index]):
+                if self.place(index, digit):
+                    found += self.search_count(limit - found)
+                self.undo(branch_length)
+
+                if found >= limit:
+                    break
+
+        self.undo(length)
+        return found
+
+    def solve(self):
+        """
+        Use this to solve the cells. Returns a boolean indicating whether they were solved,
+        if they were not the cells stay as they were given.
+        """
+        if self.valid and self.search():
+            return True
+
+        self.undo(0)
+        return False
+
+    def count(self, limit=2):
+        """
+        Use this to count the solutions of the cells, stopping once limit solutions have been found.
+        The cells stay as they were given.
+        """
+        return self.search_count(limit) if self.valid else 0
+
+
+def solve(cells, box=None):
+    """
+    Solves a sequence of n * n digits in row-major order where 0 is an empty cell, box is the size of the
+    sub-grids (taken from the number of cells if omitted). Returns the solved cells as a new list, or None
+    if there is no solution.
+    """
+    solver = ScalableSolver(cells, box)
+    return solver.cells if solver.solve() else None
+
+
+def count_solutions(cells, limit=2, box=None):
+    """
+    Counts the solutions of a sequence of n * n digits, stopping once limit solutions have been found.
+    With the default limit, 0 means no solution, 1 a unique solution and 2 an ambiguous board.
+    """
+    return ScalableSolver(cells, box).count(limit)
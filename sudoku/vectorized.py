@@ -0,0 +1,207 @@
+"""
+Vectorized Batch Sudoku Solver
+Goal: Solve many sudoku boards at once without paying the Python interpreter for every cell of every board.
+
+Approach: Constraint propagation done by NumPy on all the boards together, with the bitmask engine of
+bitmask.py only for the boards that propagation alone cannot finish.
+Steps:
+    1. Keep the N boards as one (N, 81) array of digits in row-major order, 0 being an empty cell.
+    2. For all the boards at once, OR together the digit bits of each row, column and 3x3 sub-grid, and
+    take the candidates of every empty cell as the digits missing from its three units.
+    3. Drop the boards that are contradictory: a unit that repeats a digit, an empty cell without candidates
+    or a digit that has no place left in a unit.
+    4. Naked singles: every empty cell with exactly one candidate gets it, on every board at once.
+    5. Hidden singles: on the boards that had no naked singles, every digit that fits exactly one cell of a
+    unit goes there.
+    6. Go back to step 2 with only the boards that made progress. The boards that are filled are solved,
+    the ones that got stuck are handed one by one to bitmask.solve.
+
+More Details:
+    Every digit d is the bit (1 << d) like in bitmask.py, so the candidates of a cell fit in a uint16 and
+    a unit mask is a bitwise OR reduction over an axis of the array. The per-digit counts of the hidden
+    singles come from expanding the candidates into an (N, 81, 9) array of bits and summing them over the
+    cells of each of the 27 units.
+
+    Every placement of a round is decided from the same candidates, so two of them can clash (the same
+    digit in two cells of a unit, or two digits for one cell). That only happens on a board that has no
+    solution, since on a solvable board every single is forced, and the check of step 3 catches it on the
+    next round.
+
+Usage:
+    solutions, solved = solve_array(puzzles)            puzzles is an (N, 81) or (N, 9, 9) array of digits
+    solved = solve_boards(boards)                       solves a list of Board in place, like Board.solve
+    matrices = to_matrices(solve_matrices(matrices)[0]) the same with lists of 9x9 matrices
+"""
+
+import numpy as np
+
+import bitmask
+
+# the statuses of the boards after propagate
+UNKNOWN = 0
+SOLVED = 1
+CONTRADICTION = 2
+STUCK = 3
+
+# DIGIT_BITS[d] is the bit of the digit d, the empty cell 0 has no bit
+DIGIT_BITS = np.array([0] + [1 << digit for digit in range(1, 10)], dtype=np.uint16)
+
+# lookup tables over every mask of bits 1-9, like bitmask.BIT_COUNT, SINGLE_DIGIT[mask] is the digit of a single bit
+BIT_COUNT = np.array(bitmask.BIT_COUNT, dtype=np.uint8)
+SINGLE_DIGIT = np.array([digits[0] if len(digits) == 1 else 0 for digits in bitmask.DIGITS], dtype=np.uint8)
+
+# the row, column and sub-grid of each cell, and the 27 units as a (27, 9) array of cell indices
+ROW_OF = np.array(bitmask.ROW_OF)
+COLUMN_OF = np.array(bitmask.COLUMN_OF)
+BOX_OF = np.array(bitmask.BOX_OF)
+UNITS = np.array(bitmask.UNITS)
+
+# the bit of each digit 1-9, to expand a mask into one entry per digit
+DIGIT_SHIFTS = np.arange(1, 10, dtype=np.uint16)
+
+
+def to_array(puzzles):
+    """
+    Converts puzzles to an (N, 81) uint8 array of digits, they can be given as an (N, 81) or (N, 9, 9)
+    array or as a list of 9x9 matrices. Raises a ValueError if they are not boards of digits 0-9.
+    """
+    grids = np.array(puzzles, dtype=np.int64, ndmin=2)
+    if grids.ndim == 3:
+        grids = grids.reshape(len(grids), -1)
+
+    if grids.ndim != 2 or grids.shape[1] != 81:
+        raise ValueError(f'expected boards of 81 cells, got an array of shape {grids.shape}')
+    if grids.size and (grids.min() < 0 or grids.max() > 9):
+        raise ValueError('expected digits 0-9')
+
+    return grids.astype(np.uint8)
+
+
+def to_matrices(grids):
+    """
+    Converts an (N, 81) array of digits to a list of 9x9 matrices, with the same rows as Board.matrix has for each board.
+    """
+    return grids.reshape(-1, 9, 9).tolist()
+
+
+def unit_masks(grids):
+    """
+    Returns the digit bits used in each of the 27 units of every board as an (N, 27) uint16 array,
+    the 9 rows first, then the 9 columns and then the 9 sub-grids, in the order of bitmask.UNITS.
+    """
+    bits = DIGIT_BITS[grids].reshape(-1, 9, 9)
+    rows = np.bitwise_or.reduce(bits, axis=2)
+    columns = np.bitwise_or.reduce(bits, axis=1)
+    boxes = np.bitwise_or.reduce(bits.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9), axis=2)
+    return np.concatenate((rows, columns, boxes), axis=1)
+
+
+def propagate(grids):
+    """
+    Fills in naked and hidden singles on all the boards of an (N, 81) uint8 array until none of them
+    makes progress. Returns a tuple of (the propagated boards as a new array, an array of N statuses),
+    where each status is SOLVED, CONTRADICTION or STUCK (empty cells left that need a guess).
+    """
+    work = grids.copy()
+    status = np.full(len(work), UNKNOWN, dtype=np.uint8)
+    active = np.arange(len(work))
+
+    while active.size:
+        boards = work[active]
+
+        masks = unit_masks(boards)
+        rows, columns, boxes = masks[:, :9], masks[:, 9:18], masks[:, 18:]
+        empty = boards == 0
+        candidates = np.where(empty, bitmask.ALL_DIGITS & ~(rows[:, ROW_OF] | columns[:, COLUMN_OF] | boxes[:, BOX_OF]), 0)
+        candidates = candidates.astype(np.uint16)
+
+        # (N, 27, 9) for each unit and digit, whether the digit is placed and how many cells it fits in
+        placed = (masks[:, :, None] >> DIGIT_SHIFTS) & 1
+        fits = ((candidates[:, UNITS, None] >> DIGIT_SHIFTS) & 1).astype(np.uint8)
+        places = fits.sum(axis=2)
+
+        # a unit with a repeated digit has fewer digits in its mask than filled cells
+        filled = (~empty)[:, UNITS].sum(axis=2)
+        dead = (BIT_COUNT[masks] != filled).any(axis=1)
+        dead |= (empty & (candidates == 0)).any(axis=1)
+        dead |= ((placed == 0) & (places == 0)).any(axis=(1, 2))
+
+        done = ~dead & ~empty.any(axis=1)
+
+        naked = empty & (BIT_COUNT[candidates] == 1) & ~dead[:, None]
+        has_naked = naked.any(axis=1)
+        board_of, cell = np.nonzero(naked)
+        boards[board_of, cell] = SINGLE_DIGIT[candidates[board_of, cell]]
+
+        hidden = (placed == 0) & (places == 1) & ~(dead | has_naked)[:, None, None]
+        has_hidden = hidden.any(axis=(1, 2))
+        board_of, unit, digit = np.nonzero(hidden)
+        position = fits[board_of, unit, :, digit].argmax(axis=1)
+        boards[board_of, UNITS[unit, position]] = digit + 1
+
+        work[active] = boards
+
+        progress = has_naked | has_hidden
+        status[active[dead]] = CONTRADICTION
+        status[active[done]] = SOLVED
+        status[active[~(dead | done | progress)]] = STUCK
+        active = active[progress]
+
+    return (work, status)
+
+
+def solve_array(puzzles):
+    """
+    Use this to solve a batch of sudoku boards, given in any form to_array takes. Returns a tuple of
+    (an (N, 81) uint8 array, a boolean array of N), where the boards that were solved hold their solution
+    and the others stay as they were given, like Board.solve leaves a board without a solution.
+    """
+    grids = to_array(puzzles)
+    work, status = propagate(grids)
+
+    # only the boards propagation got stuck on are searched, each on its own
+    for board in np.flatnonzero(status == STUCK):
+        solution = bitmask.solve(work[board].tolist())
+        if solution is None:
+            status[board] = CONTRADICTION
+        else:
+            work[board] = solution
+            status[board] = SOLVED
+
+    solved = status == SOLVED
+
+    result = grids.copy()
+    result[solved] = work[solved]
+
+    return (result, solved)
+
+
+def solve_matrices(matrices):
+    """
+    Use this to solve a list of 9x9 matrices, the same as the ones Board takes. Returns a tuple of
+    (the list of solved matrices, a list of booleans indicating whether each board was solved).
+    """
+    result, solved = solve_array(matrices)
+    return (to_matrices(result), solved.tolist())
+
+
+def solve_boards(boards):
+    """
+    Use this to solve a list of Board at once. Mutates the cells of each board that was solved,
+    returns a list of booleans indicating whether each board was solved, like Board.solve does for one.
+    """
+    if not boards:
+        return []
+
+    if any(board.geometry.side != 9 for board in boards):
+        raise ValueError('only 9x9 boards can be solved in a batch')
+
+    grids = np.frombuffer(b''.join(board.cells for board in boards), dtype=np.uint8).reshape(-1, 81)
+    result, solved = solve_array(grids)
+
+    for board, cells, was_solved in zip(boards, result, solved):
+        if was_solved:
+            board.cells[:] = cells.tobytes()
+            board.write_back()
+
+    return solved.tolist()
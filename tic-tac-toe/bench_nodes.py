@@ -0,0 +1,96 @@
+"""
+Move Ordering Benchmark
+Goal: Measure how many positions find_best_move visits per decision, with and without move ordering.
+
+Usage:
+    python bench_nodes.py
+    python bench_nodes.py --table
+
+Every position that can come up in a game and is not over yet is a decision, for the player whose turn it is.
+Each one is searched from scratch (a new Search, and a new table with --table) in row-major order like the
+loops of demo.py, and with the move ordering of bitboard.py. The positions visited per decision, the time
+taken and the reduction are reported, and every move picked with ordering is checked against the one picked
+without it.
+"""
+
+import argparse
+import time
+
+from bitboard import FIRST_LINE, FULL, NO_LINE, Search
+from transposition import TranspositionTable
+
+
+def decisions():
+    """
+    Lists every position reachable from the empty board that is not over yet, as (bits of the player to move,
+    bits of the other player).
+    """
+    seen = set()
+    found = []
+
+    def visit(mine, theirs):
+        if (mine, theirs) in seen:
+            return
+        seen.add((mine, theirs))
+
+        empty = FULL ^ (mine | theirs)
+        if FIRST_LINE[mine] != NO_LINE or FIRST_LINE[theirs] != NO_LINE or not empty:
+            return
+
+        found.append((mine, theirs))
+        while empty:
+            move = empty & -empty
+            empty ^= move
+            visit(theirs, mine | move)
+
+    visit(0, 0)
+
+    return found
+
+
+def run(positions, ordered, use_table):
+    """
+    Searches every position with a fresh Search. Returns a tuple of (moves picked, nodes per position,
+    seconds taken).
+    """
+    moves = []
+    nodes = []
+
+    start = time.perf_counter()
+    for mine, theirs in positions:
+        search = Search(TranspositionTable() if use_table else None, ordered)
+        moves.append(search.best_move(mine, theirs)[0])
+        nodes.append(search.nodes)
+    elapsed = time.perf_counter() - start
+
+    return (moves, nodes, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count the positions visited per decision with and without move ordering.')
+    parser.add_argument('--table', action='store_true', help='give every search a transposition table')
+    arguments = parser.parse_args()
+
+    positions = decisions()
+    empty_board = positions.index((0, 0))
+
+    print(f'{len(positions)} decisions, transposition table {"on" if arguments.table else "off"}')
+    print(f'{"ordering":<10} {"total nodes":>12} {"nodes/decision":>15} {"empty board":>12} {"max":>9} {"seconds":>9}')
+
+    results = {}
+    for ordered in (False, True):
+        moves, nodes, elapsed = run(positions, ordered, arguments.table)
+        results[ordered] = (moves, sum(nodes))
+
+        print(
+            f'{"on" if ordered else "off":<10} {sum(nodes):>12} {sum(nodes) / len(nodes):>15.1f} '
+            f'{nodes[empty_board]:>12} {max(nodes):>9} {elapsed:>9.3f}'
+        )
+
+    same = sum(left == right for left, right in zip(results[False][0], results[True][0]))
+    print(f'reduction: {1 - results[True][1] / results[False][1]:.1%}, same moves: {same}/{len(positions)}')
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
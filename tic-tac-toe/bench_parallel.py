@@ -0,0 +1,88 @@
+"""
+Parallel Search Benchmark
+Goal: Measure how the root-split search of parallel.py scales with the number of worker processes.
+
+Usage:
+    python bench_parallel.py --rows 5 --columns 5 --win-length 4 --depth 6 --workers 1 2 4 8
+
+The same positions are searched with the sequential fixed-depth search of mnk.py and then with every worker
+count, and the seconds taken and the speedup over the sequential search are reported. Every move the parallel
+search picks is checked against the sequential one. Starting the worker processes is not part of the timing.
+"""
+
+import argparse
+import random
+import time
+
+from demo import get_board_definitions
+from mnk import find_best_move, winner
+from parallel import ParallelSearch
+
+
+def make_positions(count, rows, columns, win_length, moves, rng):
+    """
+    Plays moves random moves from the empty board, count times, skipping games that are already won.
+    Returns a list of (board, player to move, other player).
+    """
+    X, empty, O = get_board_definitions()
+    positions = []
+
+    while len(positions) < count:
+        board = [[empty] * columns for _row in range(rows)]
+        cells = [(y, x) for y in range(rows) for x in range(columns)]
+        rng.shuffle(cells)
+
+        player, opponent = X, O
+        for y, x in cells[:moves]:
+            board[y][x] = player
+            player, opponent = opponent, player
+
+        if winner(board, win_length, X, O) is None:
+            positions.append((board, player, opponent))
+
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parallel root-split search against the sequential one.')
+    parser.add_argument('--rows', type=int, default=5, help='rows of the board')
+    parser.add_argument('--columns', type=int, default=5, help='columns of the board')
+    parser.add_argument('--win-length', type=int, default=4, help='symbols in a row that win')
+    parser.add_argument('--depth', type=int, default=6, help='how deep to search')
+    parser.add_argument('--moves', type=int, default=4, help='random moves played before each position')
+    parser.add_argument('--positions', type=int, default=5, help='positions to search')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='worker counts to benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random number generator')
+    arguments = parser.parse_args()
+
+    positions = make_positions(
+        arguments.positions, arguments.rows, arguments.columns, arguments.win_length, arguments.moves,
+        random.Random(arguments.seed),
+    )
+
+    start = time.perf_counter()
+    expected = [
+        find_best_move(board, player, opponent, arguments.win_length, time_budget=None, max_depth=arguments.depth)
+        for board, player, opponent in positions
+    ]
+    sequential = time.perf_counter() - start
+
+    print(f'{"workers":<10} {"seconds":>9} {"speedup":>8} {"same moves":>11}')
+    print(f'{"sequential":<10} {sequential:>9.3f} {1:>8.2f} {len(positions):>11}')
+
+    for workers in arguments.workers:
+        with ParallelSearch(workers) as pool:
+            start = time.perf_counter()
+            moves = [
+                pool.find_best_move(board, player, opponent, arguments.win_length, arguments.depth)
+                for board, player, opponent in positions
+            ]
+            elapsed = time.perf_counter() - start
+
+        same = sum(move == wanted for move, wanted in zip(moves, expected))
+        print(f'{workers:<10} {elapsed:>9.3f} {sequential / elapsed:>8.2f} {same:>11}')
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""
+Bitboard Tic Tac Toe Engine
+Goal: Run the minimax of demo.py on a representation where checking for a winner, checking for a full board
+and generating moves are all a handful of integer operations.
+
+Approach: A board is a pair of 9-bit integers, one per player, where bit (y * 3 + x) is set if that player
+has a symbol on the cell at (x, y).
+Steps:
+    1. The 8 ways to win (3 rows, 3 columns, 2 diagonals) are 8 precomputed masks. A player has won when all
+    bits of one of those masks are set in its bits, and since there are only 512 possible bit patterns the
+    answer is precomputed for all of them in FIRST_LINE.
+    2. The empty cells are the bits set in neither player's bits. The board is filled when there are none.
+    3. A move is a single bit, the bit of the cell it is played on.
+    4. Alpha-beta pruning cuts off more of the tree the sooner the best move is tried, so moves are ordered:
+    the best move found for the position before, then the moves that caused the most cutoffs elsewhere in the
+    tree (the history heuristic), then the center, the corners and the edges.
+
+More Details:
+    minimax here takes the bits of the maximizing and minimizing players instead of the board and their symbols,
+    but otherwise follows the steps of minimax in demo.py exactly and returns the very same scores. demo.py
+    converts its board once and hands the search over to this module.
+
+    A Search also counts the positions it visits and can list the principal variation, the moves both players
+    make from a position on if they both play perfectly. bench_nodes.py compares the positions visited with and
+    without move ordering.
+"""
+
+from transposition import EXACT, LOWER_BOUND, UPPER_BOUND
+
+FULL = 0b111111111
+
+WIN_LINES = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+
+# FIRST_LINE[bits] is the index in WIN_LINES of the first full line in those bits, or NO_LINE.
+# check_for_winner in demo.py looks at the lines in this same order, so on a board where both players
+# have a line (which a real game never reaches) the player whose line comes first is the winner here too.
+NO_LINE = len(WIN_LINES)
+FIRST_LINE = tuple(
+    next((index for index, line in enumerate(WIN_LINES) if bits & line == line), NO_LINE)
+    for bits in range(FULL + 1)
+)
+
+# the cells center first, then the corners, then the edges, as the center is on the most lines (4) and the
+# corners on more (3) than the edges (2)
+STATIC_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+
+def to_bitboards(board, first_player, second_player):
+    """
+    to_bitboards converts a 2d board into bitboards.
+
+    :param board: a 2d array that has the board values.
+    :param first_player: an integer that determines whose symbol goes in the first bitboard aka X or O.
+    :param second_player: an integer that determines whose symbol goes in the second bitboard aka X or O.
+    :return: a tuple with the bits of the first and of the second player.
+    """
+    first_bits = 0
+    second_bits = 0
+
+    for y, row in enumerate(board):
+        for x, cell in enumerate(row):
+            if cell == first_player:
+                first_bits |= 1 << (y * 3 + x)
+            elif cell == second_player:
+                second_bits |= 1 << (y * 3 + x)
+
+    return (first_bits, second_bits)
+
+
+def to_board(first_bits, second_bits, first_player, second_player, empty):
+    """
+    to_board converts bitboards back into a 2d board.
+
+    :param first_bits: the bits of the first player.
+    :param second_bits: the bits of the second player.
+    :param first_player: an integer that determines the first player's symbol aka X or O.
+    :param second_player: an integer that determines the second player's symbol aka X or O.
+    :param empty: the value of an empty cell.
+    :return: a 2d array that has the board values.
+    """
+    board = [[empty] * 3 for _row in range(3)]
+
+    for cell in range(9):
+        if first_bits >> cell & 1:
+            board[cell // 3][cell % 3] = first_player
+        elif second_bits >> cell & 1:
+            board[cell // 3][cell % 3] = second_player
+
+    return board
+
+
+class Search:
+    def __init__(self, table=None, ordered=True):
+        """
+        Constructor for a search. A Search can be reused for several searches, what it learned about the
+        order of the moves carries over.
+
+        :param table: an optional TranspositionTable to reuse the scores of positions searched before.
+        :param ordered: a boolean, False tries the moves in row-major order like the loops of demo.py.
+        """
+        self.table = table
+        self.ordered = ordered
+
+        # the best move found for each position searched, as (cell, flag), tried first when it comes up again
+        self.best_moves = {}
+
+        # history[is_maximizing][cell] grows each time a move on that cell caused a cutoff
+        self.history = ([0] * 9, [0] * 9)
+
+        self.nodes = 0
+
+    def ordered_moves(self, empty, first, is_maximizing):
+        """
+        ordered_moves lists the empty cells in the order they should be tried.
+
+        :param empty: the bits of the empty cells.
+        :param first: the cell to try first (the best move found before), -1 for none.
+        :param is_maximizing: a boolean that says whose moves these are.
+        :return: a list of cell indices.
+        """
+        if not self.ordered:
+            return [cell for cell in range(9) if empty >> cell & 1]
+
+        # the sort is stable, so cells without history stay center first, then corners, then edges
+        cells = [cell for cell in STATIC_ORDER if empty >> cell & 1]
+        cells.sort(key=self.history[is_maximizing].__getitem__, reverse=True)
+
+        if first in cells:
+            cells.remove(first)
+            cells.insert(0, first)
+
+        return cells
+
+    def minimax(self, maximizing_bits, minimizing_bits, depth, alpha, beta, is_maximizing):
+        """
+        minimax is minimax of demo.py on bitboards, see there for how it works. Trying the moves in a
+        different order finds the same scores, it only lets alpha-beta pruning cut off more of the tree.
+
+        :param maximizing_bits: the bits of the maximizing player.
+        :param minimizing_bits: the bits of the minimizing player.
+        :param depth: an integer corresponding to how deep the recursion should be.
+        :param alpha: alpha for alpha-beta pruning.
+        :param beta: beta for alpha-beta pruning.
+        :param is_maximizing: a boolean that determines whether we maximize the score or minimize it.
+        :return: an integer corresponding to the score of the board according to the minimax algorithm
+        """
+        self.nodes += 1
+
+        maximizing_line = FIRST_LINE[maximizing_bits]
+        minimizing_line = FIRST_LINE[minimizing_bits]
+
+        if maximizing_line < minimizing_line:
+            return 10
+        if minimizing_line < maximizing_line:
+            return -10
+
+        empty = FULL ^ (maximizing_bits | minimizing_bits)
+        if not empty or depth == 0:
+            return 0
+
+        table = self.table
+        if table is not None:
+            key = table.key(maximizing_bits, minimizing_bits, is_maximizing)
+            entry = table.probe(key, depth)
+
+            if entry is not None:
+                stored_score, flag = entry
+                if flag == EXACT:
+                    return stored_score
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, stored_score)
+                else:
+                    beta = min(beta, stored_score)
+                if beta <= alpha:
+                    return stored_score
+
+        window = (alpha, beta)
+        position = (maximizing_bits, minimizing_bits, is_maximizing)
+        first = self.best_moves.get(position, (-1,))[0]
+        best_cell = -1
+
+        if is_maximizing:
+            best_value = -1000
+            for cell in self.ordered_moves(empty, first, True):
+                result = self.minimax(maximizing_bits | 1 << cell, minimizing_bits, depth - 1, alpha, beta, False)
+                if result > best_value:
+                    best_value = result
+                    best_cell = cell
+                if result > alpha:
+                    alpha = result
+                if beta <= alpha:
+                    self.history[True][cell] += depth * depth
+                    break
+        else:
+            best_value = 1000
+            for cell in self.ordered_moves(empty, first, False):
+                result = self.minimax(maximizing_bits, minimizing_bits | 1 << cell, depth - 1, alpha, beta, True)
+                if result < best_value:
+                    best_value = result
+                    best_cell = cell
+                if result < beta:
+                    beta = result
+                if beta <= alpha:
+                    self.history[False][cell] += depth * depth
+                    break
+
+        if best_value <= window[0]:
+            flag = UPPER_BOUND
+        elif best_value >= window[1]:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+
+        self.best_moves[position] = (best_cell, flag)
+        if table is not None:
+            table.store(key, depth, best_value, flag)
+
+        return best_value
+
+    def best_move(self, maximizing_bits, minimizing_bits, depth=9):
+        """
+        best_move scores every move of the maximizing player like find_best_move in demo.py, and picks the
+        one with the highest score, the first one in row-major order if several have it.
+
+        With ordering on, each move is searched with alpha just below the best score so far. A move that is
+        worse only gets an upper bound on its score, which is all it takes to know it is worse, while a move
+        that ties still gets its exact score. So the move picked is the same as with the full window.
+
+        :param maximizing_bits: the bits of the maximizing player, whose turn it is.
+        :param minimizing_bits: the bits of the minimizing player.
+        :param depth: how deep to search below each move.
+        :return: a tuple (cell, score), the cell is -1 if there is no empty cell.
+        """
+        empty = FULL ^ (maximizing_bits | minimizing_bits)
+        position = (maximizing_bits, minimizing_bits, True)
+        first = self.best_moves.get(position, (-1,))[0]
+
+        best_value = -1000
+        best_cell = -1
+
+        for cell in self.ordered_moves(empty, first, True):
+            alpha = best_value - 1 if self.ordered else -1000
+
+            # the parameter is_maximizing is False as the next move is the minimizing player's
+            move_value = self.minimax(maximizing_bits | 1 << cell, minimizing_bits, depth, alpha, 1000, False)
+
+            if move_value > best_value or (move_value == best_value and cell < best_cell):
+                best_value = move_value
+                best_cell = cell
+
+        if best_cell != -1:
+            self.best_moves[position] = (best_cell, EXACT)
+
+        return (best_cell, best_value)
+
+    def principal_variation(self, maximizing_bits, minimizing_bits, cell, score, depth=9):
+        """
+        principal_variation lists the moves both players make from here on if they both play perfectly,
+        starting with the move best_move picked. Along that line every position has the same score, so each
+        next move is the first one (best move found before, if any) whose search confirms that score.
+
+        :param maximizing_bits: the bits of the maximizing player, whose turn it is.
+        :param minimizing_bits: the bits of the minimizing player.
+        :param cell: the cell best_move picked.
+        :param score: the score best_move returned.
+        :param depth: the depth best_move searched to below each move.
+        :return: a list of cell indices, alternating between the players.
+        """
+        line = []
+        is_maximizing = True
+
+        while cell != -1:
+            line.append(cell)
+            if is_maximizing:
+                maximizing_bits |= 1 << cell
+            else:
+                minimizing_bits |= 1 << cell
+            is_maximizing = not is_maximizing
+
+            empty = FULL ^ (maximizing_bits | minimizing_bits)
+            if FIRST_LINE[maximizing_bits] != NO_LINE or FIRST_LINE[minimizing_bits] != NO_LINE or not empty:
+                break
+
+            position = (maximizing_bits, minimizing_bits, is_maximizing)
+            first = self.best_moves.get(position, (-1,))[0]
+            depth -= 1
+            cell = -1
+
+            for candidate in self.ordered_moves(empty, first, is_maximizing):
+                bit = 1 << candidate
+                if is_maximizing:
+                    result = self.minimax(maximizing_bits | bit, minimizing_bits, depth, score - 1, score + 1, False)
+                else:
+                    result = self.minimax(maximizing_bits, minimizing_bits | bit, depth, score - 1, score + 1, True)
+
+                if result == score:
+                    cell = candidate
+                    break
+
+        return line
+
+
+def minimax(maximizing_bits, minimizing_bits, depth, alpha, beta, is_maximizing, table=None):
+    """
+    minimax is minimax of demo.py on bitboards, see Search.minimax.
+
+    :param maximizing_bits: the bits of the maximizing player.
+    :param minimizing_bits: the bits of the minimizing player.
+    :param depth: an integer corresponding to how deep the recursion should be.
+    :param alpha: alpha for alpha-beta pruning.
+    :param beta: beta for alpha-beta pruning.
+    :param is_maximizing: a boolean that determines whether we maximize the score or minimize it.
+    :param table: an optional TranspositionTable to reuse the scores of positions searched before.
+    :return: an integer corresponding to the score of the board according to the minimax algorithm
+    """
+    return Search(table).minimax(maximizing_bits, minimizing_bits, depth, alpha, beta, is_maximizing)
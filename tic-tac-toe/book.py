@@ -0,0 +1,206 @@
+"""
+Tic Tac Toe Opening Book
+Goal: Turn find_best_move into a table lookup, as there are only a few thousand positions that can ever
+come up in a game.
+
+Approach: Solve every reachable position once and save the answers to a compact binary file.
+Steps:
+    1. Starting from the empty board with X to move, play every possible move recursively and collect every
+    position that is not over yet.
+    2. For each of them, score every move with minimax just like find_best_move does, and keep the value of the
+    position and the set of moves that reach that value.
+    3. Write one 16-bit record per base-3 encoding of the board (3^9 of them), so a record is found by its index
+    without any searching.
+    4. To use the book, memory-map the file and read the record of the current board. Unreachable or finished
+    positions have no record, for those find_best_move falls back to minimax.
+
+More Details:
+    Each record holds the 9 optimal moves as a bitmask (bit y * 3 + x), the value of the position for the player
+    to move in 2 bits (0 loss, 1 tie, 2 win), and a bit that says the record is present. find_best_move picks the
+    first move in row-major order that has the highest score, which is the lowest bit of the mask, so the book
+    always answers with the very same move minimax would.
+
+    Usage:
+        python book.py          builds book.bin next to this file
+        python book.py out.bin  builds it somewhere else
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+# the file starts with a header of (magic, version, number of records)
+HEADER = struct.Struct('<4sHH')
+MAGIC = b'TTTB'
+VERSION = 1
+
+RECORD = struct.Struct('<H')
+RECORD_COUNT = 3 ** 9
+
+MOVES_MASK = 0x1FF
+VALUE_SHIFT = 9
+PRESENT = 0x8000
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'book.bin')
+
+# POWERS[cell] is the power of 3 of the cell (y * 3 + x) in the base-3 encoding
+POWERS = tuple(3 ** cell for cell in range(9))
+
+
+def encode(board):
+    """
+    encode turns a board into its base-3 integer, which is also the index of its record.
+
+    :param board: a 2d array that has the board values.
+    :return: an integer between 0 and 3^9 - 1.
+    """
+    # the board values -1, 0, 1 (X, empty, O) become the digits 2, 0, 1
+    return sum(power * (cell % 3) for power, cell in zip(POWERS, (cell for row in board for cell in row)))
+
+
+def player_to_move(board):
+    """
+    player_to_move figures out whose turn it is, X always goes first.
+
+    :param board: a 2d array that has the board values.
+    :return: an integer corresponding to X or O.
+    """
+    # X and O are -1 and 1 (see get_board_definitions in demo.py), 
+    # so the cells add up to 0 exactly when both have made as many moves
+    return -1 if sum(sum(row) for row in board) == 0 else 1
+
+
+def build(path=DEFAULT_PATH):
+    """
+    build solves every reachable position and writes the book to path.
+
+    :param path: where to write the book.
+    :return: the number of positions in the book.
+    """
+    # demo imports this module, so it is only imported once it is needed
+    from demo import check_for_winner, get_board_definitions, is_board_filled, minimax
+    from transposition import TranspositionTable
+
+    X, empty, O = get_board_definitions()
+    records = [0] * RECORD_COUNT
+    table = TranspositionTable()
+
+    def visit(board, player, opponent):
+        index = encode(board)
+        if records[index] or check_for_winner(board) or is_board_filled(board):
+            return
+
+        scores = {}
+        for y in range(3):
+            for x in range(3):
+                if board[y][x] == empty:
+                    board[y][x] = player
+                    scores[(y, x)] = minimax(board, 9, -1000, 1000, False, player, opponent, table)
+                    visit(board, opponent, player)
+                    board[y][x] = empty
+
+        best = max(scores.values())
+        moves = sum(1 << (y * 3 + x) for (y, x), score in scores.items() if score == best)
+        value = (best > 0) - (best < 0) + 1
+        records[index] = PRESENT | (value << VALUE_SHIFT) | moves
+
+    visit([[empty] * 3 for _row in range(3)], X, O)
+
+    with open(path, 'wb') as book_file:
+        book_file.write(HEADER.pack(MAGIC, VERSION, RECORD_COUNT))
+        book_file.write(struct.pack(f'<{RECORD_COUNT}H', *records))
+
+    return sum(1 for record in records if record)
+
+
+class OpeningBook:
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Constructor for the book, memory-maps the file at path. Records are read straight from the mapping.
+
+        :param path: the file written by build.
+        """
+        with open(path, 'rb') as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.data) < HEADER.size:
+            raise ValueError(f'{path} is not an opening book')
+
+        magic, version, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION or count != RECORD_COUNT:
+            raise ValueError(f'{path} is not an opening book of version {VERSION}')
+
+        if len(self.data) != HEADER.size + RECORD.size * RECORD_COUNT:
+            raise ValueError(f'{path} is truncated')
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exception):
+        self.close()
+
+    def record(self, board):
+        """
+        record reads the record of a board.
+
+        :param board: a 2d array that has the board values.
+        :return: the 16-bit record, 0 if the position is not in the book.
+        """
+        return RECORD.unpack_from(self.data, HEADER.size + RECORD.size * encode(board))[0]
+
+    def best_move(self, board, maximizing_player):
+        """
+        best_move looks up the move find_best_move would pick.
+
+        :param board: a 2d array that has the board values.
+        :param maximizing_player: an integer that determines the maximizing_player / or symbol aka X or O
+        :return: a tuple corresponding to the coordinates of the best move, or None if the book cannot answer.
+        """
+        record = self.record(board)
+
+        # the book only knows the moves of the player whose turn it is
+        if not record & PRESENT or player_to_move(board) != maximizing_player:
+            return None
+
+        moves = record & MOVES_MASK
+        cell = (moves & -moves).bit_length() - 1
+
+        return (cell // 3, cell % 3)
+
+    def value(self, board):
+        """
+        value looks up the outcome of the position with perfect play.
+
+        :param board: a 2d array that has the board values.
+        :return: 1, 0 or -1 for a win, tie or loss of the player to move, None if the position is not in the book.
+        """
+        record = self.record(board)
+
+        if not record & PRESENT:
+            return None
+
+        return ((record >> VALUE_SHIFT) & 0b11) - 1
+
+
+def load_book(path=DEFAULT_PATH):
+    """
+    load_book opens the book if it has been built.
+
+    :param path: the file written by build.
+    :return: an OpeningBook, or None if there is no usable file at path.
+    """
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError):
+        return None
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    destination = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    positions = build(destination)
+    print(f'Wrote {positions} positions to {destination} ({os.path.getsize(destination)} bytes)')
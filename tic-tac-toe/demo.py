@@ -46,16 +46,17 @@ More Details:
     But, we are the maximizer, hence if a different move exists, we would instead be able to pick that.
 """
 
-def main():
+from bitboard import Search, minimax as bitboard_minimax, to_bitboards
+from book import load_book
+from mnk import find_best_move as mnk_find_best_move, winner as mnk_winner
+from transposition import TranspositionTable
+
+def main(rows=3, columns=3, win_length=3, time_budget=1.0):
     # X always goes first, O always goes second
     # but we could pick who's X and who's O
     X, _, O = get_board_definitions()
 
-    board = [
-        [ _, _, _ ],
-        [ _, _, _ ],
-        [ _, _, _ ]
-    ]
+    board = [ [ _ ] * columns for _row in range(rows) ]
 
     player_first = input("Go first? (y/n): ").lower() == "y"
 
@@ -64,6 +65,11 @@ def main():
 
     player_turn = player_first
 
+    # the positions searched for one move come up again when searching for the next,
+    # and if the opening book was built (python book.py) there is no searching at all
+    table = TranspositionTable()
+    book = load_book()
+
     while True:
         print( prettify(board) )
 
@@ -71,7 +77,7 @@ def main():
         # meaning one check after player, and one check after opponent
         # however, the minimax algorithm in tic-tac-toe pretty much ensures
         # that it will win or tie against any opponent
-        winner = check_for_winner(board)
+        winner = check_for_winner(board, win_length)
 
         if winner:
             if winner == player:
@@ -86,9 +92,9 @@ def main():
             break
 
         if player_turn:
-            player_move = int( input("Enter move 1-9: ") ) - 1
-            y = player_move // 3
-            x = player_move % 3
+            player_move = int( input(f"Enter move 1-{rows * columns}: ") ) - 1
+            y = player_move // columns
+            x = player_move % columns
             
             if board[y][x] == _:
                 board[y][x] = player
@@ -96,7 +102,7 @@ def main():
                 print("You cannot use a filled position!")
                 continue
         else:
-            opponent_move = find_best_move(board, opponent, player)
+            opponent_move = find_best_move(board, opponent, player, table, book, win_length, time_budget)
             if opponent_move != (-1, -1):
                 y, x = opponent_move
                 print(f"Opponent moved at {x}, {y}")
@@ -127,7 +133,7 @@ def prettify(board):
     result = ""
         
     for y, row in enumerate(board):
-        result += " ---" * 3
+        result += " ---" * len(row)
         result += "\n"
 
         for x, cell in enumerate(row):
@@ -145,22 +151,26 @@ def prettify(board):
         result += "\n"
         
         if y == len(board) - 1:
-            result += " ---" * 3
+            result += " ---" * len(row)
             result += "\n"
 
     return result
 
-def check_for_winner(board): 
+def check_for_winner(board, win_length=3): 
     """
     check_for_winner checks for a win in a tic-tac-toe board and returns the winner.
     To be more specific, it simply checks if there is any sort of non-empty (empty is 
     defined from get_board_definitions) sequence forming a win in a traditional tic-tac-toe 
-    board.
+    board. Boards of other sizes or win lengths are checked by mnk.py.
 
     :param board: a 2d array that has the board values.
+    :param win_length: how many symbols in a row win.
     :return: an integer that corresponds to a winner, or None
     """
-    empty = get_board_definitions()[1]
+    X, empty, O = get_board_definitions()
+
+    if len(board) != 3 or len(board[0]) != 3 or win_length != 3:
+        return mnk_winner(board, win_length, X, O)
 
     # check for a winner horizontally
     for y in range(3):
@@ -200,16 +210,17 @@ def check_for_winner(board):
        
     return None
 
-def evaluate_board(board, maximize_for):
+def evaluate_board(board, maximize_for, win_length=3):
     """
     evaluate_board calculates a score for a given board where the score is based if 
     a given value is considered the winner or not.
 
     :param board: a 2d array that has the board values.
     :param maximize_for: an integer corresponding to the winner (use get_board_definitions to make sense of this)
+    :param win_length: how many symbols in a row win.
     :return: an integer that corresponds to the score of the board in the perspective of maximize_for
     """
-    winner = check_for_winner(board)
+    winner = check_for_winner(board, win_length)
 
     if not winner:
         return 0
@@ -233,7 +244,7 @@ def is_board_filled(board):
                 return False
     return True
 
-def minimax(board, depth, alpha, beta, is_maximizing, maximizing_player, minimizing_player):
+def minimax(board, depth, alpha, beta, is_maximizing, maximizing_player, minimizing_player, table=None):
     """
     minimax this is the main algorithm that uses the minimax theory. It returns the score of
     the board state according to minimax theory. Essentially we could have multiple board states,
@@ -247,77 +258,83 @@ def minimax(board, depth, alpha, beta, is_maximizing, maximizing_player, minimiz
     :param is_maximizing: a boolean that determines whether we maximize the score or minimize it.
     :param maximizing_player: an integer that determines the maximizing_player / or symbol aka X or O.
     :param minimizing_player: an integer that determines the minimizing_player / or symbol aka X or O.
+    :param table: an optional TranspositionTable to reuse the scores of positions searched before.
     :return: an integer corresponding to the score of the board according to the minimax algorithm
     """
-    score = evaluate_board(board, maximizing_player)
-    _X, empty, _O = get_board_definitions()
-
-    if abs(score) > 0 or is_board_filled(board) or depth == 0:
-        return score 
+    # the search itself runs on bitboards, see bitboard.py
+    maximizing_bits, minimizing_bits = to_bitboards(board, maximizing_player, minimizing_player)
 
-    best_value = (-1 if is_maximizing else 1) * 1000 
+    return bitboard_minimax(maximizing_bits, minimizing_bits, depth, alpha, beta, is_maximizing, table)
 
-    # imagine this as the breadth of the tree graph
-    for y in range(3):
-        for x in range(3):
-            if board[y][x] == empty:
-                board[y][x] = maximizing_player if is_maximizing else minimizing_player
-                
-                # imagine this as the depth of the tree graph
-                minimax_result = minimax(board, depth-1, alpha, beta, not is_maximizing, maximizing_player, minimizing_player) 
-                best_value = (max if is_maximizing else min)(best_value, minimax_result)
-
-                # as we are only testing the move, we set the cell we tested on back to empty
-                board[y][x] = empty
-
-                if is_maximizing:
-                    alpha = max(alpha, minimax_result)
-                else:
-                    beta = min(beta, minimax_result)
-                
-                if beta <= alpha:
-                    break
-        else: # only executed if the inner loop did NOT break
-            continue
-        break
-
-    return best_value
-            
-def find_best_move(board, maximizing_player, minimizing_player):
+def find_best_move(board, maximizing_player, minimizing_player, table=None, book=None, win_length=3, time_budget=1.0):
     """
     find_best_move finds the best possible move assuming this is the maximizing_player's turn.
+    On the traditional 3x3 board the whole game tree is searched. Any other board size or win length
+    is handed to mnk.py, which searches as deep as it can within time_budget.
 
     :param board: a 2d array that has the board values.
     :param maximizing_player: an integer that determines the maximizing_player / or symbol aka X or O
     :param minimizing_player: an integer that determines the minimizing_player / or symbol aka X or O
+    :param table: an optional TranspositionTable, reusing one across calls also reuses the earlier searches.
+    :param book: an optional OpeningBook, positions it has are answered without searching.
+    :param win_length: how many symbols in a row win.
+    :param time_budget: seconds to search for on boards other than 3x3, None for no limit.
     :return: a tuple corresponding to the coordinates of the best move.
     """
-    empty = get_board_definitions()[1]
+    if len(board) != 3 or len(board[0]) != 3 or win_length != 3:
+        return mnk_find_best_move(board, maximizing_player, minimizing_player, win_length, time_budget)
+    if book is not None:
+        move = book.best_move(board, maximizing_player)
+        if move is not None:
+            return move
 
-    best_value = -1000
-    best_move = (-1, -1)
+    maximizing_bits, minimizing_bits = to_bitboards(board, maximizing_player, minimizing_player)
 
-    # as you can see this is simply the same loop for maximizing in the minimax algorithm,
-    # we test all possible moves that are still valid,
-    # and using minimax we get the score of each move,
-    # then we choose the move with the highest score
-    for y in range(3):
-        for x in range(3):
-            if board[y][x] == empty:
-                board[y][x] = maximizing_player
+    # we test all possible moves that are still valid, and using minimax we get the score of each move,
+    # then we choose the move with the highest score, see Search.best_move in bitboard.py
+    cell = Search(table).best_move(maximizing_bits, minimizing_bits)[0]
 
-                # the parameter is_maximizing is False as this test move in this loop is our turn
-                # and the next move would then be our opponent's hence they're gonna be minimizing
-                # as they will pick the move with the least gains for us (equivalently most gains to them) 
-                move_value = minimax(board, 9, -1000, 1000, False, maximizing_player, minimizing_player)
-                
-                if move_value > best_value:
-                    best_move = (y, x) 
-                    best_value = move_value
+    if cell == -1:
+        return (-1, -1)
 
-                board[y][x] = empty
+    return (cell // 3, cell % 3)
 
-    return best_move
+def analyze(board, maximizing_player, minimizing_player, table=None):
+    """
+    analyze finds the best move like find_best_move, and explains it. Only the traditional 3x3 board is supported.
+
+    :param board: a 2d array that has the board values.
+    :param maximizing_player: an integer that determines the maximizing_player / or symbol aka X or O
+    :param minimizing_player: an integer that determines the minimizing_player / or symbol aka X or O
+    :param table: an optional TranspositionTable, reusing one across calls also reuses the earlier searches.
+    :return: a tuple of the best move, its score, the principal variation (the coordinates of the moves both
+    players make from here on if they both play perfectly, starting with the best move) and the number of
+    positions the search visited to find the best move.
+    """
+    if len(board) != 3 or len(board[0]) != 3:
+        raise ValueError("analyze only supports the 3x3 board")
+
+    maximizing_bits, minimizing_bits = to_bitboards(board, maximizing_player, minimizing_player)
+    search = Search(table)
+
+    cell, score = search.best_move(maximizing_bits, minimizing_bits)
+    nodes = search.nodes
+
+    if cell == -1:
+        return ((-1, -1), 0, [], nodes)
+
+    line = search.principal_variation(maximizing_bits, minimizing_bits, cell, score)
+
+    return ((cell // 3, cell % 3), score, [(cell // 3, cell % 3) for cell in line], nodes)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play tic-tac-toe, or any m,n,k game, against the computer.")
+    parser.add_argument("--rows", type=int, default=3, help="number of rows of the board")
+    parser.add_argument("--columns", type=int, default=3, help="number of columns of the board")
+    parser.add_argument("--win-length", type=int, default=3, help="how many symbols in a row win")
+    parser.add_argument("--time-budget", type=float, default=1.0, help="seconds the computer thinks on boards other than 3x3")
+    arguments = parser.parse_args()
+
+    main(arguments.rows, arguments.columns, arguments.win_length, arguments.time_budget)
@@ -0,0 +1,161 @@
+"""
+Tic Tac Toe Game Engine
+Goal: Play games against the AI from code, without the input() loop of main in demo.py, so that a program
+can run as many games at once as it likes.
+
+Approach: A Game holds one board along with whose turn it is, and exposes the two things main does with it.
+Steps:
+    1. apply_move plays a move for the player whose turn it is, after checking that it is allowed.
+    2. best_move asks find_best_move of demo.py for the move of the player whose turn it is.
+    3. winner and is_over tell when the game has ended, the same way main does.
+
+More Details:
+    X always goes first, so whose turn it is follows from the board itself. That is how Game.from_board can pick
+    up a game from any board, and how service.py answers for boards it is sent without being told the player.
+
+    Games can share a TranspositionTable and an OpeningBook, a table is only ever used by one search at a time
+    though, so games that search on different threads each need their own.
+
+    Usage:
+        game = Game()
+        game.apply_move(1, 1)
+        game.apply_move(*game.best_move())
+"""
+
+from book import player_to_move
+from demo import check_for_winner, find_best_move, get_board_definitions, is_board_filled
+
+
+class Game:
+    def __init__(self, rows=3, columns=3, win_length=3, time_budget=1.0, table=None, book=None):
+        """
+        Constructor for a game on an empty board, X moves first.
+
+        :param rows: number of rows of the board.
+        :param columns: number of columns of the board.
+        :param win_length: how many symbols in a row win.
+        :param time_budget: seconds best_move searches for on boards other than 3x3, None for no limit.
+        :param table: an optional TranspositionTable for best_move.
+        :param book: an optional OpeningBook for best_move.
+        """
+        if rows < 1 or columns < 1:
+            raise ValueError(f'a board needs at least one row and one column, not {rows}x{columns}')
+        if not 1 <= win_length <= max(rows, columns):
+            raise ValueError(f'win length {win_length} does not fit on a {rows}x{columns} board')
+
+        empty = get_board_definitions()[1]
+
+        self.board = [[empty] * columns for _row in range(rows)]
+        self.win_length = win_length
+        self.time_budget = time_budget
+        self.table = table
+        self.book = book
+        self.history = []
+
+    @classmethod
+    def from_board(cls, board, win_length=3, **options):
+        """
+        from_board picks up a game from a board, with the turn going to whoever is due.
+
+        :param board: a 2d array that has the board values, it is copied.
+        :param win_length: how many symbols in a row win.
+        :param options: the other arguments of the constructor.
+        :return: a Game.
+        """
+        X, empty, O = get_board_definitions()
+
+        if not board or not board[0] or any(len(row) != len(board[0]) for row in board):
+            raise ValueError('a board must be a non-empty rectangle')
+        if any(cell not in (X, empty, O) for row in board for cell in row):
+            raise ValueError(f'a board can only hold {X}, {empty} and {O}')
+
+        # X goes first, so X has either as many symbols as O (X to move) or one more (O to move)
+        balance = sum(sum(row) for row in board)
+        if balance not in (0, X):
+            raise ValueError('X and O have not taken turns on this board')
+
+        game = cls(len(board), len(board[0]), win_length, **options)
+        game.board = [list(row) for row in board]
+
+        return game
+
+    @property
+    def player(self):
+        """
+        player is the symbol of the player whose turn it is.
+        """
+        return player_to_move(self.board)
+
+    @property
+    def opponent(self):
+        """
+        opponent is the symbol of the player who just moved.
+        """
+        X, _, O = get_board_definitions()
+
+        return O if self.player == X else X
+
+    def winner(self):
+        """
+        winner checks the board for a winner.
+
+        :return: an integer that corresponds to a winner, or None
+        """
+        return check_for_winner(self.board, self.win_length)
+
+    def is_over(self):
+        """
+        is_over checks if the game has ended in a win or a tie.
+
+        :return: a boolean.
+        """
+        return self.winner() is not None or is_board_filled(self.board)
+
+    def apply_move(self, y, x):
+        """
+        apply_move plays a move for the player whose turn it is.
+
+        :param y: the row of the move.
+        :param x: the column of the move.
+        :return: the symbol of the player that moved.
+        """
+        if self.is_over():
+            raise ValueError('the game is over')
+        if not (0 <= y < len(self.board) and 0 <= x < len(self.board[0])):
+            raise ValueError(f'({y}, {x}) is not on the board')
+        if self.board[y][x] != get_board_definitions()[1]:
+            raise ValueError(f'({y}, {x}) is already filled')
+
+        player = self.player
+        self.board[y][x] = player
+        self.history.append((y, x))
+
+        return player
+
+    def undo(self):
+        """
+        undo takes back the last move played with apply_move.
+
+        :return: the coordinates of the move taken back.
+        """
+        if not self.history:
+            raise ValueError('there is no move to take back')
+
+        y, x = self.history.pop()
+        self.board[y][x] = get_board_definitions()[1]
+
+        return (y, x)
+
+    def best_move(self):
+        """
+        best_move finds the best move for the player whose turn it is.
+
+        :return: a tuple corresponding to the coordinates of the best move, (-1, -1) if the game is over.
+        """
+        if self.is_over():
+            return (-1, -1)
+
+        return find_best_move(
+            self.board, self.player, self.opponent,
+            self.table, self.book, self.win_length, self.time_budget,
+        )
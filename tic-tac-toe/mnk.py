@@ -0,0 +1,417 @@
+"""
+m,n,k Game Engine
+Goal: Find good moves on boards of any size where any number in a row wins (4x4, 5x5, or gomoku-style 15x15
+with 5 in a row), where searching the whole game tree like demo.py does for 3x3 is out of reach.
+
+Approach: Iterative deepening alpha-beta search with move ordering and a heuristic evaluator.
+Steps:
+    1. Search every move 1 move deep, then 2 moves deep, then 3 and so on, until the time budget runs out.
+    The best move of the deepest search that finished is the answer.
+    2. When the search reaches its depth without the game being over, the board is scored by counting lines
+    instead of the 0/10/-10 of evaluate_board. Every line of k cells that only one player has symbols on is
+    still winnable by that player, and it is worth more the more symbols they already have on it.
+    3. Alpha-beta pruning cuts off more of the tree the sooner the best move is tried, so moves are ordered:
+    the best move found for the position before (kept in a transposition table), then killer moves (moves that
+    caused a cutoff at the same depth elsewhere in the tree), then the remaining moves center-first.
+
+More Details:
+    Like bitboard.py, the board is one integer per player with bit (y * columns + x) for the cell at (x, y).
+    Python integers have no size limit, so this works for any board size. Every line of k cells is precomputed
+    as a mask, along with the lines that go through each cell, so checking if a move wins only looks at the
+    few lines that go through it.
+
+    The search is written as negamax: the score is always from the point of view of the player to move, and
+    the score of a move is the negated score of the position it leads to for the opponent. A win is worth
+    WIN_SCORE minus the number of moves it takes, so quicker wins are preferred and losses are delayed.
+
+    On big boards only the empty cells near the symbols already placed are considered as moves, since a move
+    far from everything else hardly ever matters.
+"""
+
+import time
+from functools import lru_cache
+
+WIN_SCORE = 10 ** 9
+
+# boards with more cells than this only consider moves within NEAR_DISTANCE cells of an existing symbol
+NEAR_CELLS = 36
+NEAR_DISTANCE = 2
+
+# the clock is only read every this many nodes
+CLOCK_INTERVAL = 256
+
+
+class TimeUp(Exception):
+    """
+    Raised inside the search when the deadline has passed.
+    """
+
+
+class Geometry:
+    def __init__(self, rows, columns, win_length):
+        """
+        Constructor for the precomputed masks of a board size.
+
+        :param rows: the number of rows of the board.
+        :param columns: the number of columns of the board.
+        :param win_length: how many symbols in a row win.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.win_length = win_length
+        self.size = rows * columns
+        self.full = (1 << self.size) - 1
+
+        # every line of win_length cells, horizontal, vertical, and both diagonals
+        self.lines = []
+        for dy, dx in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for y in range(rows):
+                for x in range(columns):
+                    end_y = y + dy * (win_length - 1)
+                    end_x = x + dx * (win_length - 1)
+                    if 0 <= end_y < rows and 0 <= end_x < columns:
+                        self.lines.append(sum(
+                            1 << ((y + dy * step) * columns + x + dx * step) for step in range(win_length)
+                        ))
+
+        self.cell_lines = [[line for line in self.lines if line >> cell & 1] for cell in range(self.size)]
+
+        # the cells from the center outwards, which is the order moves are tried in when nothing better is known
+        center_y = (rows - 1) / 2
+        center_x = (columns - 1) / 2
+        self.order = sorted(range(self.size), key=lambda cell: (
+            max(abs(cell // columns - center_y), abs(cell % columns - center_x)),
+            abs(cell // columns - center_y) + abs(cell % columns - center_x),
+            cell,
+        ))
+        self.rank = [0] * self.size
+        for position, cell in enumerate(self.order):
+            self.rank[cell] = position
+
+        # the cells within NEAR_DISTANCE of each cell, only used on big boards
+        self.near = [
+            sum(
+                1 << other for other in range(self.size)
+                if abs(other // columns - cell // columns) <= NEAR_DISTANCE
+                and abs(other % columns - cell % columns) <= NEAR_DISTANCE
+            )
+            for cell in range(self.size)
+        ] if self.size > NEAR_CELLS else None
+
+        # what a line with that many symbols of only one player is worth
+        self.weights = [0] + [10 ** count for count in range(1, win_length + 1)]
+
+    def wins(self, bits, cell):
+        """
+        wins checks if the symbols in bits form a line through cell.
+
+        :param bits: the bits of a player.
+        :param cell: the index of the cell that was just played.
+        :return: a boolean.
+        """
+        for line in self.cell_lines[cell]:
+            if bits & line == line:
+                return True
+        return False
+
+    def evaluate(self, mine, theirs):
+        """
+        evaluate scores a position by counting the lines each player can still complete.
+
+        :param mine: the bits of the player to move.
+        :param theirs: the bits of the other player.
+        :return: an integer, positive when the player to move is better off.
+        """
+        weights = self.weights
+        score = 0
+
+        for line in self.lines:
+            own = line & mine
+            other = line & theirs
+            if own and not other:
+                score += weights[own.bit_count()]
+            elif other and not own:
+                score -= weights[other.bit_count()]
+
+        return score
+
+    def moves(self, mine, theirs):
+        """
+        moves lists the cells worth playing, center-first.
+
+        :param mine: the bits of the player to move.
+        :param theirs: the bits of the other player.
+        :return: a list of cell indices.
+        """
+        occupied = mine | theirs
+        candidates = self.full ^ occupied
+
+        if self.near is not None and occupied:
+            nearby = 0
+            bits = occupied
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                nearby |= self.near[bit.bit_length() - 1]
+            candidates &= nearby
+
+        return [cell for cell in self.order if candidates >> cell & 1]
+
+
+@lru_cache(maxsize=None)
+def get_geometry(rows, columns, win_length):
+    """
+    get_geometry returns the Geometry of a board size, building it only the first time.
+    """
+    return Geometry(rows, columns, win_length)
+
+
+def to_bits(board, first_player, second_player):
+    """
+    to_bits converts a 2d board of any size into one integer per player.
+
+    :param board: a 2d array that has the board values.
+    :param first_player: an integer that determines whose symbol goes in the first integer aka X or O.
+    :param second_player: an integer that determines whose symbol goes in the second integer aka X or O.
+    :return: a tuple with the bits of the first and of the second player.
+    """
+    columns = len(board[0])
+    first_bits = 0
+    second_bits = 0
+
+    for y, row in enumerate(board):
+        for x, cell in enumerate(row):
+            if cell == first_player:
+                first_bits |= 1 << (y * columns + x)
+            elif cell == second_player:
+                second_bits |= 1 << (y * columns + x)
+
+    return (first_bits, second_bits)
+
+
+def winner(board, win_length, first_player, second_player):
+    """
+    winner checks a board of any size for win_length symbols in a row. The lines are checked rows first,
+    then columns, then diagonals, the same order as check_for_winner in demo.py.
+
+    :param board: a 2d array that has the board values.
+    :param win_length: how many symbols in a row win.
+    :param first_player: an integer corresponding to X or O.
+    :param second_player: an integer corresponding to the other one.
+    :return: the integer of the winner, or None.
+    """
+    geometry = get_geometry(len(board), len(board[0]), win_length)
+    first_bits, second_bits = to_bits(board, first_player, second_player)
+
+    for line in geometry.lines:
+        if first_bits & line == line:
+            return first_player
+        if second_bits & line == line:
+            return second_player
+
+    return None
+
+
+class Search:
+    def __init__(self, geometry, deadline=None):
+        """
+        Constructor for one search, which keeps its transposition table and killer moves across the iterations.
+
+        :param geometry: the Geometry of the board.
+        :param deadline: the time.perf_counter() value to stop at, None for no limit.
+        """
+        self.geometry = geometry
+        self.deadline = deadline
+        self.nodes = 0
+
+        # (mine, theirs) -> (depth, score, flag, best cell)
+        self.table = {}
+        # two killer moves per ply
+        self.killers = [[-1, -1] for _ply in range(geometry.size + 1)]
+
+    def ordered_moves(self, mine, theirs, first, ply):
+        """
+        ordered_moves puts the transposition table move and the killer moves in front of the center-first order.
+        """
+        moves = self.geometry.moves(mine, theirs)
+        front = [cell for cell in (first, *self.killers[ply]) if cell in moves]
+
+        if not front:
+            return moves
+
+        front = list(dict.fromkeys(front))
+        return front + [cell for cell in moves if cell not in front]
+
+    def negamax(self, mine, theirs, depth, alpha, beta, ply):
+        """
+        negamax scores a position for the player to move, see the top part of this program.
+
+        :return: a tuple (score, best cell), the best cell is -1 at the leaves.
+        """
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % CLOCK_INTERVAL == 0 and time.perf_counter() > self.deadline:
+            raise TimeUp()
+
+        geometry = self.geometry
+        if mine | theirs == geometry.full:
+            return (0, -1)
+        if depth == 0:
+            return (geometry.evaluate(mine, theirs), -1)
+
+        key = (mine, theirs)
+        entry = self.table.get(key)
+        first = -1
+
+        if entry is not None:
+            stored_depth, stored_score, flag, first = entry
+
+            # only a search to the very same depth is reused for its score, so that the score of a position never
+            # depends on what was searched before it (parallel.py relies on that), deeper ones still order the moves
+            if stored_depth == depth:
+                if flag == 0:
+                    return (stored_score, first)
+                if flag == 1:
+                    alpha = max(alpha, stored_score)
+                else:
+                    beta = min(beta, stored_score)
+                if alpha >= beta:
+                    return (stored_score, first)
+
+        window = (alpha, beta)
+        best_score = -WIN_SCORE - 1
+        best_cell = -1
+
+        for cell in self.ordered_moves(mine, theirs, first, ply):
+            placed = mine | (1 << cell)
+
+            if geometry.wins(placed, cell):
+                score = WIN_SCORE - ply
+            else:
+                score = -self.negamax(theirs, placed, depth - 1, -beta, -alpha, ply + 1)[0]
+
+            if score > best_score:
+                best_score = score
+                best_cell = cell
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                killers = self.killers[ply]
+                if cell != killers[0]:
+                    killers[1] = killers[0]
+                    killers[0] = cell
+                break
+
+        # 0 exact, 1 lower bound, 2 upper bound, like the flags of transposition.py
+        if best_score <= window[0]:
+            flag = 2
+        elif best_score >= window[1]:
+            flag = 1
+        else:
+            flag = 0
+        self.table[key] = (depth, best_score, flag, best_cell)
+
+        return (best_score, best_cell)
+
+    def score_move(self, mine, theirs, cell, depth, alpha):
+        """
+        score_move scores playing cell in the root position with a search to depth.
+
+        :param alpha: the score is exact when it is above alpha, otherwise it is only an upper bound.
+        :return: an integer, the score for the player to move.
+        """
+        placed = mine | (1 << cell)
+
+        if self.geometry.wins(placed, cell):
+            return WIN_SCORE
+
+        return -self.negamax(theirs, placed, depth - 1, -WIN_SCORE - 1, -alpha, 1)[0]
+
+    def root(self, mine, theirs, depth):
+        """
+        root searches every move of the root position to depth. Unlike in negamax, a move that ties the best score
+        so far is still scored exactly (its window starts just below that score), and a tie goes to the move that
+        comes first center-first. So the answer does not depend on the order the moves were searched in.
+
+        :return: a tuple (best cell, score).
+        """
+        entry = self.table.get((mine, theirs))
+        first = entry[3] if entry is not None else -1
+        rank = self.geometry.rank
+
+        best_score = -WIN_SCORE - 1
+        best_cell = -1
+
+        for cell in self.ordered_moves(mine, theirs, first, 0):
+            score = self.score_move(mine, theirs, cell, depth, best_score - 1)
+
+            if score > best_score or (score == best_score and rank[cell] < rank[best_cell]):
+                best_score = score
+                best_cell = cell
+
+        self.table[(mine, theirs)] = (depth, best_score, 0, best_cell)
+
+        return (best_cell, best_score)
+
+
+def search(mine, theirs, geometry, time_budget=1.0, max_depth=None):
+    """
+    search runs iterative deepening until the time budget runs out or max_depth is reached.
+
+    :param mine: the bits of the player to move.
+    :param theirs: the bits of the other player.
+    :param geometry: the Geometry of the board.
+    :param time_budget: seconds to search for, None for no limit. The first iteration always finishes.
+    :param max_depth: the deepest iteration, None to go until the board is full.
+    :return: a tuple (best cell, score, depth of the deepest finished iteration, nodes searched).
+    """
+    empty_cells = (geometry.full ^ (mine | theirs)).bit_count()
+    max_depth = empty_cells if max_depth is None else min(max_depth, empty_cells)
+
+    moves = geometry.moves(mine, theirs)
+    if not moves:
+        return (-1, 0, 0, 0)
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    runner = Search(geometry)
+    best = (moves[0], 0, 0)
+
+    for depth in range(1, max_depth + 1):
+        try:
+            cell, score = runner.root(mine, theirs, depth)
+        except TimeUp:
+            break
+
+        best = (cell, score, depth)
+
+        # the quickest forced win was found, searching deeper cannot change that
+        # (a forced loss still can, a deeper search may find a way to put it off for longer)
+        if score > WIN_SCORE - geometry.size:
+            break
+
+        runner.deadline = deadline
+
+    return (*best, runner.nodes)
+
+
+def find_best_move(board, player, opponent, win_length, time_budget=1.0, max_depth=None):
+    """
+    find_best_move is find_best_move of demo.py for boards of any size.
+
+    :param board: a 2d array that has the board values.
+    :param player: an integer that determines the symbol of the player to move aka X or O.
+    :param opponent: an integer that determines the symbol of the other player aka X or O.
+    :param win_length: how many symbols in a row win.
+    :param time_budget: seconds to search for, None for no limit.
+    :param max_depth: the deepest iteration, None to go until the board is full.
+    :return: a tuple corresponding to the coordinates of the best move, (-1, -1) if there is none.
+    """
+    columns = len(board[0])
+    geometry = get_geometry(len(board), columns, win_length)
+    mine, theirs = to_bits(board, player, opponent)
+
+    cell = search(mine, theirs, geometry, time_budget, max_depth)[0]
+
+    if cell == -1:
+        return (-1, -1)
+
+    return (cell // columns, cell % columns)
@@ -0,0 +1,183 @@
+"""
+Parallel Root-Split Search
+Goal: Use every core of the machine for one find_best_move, and still get exactly the move the sequential
+search would pick.
+
+Approach: Split the moves of the root position between a pool of worker processes.
+Steps:
+    1. Each root move becomes a task: play it, and score the resulting position with a full search.
+    2. Workers share the best score found so far through shared memory. A task that starts after a good move
+    has been found searches with that as its alpha, so it can prune much more than it could on its own.
+    3. Collect the scores of all root moves and pick the best one with the same tie-breaking rule as the
+    sequential search.
+
+More Details:
+    A worker searches with alpha set just below the shared best score instead of at it. A move that only ties
+    the best score then still gets its exact score, while a move that is worse gets a score below the best one,
+    which is all we need to know about it. That is why the move picked is always the one the sequential search
+    picks, no matter how the tasks were spread over the workers or in which order they finished.
+
+    On the 3x3 board the tasks are the exact minimax of bitboard.py and ties go to the first move in row-major
+    order, like find_best_move in demo.py. On any other board the tasks are the fixed-depth search of mnk.py,
+    and ties go to the first move center-first, like mnk.search with a max_depth and no time budget.
+
+    Usage:
+        with ParallelSearch(workers=4) as pool:
+            move = pool.find_best_move(board, O, X, win_length=4, depth=4)
+"""
+
+import multiprocessing
+
+from bitboard import FULL, minimax as bitboard_minimax, to_bitboards
+from mnk import WIN_SCORE, Search, get_geometry, to_bits
+from transposition import TranspositionTable
+
+# the best root score found so far in the current search, set up in each worker by _start_worker
+_best_score = None
+
+# each worker keeps its own table across the 3x3 searches it is given
+_table = None
+
+
+def _start_worker(best_score):
+    global _best_score, _table
+    _best_score = best_score
+    _table = TranspositionTable(max_size=100_000)
+
+
+def _share(score):
+    """
+    _share raises the shared best score if score is better.
+    """
+    with _best_score.get_lock():
+        if score > _best_score.value:
+            _best_score.value = score
+
+
+def _score_classic(task):
+    """
+    _score_classic scores one root move on the 3x3 board, in a worker.
+
+    :param task: a tuple (maximizing bits, minimizing bits, move bit).
+    :return: a tuple (move bit, score).
+    """
+    maximizing_bits, minimizing_bits, move = task
+    alpha = _best_score.value - 1
+
+    score = bitboard_minimax(maximizing_bits | move, minimizing_bits, 9, alpha, 1000, False, _table)
+    _share(score)
+
+    return (move, score)
+
+
+def _score_mnk(task):
+    """
+    _score_mnk scores one root move of an m,n,k board with a fixed-depth search, in a worker.
+
+    :param task: a tuple (rows, columns, win length, mine, theirs, cell, depth).
+    :return: a tuple (cell, score).
+    """
+    rows, columns, win_length, mine, theirs, cell, depth = task
+    alpha = _best_score.value - 1
+
+    score = Search(get_geometry(rows, columns, win_length)).score_move(mine, theirs, cell, depth, alpha)
+    _share(score)
+
+    return (cell, score)
+
+
+class ParallelSearch:
+    def __init__(self, workers=None):
+        """
+        Constructor for the search, which starts the worker processes. Only one search can run at a time.
+
+        :param workers: the number of worker processes, defaults to the number of cores.
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.best_score = multiprocessing.Value('q', 0)
+        self.pool = multiprocessing.Pool(self.workers, initializer=_start_worker, initargs=(self.best_score,))
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exception):
+        self.close()
+
+    def find_best_move(self, board, maximizing_player, minimizing_player, win_length=3, depth=4):
+        """
+        find_best_move is find_best_move of demo.py with the root moves searched in parallel.
+
+        :param board: a 2d array that has the board values.
+        :param maximizing_player: an integer that determines the maximizing_player / or symbol aka X or O
+        :param minimizing_player: an integer that determines the minimizing_player / or symbol aka X or O
+        :param win_length: how many symbols in a row win.
+        :param depth: how deep to search on boards other than 3x3, the 3x3 board is always searched entirely.
+        :return: a tuple corresponding to the coordinates of the best move, (-1, -1) if there is none.
+        """
+        rows = len(board)
+        columns = len(board[0])
+
+        if rows == 3 and columns == 3 and win_length == 3:
+            return self.classic(board, maximizing_player, minimizing_player)
+
+        return self.mnk(board, maximizing_player, minimizing_player, win_length, depth)
+
+    def classic(self, board, maximizing_player, minimizing_player):
+        """
+        classic splits the exact search of the 3x3 board, see find_best_move.
+        """
+        maximizing_bits, minimizing_bits = to_bitboards(board, maximizing_player, minimizing_player)
+        empty_bits = FULL ^ (maximizing_bits | minimizing_bits)
+
+        tasks = []
+        while empty_bits:
+            move = empty_bits & -empty_bits
+            empty_bits ^= move
+            tasks.append((maximizing_bits, minimizing_bits, move))
+
+        if not tasks:
+            return (-1, -1)
+
+        # every score is above -1000, so this is the same as the -1000 find_best_move starts from
+        self.best_score.value = -1000
+        scores = dict(self.pool.imap_unordered(_score_classic, tasks))
+
+        # the lowest move bit among the best scores is the first one in row-major order
+        best = max(scores.values())
+        move = min(move for move, score in scores.items() if score == best)
+        cell = move.bit_length() - 1
+
+        return (cell // 3, cell % 3)
+
+    def mnk(self, board, player, opponent, win_length, depth):
+        """
+        mnk splits the fixed-depth search of an m,n,k board, see find_best_move.
+        """
+        rows = len(board)
+        columns = len(board[0])
+        geometry = get_geometry(rows, columns, win_length)
+        mine, theirs = to_bits(board, player, opponent)
+
+        empty_cells = (geometry.full ^ (mine | theirs)).bit_count()
+        depth = min(depth, empty_cells)
+
+        # the moves go out center-first, the order in which good moves are most likely to come up early
+        tasks = [
+            (rows, columns, win_length, mine, theirs, cell, depth)
+            for cell in geometry.moves(mine, theirs)
+        ]
+
+        if not tasks:
+            return (-1, -1)
+
+        self.best_score.value = -WIN_SCORE - 1
+        scores = dict(self.pool.imap_unordered(_score_mnk, tasks))
+
+        best = max(scores.values())
+        cell = min((cell for cell, score in scores.items() if score == best), key=geometry.rank.__getitem__)
+
+        return (cell // columns, cell % columns)
@@ -0,0 +1,289 @@
+"""
+Tic Tac Toe Move Service
+Goal: Serve the best moves for many games at once, for AI opponents that all play at the same time.
+
+Usage:
+    python service.py                       reads requests from stdin and writes replies to stdout
+    python service.py --port 8765           serves the same protocol on localhost
+
+Protocol: JSON lines. Each request is one object with a batch of boards, each reply is one object with the
+best move for each of them, in the same order. The id of the request is sent back as it is.
+    {"id": 1, "boards": [[[0, 0, 0], [0, -1, 0], [0, 0, 0]]], "win_length": 3}
+    {"id": 1, "moves": [[0, 0]], "unique": 1, "cached": 0, "searched": 1, "latency_ms": 0.52}
+The boards use the values of get_board_definitions in demo.py (-1 X, 0 empty, 1 O), the move is for the
+player whose turn it is and is [-1, -1] when the game is over. A request that cannot be answered gets
+{"id": ..., "error": "..."} instead. {"id": ..., "stats": true} asks for the totals since the start.
+
+Approach: The service runs on asyncio, so any number of clients can have requests in flight at a time.
+Steps:
+    1. The boards of a batch are checked, and identical boards in it are only looked up once.
+    2. Boards answered before are served from a cache of recent answers, and boards another request is
+    already searching for wait for that search instead of starting their own.
+    3. The rest are searched with find_best_move on a single search thread, so the event loop keeps reading
+    and answering requests from the cache while a search runs. The transposition table is only ever touched by
+    that thread, and the opening book is used when it has been built (python book.py).
+    4. The reply says how many boards were unique, cached and searched, and how long the request took.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from book import load_book
+from game import Game
+from transposition import TranspositionTable
+
+
+class MoveService:
+    def __init__(self, cache_size=100_000, time_budget=1.0, book=None):
+        """
+        Constructor for the service.
+
+        :param cache_size: the most answers to keep, the least recently used is evicted past that.
+        :param time_budget: seconds to search for on boards other than 3x3.
+        :param book: an optional OpeningBook.
+        """
+        self.cache_size = cache_size
+        self.time_budget = time_budget
+        self.book = book
+        self.table = TranspositionTable(max_size=1_000_000)
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.searcher = ThreadPoolExecutor(max_workers=1)
+
+        self.requests = 0
+        self.errors = 0
+        self.positions = 0
+        self.duplicates = 0
+        self.cache_hits = 0
+        self.searches = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def close(self):
+        self.searcher.shutdown()
+
+    def search(self, games):
+        """
+        search finds the best move of each game, on the search thread.
+
+        :param games: a list of Game.
+        :return: a list of moves.
+        """
+        return [game.best_move() for game in games]
+
+    async def best_moves(self, boards, win_length=3):
+        """
+        best_moves answers a batch of boards.
+
+        :param boards: a list of 2d arrays that have the board values.
+        :param win_length: how many symbols in a row win.
+        :return: a tuple (list of moves, number of unique boards, number of those served from the cache).
+        """
+        # identical boards only need one answer, dict keeps them in the order they first came up
+        unique = {}
+        for board in boards:
+            key = (win_length, tuple(tuple(row) for row in board))
+            if key not in unique:
+                unique[key] = Game.from_board(
+                    board, win_length, time_budget=self.time_budget, table=self.table, book=self.book,
+                )
+
+        loop = asyncio.get_running_loop()
+        answers = {}
+        missing = {}
+        waiting = {}
+        for key, game in unique.items():
+            move = self.cache.get(key)
+            if move is not None:
+                self.cache.move_to_end(key)
+                answers[key] = move
+            elif key in self.in_flight:
+                # another request is already searching this board, its answer is shared
+                waiting[key] = self.in_flight[key]
+            else:
+                missing[key] = game
+                self.in_flight[key] = loop.create_future()
+
+        cached = len(answers) + len(waiting)
+
+        if missing:
+            try:
+                moves = await loop.run_in_executor(self.searcher, self.search, list(missing.values()))
+            except BaseException as error:
+                for key in missing:
+                    future = self.in_flight.pop(key)
+                    if isinstance(error, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(error)
+                        # marks the error as seen, requests waiting on the future still get it, and one without
+                        # any would otherwise be logged as "Future exception was never retrieved"
+                        future.exception()
+                raise
+
+            for key, move in zip(missing, moves):
+                answers[key] = move
+                self.cache[key] = move
+                self.in_flight.pop(key).set_result(move)
+
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        for key, future in waiting.items():
+            answers[key] = await future
+
+        self.positions += len(boards)
+        self.duplicates += len(boards) - len(unique)
+        self.cache_hits += cached
+        self.searches += len(missing)
+
+        moves = [answers[(win_length, tuple(tuple(row) for row in board))] for board in boards]
+
+        return (moves, len(unique), cached)
+
+    def stats(self):
+        """
+        stats summarizes what the service has done since it started.
+
+        :return: a dictionary of totals.
+        """
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'positions': self.positions,
+            'duplicates': self.duplicates,
+            'cache_hits': self.cache_hits,
+            'searches': self.searches,
+            'cache_entries': len(self.cache),
+            'mean_latency_ms': self.total_latency / self.requests * 1000 if self.requests else 0.0,
+            'max_latency_ms': self.max_latency * 1000,
+        }
+
+    async def handle(self, line):
+        """
+        handle answers one line of the protocol.
+
+        :param line: a request, a JSON object.
+        :return: the reply, a JSON object.
+        """
+        start = time.perf_counter()
+        request_id = None
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('a request must be a JSON object')
+
+            request_id = request.get('id')
+            if request.get('stats'):
+                return {'id': request_id, 'stats': self.stats()}
+
+            boards = request.get('boards')
+            win_length = request.get('win_length', 3)
+            if not isinstance(boards, list) or not isinstance(win_length, int):
+                raise ValueError('a request needs a list of boards and an integer win_length')
+
+            moves, unique, cached = await self.best_moves(boards, win_length)
+        except (ValueError, TypeError, IndexError) as error:
+            self.errors += 1
+            return {'id': request_id, 'error': str(error)}
+
+        latency = time.perf_counter() - start
+        self.requests += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+        return {
+            'id': request_id,
+            'moves': [list(move) for move in moves],
+            'unique': unique,
+            'cached': cached,
+            'searched': unique - cached,
+            'latency_ms': round(latency * 1000, 3),
+        }
+
+    async def serve_connection(self, reader, writer):
+        """
+        serve_connection answers the requests of one client, each as soon as it is done.
+        """
+        pending = set()
+
+        async def answer(line):
+            writer.write(json.dumps(await self.handle(line)).encode() + b'\n')
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+
+            await asyncio.gather(*pending)
+        finally:
+            writer.close()
+
+
+async def serve_stdio(service):
+    """
+    serve_stdio answers requests read from stdin until it is closed, replies go to stdout.
+    """
+    loop = asyncio.get_running_loop()
+    pending = set()
+
+    async def answer(line):
+        reply = await service.handle(line)
+        sys.stdout.write(json.dumps(reply) + '\n')
+        sys.stdout.flush()
+
+    # stdin is read on its own thread, since it may be a file which asyncio cannot wait on
+    while line := await loop.run_in_executor(None, sys.stdin.readline):
+        if line.strip():
+            task = asyncio.create_task(answer(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+    await asyncio.gather(*pending)
+
+
+async def serve_socket(service, host, port):
+    """
+    serve_socket answers requests from any number of clients on host:port until interrupted.
+    """
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    print(f'Serving on {host}:{port}', file=sys.stderr)
+
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve tic-tac-toe best moves over JSON lines.')
+    parser.add_argument('--port', type=int, help='serve on this localhost port instead of stdin/stdout')
+    parser.add_argument('--host', default='127.0.0.1', help='address to serve on with --port')
+    parser.add_argument('--cache-size', type=int, default=100_000, help='most answers to keep in the cache')
+    parser.add_argument('--time-budget', type=float, default=1.0, help='seconds to search on boards other than 3x3')
+    arguments = parser.parse_args()
+
+    service = MoveService(arguments.cache_size, arguments.time_budget, load_book())
+
+    try:
+        if arguments.port is None:
+            asyncio.run(serve_stdio(service))
+        else:
+            asyncio.run(serve_socket(service, arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        print(json.dumps(service.stats()), file=sys.stderr)
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
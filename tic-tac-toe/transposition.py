@@ -0,0 +1,182 @@
+"""
+Transposition Table for the Tic Tac Toe Minimax
+Goal: Never search the same position twice, including positions that are only rotations or reflections
+of one another.
+
+Approach: Memoization keyed on a canonical encoding of the board.
+Steps:
+    1. Encode the board as an 18-bit integer, the 9 bits of the maximizing player followed by the 9 bits of
+    the minimizing player (see bitboard.py).
+    2. Do that for all 8 rotations and reflections of the square and keep the smallest integer, this is the
+    canonical form that every symmetric variant of the board shares.
+    3. Before searching a position, look up its canonical form. After searching it, store the result.
+
+More Details:
+    With alpha-beta pruning, the score of a position is only exact when it falls strictly inside the
+    (alpha, beta) window it was searched with. A score at or below alpha only says the real score is at most
+    that much (an upper bound), and a score at or above beta only says it is at least that much (a lower bound).
+    So every entry keeps a flag with what kind of score it is, and the depth it was searched to, since a
+    shallower search is not as good as a deeper one.
+
+    The table can be bounded, in which case the least recently used entry is evicted to make room for a new one.
+"""
+
+import time
+from collections import OrderedDict
+
+# the kinds of score an entry can hold
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# each symmetry is the cell (y * 3 + x) that ends up at each position, for the 4 rotations and their mirrors
+SYMMETRIES = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),
+)
+
+# PERMUTATIONS[symmetry][bits] is what the 9 bits of a player become once the symmetry is applied,
+# precomputed for all 512 bit patterns so that applying a symmetry is a single lookup
+PERMUTATIONS = tuple(
+    tuple(
+        sum(1 << position for position, cell in enumerate(symmetry) if bits >> cell & 1)
+        for bits in range(512)
+    )
+    for symmetry in SYMMETRIES
+)
+
+
+def canonical(first_bits, second_bits):
+    """
+    canonical turns a pair of bitboards into the integer that all its symmetric variants share.
+
+    :param first_bits: the 9 bits of the first player.
+    :param second_bits: the 9 bits of the second player.
+    :return: the smallest 18-bit encoding among the 8 rotations and reflections of the board.
+    """
+    return min(
+        permutation[first_bits] << 9 | permutation[second_bits]
+        for permutation in PERMUTATIONS
+    )
+
+
+class TranspositionTable:
+    def __init__(self, max_size=None):
+        """
+        Constructor for the table.
+
+        :param max_size: the most entries to keep, the least recently used is evicted past that. None is unbounded.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, maximizing_bits, minimizing_bits, is_maximizing):
+        """
+        key builds the key a position is stored under. Scores are from the maximizing player's point of view,
+        so the key has whose turn it is on top of the board itself.
+
+        :param maximizing_bits: the bits of the maximizing player.
+        :param minimizing_bits: the bits of the minimizing player.
+        :param is_maximizing: a boolean that says if the maximizing player is the one to move.
+        :return: a hashable key.
+        """
+        return canonical(maximizing_bits, minimizing_bits) << 1 | is_maximizing
+
+    def probe(self, key, depth):
+        """
+        probe looks up an entry that was searched at least as deep as depth.
+
+        :param key: a key made by the key method.
+        :param depth: the depth the caller is about to search to.
+        :return: a tuple (score, flag) or None if there is no usable entry.
+        """
+        entry = self.entries.get(key)
+
+        if entry is None or entry[0] < depth:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.max_size is not None:
+            self.entries.move_to_end(key)
+
+        return entry[1:]
+
+    def store(self, key, depth, score, flag):
+        """
+        store saves the result of a search, replacing any entry under the same key.
+
+        :param key: a key made by the key method.
+        :param depth: the depth the position was searched to.
+        :param score: the score the search returned.
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND.
+        """
+        self.entries[key] = (depth, score, flag)
+        self.stores += 1
+
+        if self.max_size is not None:
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        clear removes every entry, the statistics are kept.
+        """
+        self.entries.clear()
+
+    def stats(self):
+        """
+        stats summarizes how well the table is doing.
+
+        :return: a dictionary with the entry count, hits, misses, hit rate, stores and evictions.
+        """
+        probes = self.hits + self.misses
+
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
+
+
+def main():
+    # shows the speedup on the most expensive search there is, the first move of the game,
+    # demo is imported here as it imports this module itself
+    from demo import find_best_move, get_board_definitions
+
+    X, empty, O = get_board_definitions()
+    board = [[empty] * 3 for _row in range(3)]
+
+    start = time.perf_counter()
+    move = find_best_move(board, X, O)
+    print(f'Without a table: {move} in {time.perf_counter() - start:.4f} s')
+
+    table = TranspositionTable()
+    for attempt in ('cold', 'warm'):
+        start = time.perf_counter()
+        move = find_best_move(board, X, O, table)
+        print(f'With a {attempt} table: {move} in {time.perf_counter() - start:.4f} s, {table.stats()}')
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
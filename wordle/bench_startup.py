@@ -0,0 +1,75 @@
+"""
+Wordle Startup Benchmark
+Goal: Measure how long it takes before the solver can make its first guess, from the text word list and
+from the binary dictionary of dictionary.py.
+
+Usage:
+    python bench_startup.py --runs 20
+
+Each run starts a fresh Python process, so imports and the disk cache are part of the time like on a real
+start. A run loads the index, applies the clues of one guess and picks the next guess with the random
+strategy. The median and best times of each way of loading are reported, along with the time it takes to
+build the binary dictionary itself.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from dictionary import build
+
+RUN = '''
+import time
+start = time.perf_counter()
+{import_line}
+index = {loader}({path!r})
+candidates = index.filter(index.all, 'rates', [], [1], [0, 2, 3, 4])
+index.words[index.ids_of(candidates)[0]]
+print(time.perf_counter() - start)
+'''
+
+LOADERS = (
+    ('text', 'from word_index import WordIndex', 'WordIndex.from_file'),
+    ('binary', 'from dictionary import load_index', 'load_index'),
+)
+
+
+# starts runs fresh processes that load the index, returns the seconds each took, measured from outside
+def run(import_line, loader, path, runs):
+    code = RUN.format(import_line=import_line, loader=loader, path=path)
+    inside = []
+    outside = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        outside.append(time.perf_counter() - start)
+        inside.append(float(result.stdout))
+
+    return (inside, outside)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark how fast the wordle word index loads.')
+    parser.add_argument('--words', default='five_letter_words.txt', help='the word list')
+    parser.add_argument('--runs', type=int, default=10, help='fresh processes per way of loading')
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    build(arguments.words)
+    print(f'building the binary dictionary: {(time.perf_counter() - start) * 1000:.2f} ms')
+
+    print(f'{"loading":<8} {"median ms":>10} {"best ms":>9} {"process ms":>11}')
+    for name, import_line, loader in LOADERS:
+        inside, outside = run(import_line, loader, arguments.words, arguments.runs)
+        print(
+            f'{name:<8} {statistics.median(inside) * 1000:>10.2f} {min(inside) * 1000:>9.2f} '
+            f'{statistics.median(outside) * 1000:>11.2f}'
+        )
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
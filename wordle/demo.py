@@ -8,30 +8,43 @@ until we figure what the actual word is through the letters that we have.
 You can look at the guess function to see how this works. Initially, it has 
 all the 5-letter words. As more clues are given, words are eliminated,
 until hopefully we find the right word.
+
+Under hard mode every guess has to use the clues given so far, so the
+solver only suggests such words. In Absurdle the host has not picked a
+word and keeps as many open as it can, so there is no limit on the
+attempts and the worst strategy, which keeps the biggest group of words
+that could be left as small as it can, is used unless another one is
+asked for.
 """
 
 import random
-words = []
 
-def main():
-    global words
+from multi import MultiSession
+from solver import STRATEGIES, Solver
+
+MODES = ('normal', 'hard', 'absurdle')
 
-    # load the word list
-    with open('five_letter_words.txt', 'r') as words_file:
-        words = [line.rstrip() for line in words_file]
+def main(strategy='random', boards=1, mode='normal'):
+    if boards > 1:
+        return main_boards(strategy, boards)
 
-    print(len(words))
-    print('Wordle-Solver')
+    # load the word list, the solver is shared by every game and the session is this game
+    solver = Solver.from_file('five_letter_words.txt', strategy)
+    session = solver.session(hard=mode == 'hard')
+
+    print(len(solver.words))
+    print(f'Wordle-Solver ({mode} mode)')
     print('Input the corresponding numbers signifying letters according to the rule. Make sure, your answers are comma-separated.') 
 
-    word = get_initial_word()
+    word = get_initial_word(session)
     attempts = 1
-    max_attempts = 6
+    # Absurdle goes on until the host runs out of words
+    max_attempts = None if mode == 'absurdle' else 6
     found_answer = False
  
-    while attempts <= max_attempts:
+    while max_attempts is None or attempts <= max_attempts:
         print(prettify(word))
-        next_word = ask(word)
+        next_word = ask(session, word)
 
         if (word == next_word):
             found_answer = True
@@ -47,6 +60,29 @@ def main():
 
     print('Program End.')
 
+# plays several boards at once, like Quordle (4 boards) or Octordle (8 boards)
+def main_boards(strategy, boards):
+    solver = Solver.from_file('five_letter_words.txt', strategy)
+    session = MultiSession(solver, boards)
+    max_attempts = boards + 5
+
+    print(f'Wordle-Solver, {boards} boards')
+    print('Input the corresponding numbers signifying letters according to the rule, for each board. Make sure, your answers are comma-separated.')
+
+    word = session.next_guess()
+
+    for attempt in range(1, max_attempts + 1):
+        print(prettify(word))
+        word = guess_boards(session, word, ask_boards(session))
+
+        if session.is_solved():
+            print(f'Solved all {boards} boards in {attempt} attempts:\n' + ' '.join(session.guesses()))
+            break
+    else:
+        print(f'Failed to solve all boards within {max_attempts}')
+
+    print('Program End.')
+
 # helper to automatically parse inputs
 def custom_input(question):
     indices = input(question).split(',')
@@ -57,45 +93,43 @@ def custom_input(question):
     return list(map(lambda x: int(x) - 1, indices))
 
 # use to prompt for inputs
-def ask(word=''):
+def ask(session, word=''):
     green = custom_input('Green (Right placement): ')
     yellow = custom_input('Yellow (Wrong placement): ')
     gray = custom_input('Gray (Non-existent): ')
 
-    return guess(word, green, yellow, gray)
+    return guess(session, word, green, yellow, gray)
 
-# guesses a new word according to previous word and its state
-def guess(previous_word='', green=[], yellow=[], gray=[]):
-    if (len(previous_word) == 0): return random.choice(words)
+# use to prompt for the inputs of every board still being played, solved boards get no clues
+def ask_boards(session):
+    board_clues = [None] * len(session.candidates)
 
-    right_placement = list(map(lambda x: previous_word[x], green))
-    wrong_placement = list(map(lambda x: previous_word[x], yellow))
-    non_existent = list(map(lambda x: previous_word[x], gray))
-    non_existent = list(filter(lambda x: x not in (right_placement + wrong_placement), non_existent))
+    for board in session.active():
+        print(f'Board {board + 1}:')
+        green = custom_input('Green (Right placement): ')
+        yellow = custom_input('Yellow (Wrong placement): ')
+        gray = custom_input('Gray (Non-existent): ')
+        board_clues[board] = (green, yellow, gray)
 
-    for index in range(len(words)-1, -1, -1):
-        word = words[index]
+    return board_clues
 
-        # skip and remove words with non-existent letters
-        if (len(non_existent) > 0 and any(letter in non_existent for letter in word)):
-            del words[index]
-            continue
+# guesses a new word according to previous word and its state,
+# under hard mode (see Solver.session) the new word uses every clue so far
+# and a previous word that does not is refused with a ValueError
+def guess(session, previous_word='', green=[], yellow=[], gray=[]):
+    if (len(previous_word) > 0):
+        session.apply(previous_word, green, yellow, gray)
 
-        # skip and remove words which do not have the right placement of green letters
-        if (len(green) > 0 and not all(word[green_index] == previous_word[green_index] for green_index in green)):
-            del words[index]
-            continue
- 
-        # delete words that have letters on wrong placement
-        if (len(yellow) > 0 and any(word[yellow_index] == previous_word[yellow_index] for yellow_index in yellow)):
-            del words[index]
-            continue
+    return session.next_guess()
+
+# the same for several boards, board_clues has the (green, yellow, gray) of each board
+def guess_boards(session, previous_word, board_clues):
+    session.apply(previous_word, board_clues)
 
-        if (len(yellow) and not all(letter in word for letter in wrong_placement)):
-            del words[index]
-            continue 
+    if session.is_solved():
+        return previous_word
 
-    return random.choice(words)
+    return session.next_guess()
 
 # decorates given text with borders
 def add_border(text):
@@ -111,19 +145,34 @@ def prettify(word):
     return add_border(' '.join(list(word.upper())) + '\n1 2 3 4 5')
 
 # Either chooses a random word or prompts the user
-def get_initial_word():
-    initial_word = random.choice(words)
+def get_initial_word(session):
+    initial_word = session.next_guess()
     print(prettify(initial_word))
 
     if input('Enter word of your choice? (y/n) ') == 'y':
         initial_word = input('Enter your word: ').lower()
 
     while input('Is the initial word okay? (y/n) ') == 'n':
-        initial_word = random.choice(words)
+        initial_word = random.choice(session.solver.words)
         print(prettify(initial_word))
 
     return initial_word
 
 # runs only when run as a script
 if __name__ == '__main__':
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Solve wordle from the clues of each guess.')
+    parser.add_argument('--strategy', choices=STRATEGIES, default=None, help='how to pick the next guess, random by default and worst in absurdle mode')
+    parser.add_argument('--boards', type=int, default=1, help='boards played at once, 4 for Quordle and 8 for Octordle')
+    parser.add_argument('--mode', choices=MODES, default='normal', help='the rules of the game, hard mode or Absurdle')
+    parser.add_argument('--hard', action='store_const', const='hard', dest='mode', help='same as --mode hard')
+    parser.add_argument('--absurdle', action='store_const', const='absurdle', dest='mode', help='same as --mode absurdle')
+    arguments = parser.parse_args()
+
+    if arguments.boards > 1 and arguments.mode != 'normal':
+        parser.error(f'--mode {arguments.mode} is only played on one board')
+    if arguments.strategy is None:
+        arguments.strategy = 'worst' if arguments.mode == 'absurdle' else 'random'
+
+    main(arguments.strategy, arguments.boards, arguments.mode)
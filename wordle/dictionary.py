@@ -0,0 +1,163 @@
+"""
+Wordle Binary Dictionary
+Goal: Start up without reading, stripping and indexing the word list again on every run.
+
+The word list and the sets of word_index.py are built once into one binary file next to the word list
+(five_letter_words.txt becomes five_letter_words.bin), which is memory mapped on the next start:
+    header      magic, version, word count and the sha256 of the word list file it was built from
+    records     5 bytes per word, the word itself, in word list order
+    positions   for each position and letter a..z, the set of words with that letter there
+    counts      for each letter a..z and count 1 to 5, the set of words with at least that many copies
+Every set is a little-endian bitset of (words + 7) // 8 bytes.
+
+Nothing is read up front. A word is decoded from its record when it is asked for, and a set is turned
+into a Python int the first time a clue needs it. When the word list file changes its checksum no longer
+matches and the file is built again.
+
+Usage:
+    python dictionary.py                        builds the dictionary of five_letter_words.txt
+    python dictionary.py other_words.txt        builds it for another word list
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from word_index import WordIndex
+
+HEADER = struct.Struct('<4sHI32s')
+MAGIC = b'WDIX'
+VERSION = 1
+
+RECORD_SIZE = 5
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+# where the binary dictionary of the word list at path goes
+def binary_path(path):
+    return os.path.splitext(path)[0] + '.bin'
+
+
+# the checksum of the word list file the dictionary is tied to
+def checksum(path):
+    with open(path, 'rb') as words_file:
+        return hashlib.sha256(words_file.read()).digest()
+
+
+# builds the binary dictionary of the word list at path, raises ValueError for words it cannot hold
+def build(path, destination=None):
+    destination = destination or binary_path(path)
+    index = WordIndex.from_file(path)
+
+    for word in index.words:
+        if len(word) != RECORD_SIZE or not set(word) <= set(LETTERS):
+            raise ValueError(f'{word!r} is not 5 letters from a to z')
+
+    size = (len(index.words) + 7) // 8
+    sets = [index.with_letter_at(position, letter) for position in range(5) for letter in LETTERS]
+    sets += [index.with_at_least(letter, count) for letter in LETTERS for count in range(1, 6)]
+
+    # written next to the file first, so a reader never maps a half-written one
+    partial = destination + '.partial'
+    with open(partial, 'wb') as binary_file:
+        binary_file.write(HEADER.pack(MAGIC, VERSION, len(index.words), checksum(path)))
+        binary_file.write(''.join(index.words).encode('ascii'))
+        for bitset in sets:
+            binary_file.write(bitset.to_bytes(size, 'little'))
+    os.replace(partial, destination)
+
+    return destination
+
+
+class Records:
+    # the words of the dictionary as a read-only list, each decoded from its record when asked for
+    def __init__(self, data, count):
+        self.data = data
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, word_id):
+        if not 0 <= word_id < self.count:
+            raise IndexError('word id out of range')
+        start = HEADER.size + RECORD_SIZE * word_id
+        return self.data[start:start + RECORD_SIZE].decode('ascii')
+
+    def __iter__(self):
+        return (self[word_id] for word_id in range(self.count))
+
+
+class CompiledIndex(WordIndex):
+    # a WordIndex read from a binary dictionary instead of built from the word list
+    def __init__(self, path, expected_checksum=None):
+        with open(path, 'rb') as binary_file:
+            self.data = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.data) < HEADER.size:
+            raise ValueError(f'{path} is not a word dictionary')
+
+        magic, version, count, stored_checksum = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a word dictionary of version {VERSION}')
+        if expected_checksum is not None and stored_checksum != expected_checksum:
+            raise ValueError(f'{path} was built from another word list')
+
+        self.size = (count + 7) // 8
+        self.tables = HEADER.size + RECORD_SIZE * count
+        if len(self.data) != self.tables + self.size * (26 * 5 + 26 * 5):
+            raise ValueError(f'{path} is truncated')
+
+        self.words = Records(self.data, count)
+        self.all = (1 << count) - 1
+        # the sets already turned into ints, by their number in the file
+        self.sets = {}
+
+    # the set with the given number in the file
+    def bitset(self, number):
+        bitset = self.sets.get(number)
+        if bitset is None:
+            start = self.tables + self.size * number
+            bitset = self.sets[number] = int.from_bytes(self.data[start:start + self.size], 'little')
+        return bitset
+
+    def with_letter_at(self, position, letter):
+        letter_number = LETTERS.find(letter)
+        if letter_number == -1 or len(letter) != 1:
+            return 0
+        return self.bitset(position * 26 + letter_number)
+
+    def with_at_least(self, letter, count):
+        if count == 0:
+            return self.all
+        letter_number = LETTERS.find(letter)
+        if count > 5 or letter_number == -1 or len(letter) != 1:
+            return 0
+        return self.bitset(26 * 5 + letter_number * 5 + count - 1)
+
+
+# the index of the word list at path, from its binary dictionary, which is built first if it is missing
+# or out of date, a word list the dictionary cannot hold is indexed straight from the text
+def load_index(path):
+    destination = binary_path(path)
+    expected_checksum = checksum(path)
+
+    try:
+        return CompiledIndex(destination, expected_checksum)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        build(path, destination)
+        return CompiledIndex(destination, expected_checksum)
+    except (OSError, ValueError):
+        return WordIndex.from_file(path)
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    source = sys.argv[1] if len(sys.argv) > 1 else 'five_letter_words.txt'
+    written = build(source)
+    print(f'Wrote {len(CompiledIndex(written).words)} words to {written} ({os.path.getsize(written)} bytes)')
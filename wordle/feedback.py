@@ -0,0 +1,245 @@
+"""
+Wordle Feedback Matrix
+Goal: Pick the guess that narrows down the candidates the most, instead of a random candidate.
+
+The feedback of a guess against an answer is a pattern of 5 colors, stored as a base 3 number
+(gray 0, yellow 1, green 2, the first letter is the lowest digit), so there are 3^5 = 243 patterns
+and each fits in a byte. The pattern of every guess against every answer in the word list is
+precomputed once into a (words x words) uint8 NumPy matrix and cached to disk, where it is memory
+mapped on the next start.
+
+To score a guess, its row is restricted to the remaining candidates and the candidates are
+counted per pattern. The guess is good when those buckets are small: either the expected
+information (the entropy of the bucket sizes) is high, or the expected size of the bucket the
+answer ends up in is low, or the biggest bucket is small (what matters against a host that picks
+the answer as late as it can). All guesses are scored at once with a single bincount.
+
+With several boards at once (Quordle, Octordle) the same guess is played on each of them, so the
+candidates of all the boards still being played are scored together: each board gets its own range of
+patterns in the same bincount, and the scores of a guess are summed over the boards.
+
+The best first guess only depends on the word list, so it is stored along with the matrix.
+"""
+
+import hashlib
+import os
+import struct
+
+import numpy as np
+
+
+GRAY = 0
+YELLOW = 1
+GREEN = 2
+
+PATTERNS = 3 ** 5
+ALL_GREEN = PATTERNS - 1
+
+# header of the cache file: magic, version, word count, the first guess of each strategy,
+# then the sha256 of the word list, and the matrix right after it
+HEADER = struct.Struct('<4sHIIII32s')
+MAGIC = b'WFBM'
+VERSION = 2
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feedback.bin')
+
+STRATEGIES = ('entropy', 'size', 'worst')
+
+# the most (guess, candidate) pairs scored in one bincount, more guesses are scored a block at a time,
+# which only matters with several boards where the candidates of all of them add up
+BLOCK_SIZE = 1 << 22
+
+
+# the patterns of every guess against every answer, both the words list, same rules as clues in word_index.py
+def build_matrix(words):
+    letters = np.array([[ord(letter) - ord('a') for letter in word] for word in words], dtype=np.int16)
+    count = len(words)
+    powers = 3 ** np.arange(5)
+
+    # letter_counts[answer, letter] is how many times letter is in answer
+    letter_counts = np.zeros((count, 26), dtype=np.int8)
+    for position in range(5):
+        np.add.at(letter_counts, (np.arange(count), letters[:, position]), 1)
+
+    matrix = np.empty((count, count), dtype=np.uint8)
+
+    for guess_id in range(count):
+        guess = letters[guess_id]
+        greens = letters == guess
+
+        # copies of each letter not matched by a green
+        unmatched = letter_counts.copy()
+        for position in range(5):
+            unmatched[greens[:, position], guess[position]] -= 1
+
+        codes = (greens * powers).sum(axis=1) * GREEN
+        for position in range(5):
+            letter = guess[position]
+            yellows = ~greens[:, position] & (unmatched[:, letter] > 0)
+            unmatched[yellows, letter] -= 1
+            codes += yellows * (YELLOW * powers[position])
+
+        matrix[guess_id] = codes
+
+    return matrix
+
+
+# the checksum the cache file is tied to
+def digest(words):
+    return hashlib.sha256('\n'.join(words).encode()).digest()
+
+
+# expected information (bits), expected remaining candidates and most remaining candidates of every guess
+# against the candidates, matrix rows are guesses (all of them, or guess_ids) and candidate_ids the columns
+# of the answers still possible
+def scores(matrix, candidate_ids, guess_ids=None):
+    return multi_scores(matrix, [candidate_ids], guess_ids)
+
+
+# the same scores summed over several boards, candidate_id_lists has the candidate ids of each board
+def multi_scores(matrix, candidate_id_lists, guess_ids=None):
+    every_guess = guess_ids is None
+    guess_ids = np.arange(len(matrix)) if every_guess else np.asarray(guess_ids, dtype=np.intp)
+    boards = len(candidate_id_lists)
+    sizes = np.array([len(ids) for ids in candidate_id_lists], dtype=np.float64)
+
+    # the candidates of all the boards side by side, board b has the patterns b * 243 to b * 243 + 242
+    candidate_ids = np.concatenate([np.asarray(ids, dtype=np.intp) for ids in candidate_id_lists])
+    board_offsets = np.repeat(np.arange(boards, dtype=np.intp) * PATTERNS, sizes.astype(np.intp))
+    width = boards * PATTERNS
+
+    # the entropy of a board with n candidates is log2(n) - sum(count * log2(count)) / n over its patterns,
+    # the count * log2(count) of every count is looked up instead of taking logarithms of every pattern
+    count_log_count = np.arange(int(sizes.max()) + 1, dtype=np.float64)
+    count_log_count[1:] *= np.log2(count_log_count[1:])
+
+    entropy = np.empty(len(guess_ids))
+    expected_size = np.empty(len(guess_ids))
+    worst = np.empty(len(guess_ids), dtype=np.intp)
+    block = max(1, BLOCK_SIZE // max(1, len(candidate_ids)))
+
+    for first in range(0, len(guess_ids), block):
+        rows = guess_ids[first:first + block]
+        # a slice of rows is read straight from the matrix, a list of rows has to be copied out first
+        block_rows = matrix[first:first + block] if every_guess else matrix[rows]
+        sub = block_rows[:, candidate_ids].astype(np.intp)
+        sub += board_offsets
+        sub += np.arange(len(rows), dtype=np.intp)[:, None] * width
+
+        # counts[guess, board, pattern] is how many candidates of the board give that pattern, in one bincount
+        counts = np.bincount(sub.ravel(), minlength=len(rows) * width).reshape(len(rows), boards, PATTERNS)
+
+        entropy[first:first + block] = (np.log2(sizes) - count_log_count[counts].sum(axis=2) / sizes).sum(axis=1)
+        expected_size[first:first + block] = ((counts * counts).sum(axis=2) / sizes).sum(axis=1)
+        worst[first:first + block] = counts.max(axis=2).sum(axis=1)
+
+    return (entropy, expected_size, worst)
+
+
+# the id of the best guess, strategy 'entropy' maximizes the expected information, 'size' minimizes the
+# expected remaining candidates and 'worst' the most remaining candidates, a guess that could be the answer
+# wins ties, guess_ids are the words allowed as guesses (all of them if None)
+def best_guess(matrix, candidate_ids, strategy='entropy', guess_ids=None):
+    return best_multi_guess(matrix, [candidate_ids], strategy, guess_ids)
+
+
+# the id of the best guess to play on several boards at once, candidate_id_lists has the candidate ids of
+# each board still being played, the strategies are the ones of best_guess with the scores summed over the boards
+def best_multi_guess(matrix, candidate_id_lists, strategy='entropy', guess_ids=None):
+    candidate_id_lists = [np.asarray(ids, dtype=np.intp) for ids in candidate_id_lists]
+
+    # a board down to one word is solved by guessing it, and on the last board with 2 candidates
+    # no guess splits them better than guessing one of them
+    for ids in candidate_id_lists:
+        if len(ids) == 1 or (len(candidate_id_lists) == 1 and len(ids) <= 2):
+            return int(ids[0])
+
+    guess_ids = np.arange(len(matrix)) if guess_ids is None else np.asarray(guess_ids, dtype=np.intp)
+    entropy, expected_size, worst = multi_scores(matrix, candidate_id_lists, guess_ids)
+    is_candidate = np.isin(guess_ids, np.concatenate(candidate_id_lists))
+
+    # lexsort sorts by the last key first, the best guess ends up last
+    if strategy == 'entropy':
+        order = np.lexsort((is_candidate, entropy))
+    elif strategy == 'size':
+        order = np.lexsort((is_candidate, -expected_size))
+    elif strategy == 'worst':
+        order = np.lexsort((is_candidate, -expected_size, -worst))
+    else:
+        raise ValueError(f'unknown strategy {strategy!r}, expected one of {STRATEGIES}')
+
+    return int(guess_ids[order[-1]])
+
+
+class FeedbackMatrix:
+    def __init__(self, words, path=DEFAULT_PATH):
+        self.words = list(words)
+        self.path = path
+
+        if not self.load():
+            self.build()
+            self.load()
+
+    # maps the cache file if it was built for this word list
+    def load(self):
+        count = len(self.words)
+
+        try:
+            with open(self.path, 'rb') as cache_file:
+                header = cache_file.read(HEADER.size)
+        except OSError:
+            return False
+
+        if len(header) != HEADER.size:
+            return False
+
+        magic, version, stored_count, entropy_first, size_first, worst_first, stored_digest = HEADER.unpack(header)
+        if (magic, version, stored_count, stored_digest) != (MAGIC, VERSION, count, digest(self.words)):
+            return False
+        if os.path.getsize(self.path) != HEADER.size + count * count:
+            return False
+
+        self.matrix = np.memmap(self.path, dtype=np.uint8, mode='r', offset=HEADER.size, shape=(count, count))
+        self.first_guesses = {'entropy': entropy_first, 'size': size_first, 'worst': worst_first}
+        return True
+
+    # computes the matrix and the first guesses and writes them to the cache file
+    def build(self):
+        matrix = build_matrix(self.words)
+        everything = np.arange(len(self.words))
+        first_guesses = [best_guess(matrix, everything, strategy) for strategy in STRATEGIES]
+
+        # written next to the file first, so a reader never maps a half-written one
+        partial = self.path + '.partial'
+        with open(partial, 'wb') as cache_file:
+            cache_file.write(HEADER.pack(MAGIC, VERSION, len(self.words), *first_guesses, digest(self.words)))
+            cache_file.write(matrix.tobytes())
+        os.replace(partial, self.path)
+
+    # the best guess among the words with the given ids, the precomputed one when nothing was ruled out yet,
+    # guess_ids are the words allowed as guesses (all of them if None)
+    def best_guess(self, candidate_ids, strategy='entropy', guess_ids=None):
+        return self.best_multi_guess([candidate_ids], strategy, guess_ids)
+
+    # the best guess to play on boards that each have the candidates with the given ids, every board scores
+    # a guess the same way before anything was ruled out, so the precomputed one is used then too
+    def best_multi_guess(self, candidate_id_lists, strategy='entropy', guess_ids=None):
+        if guess_ids is None and all(len(ids) == len(self.words) for ids in candidate_id_lists):
+            if strategy not in self.first_guesses:
+                raise ValueError(f'unknown strategy {strategy!r}, expected one of {STRATEGIES}')
+            return self.words[self.first_guesses[strategy]]
+
+        return self.words[best_multi_guess(self.matrix, candidate_id_lists, strategy, guess_ids)]
+
+
+# builds the cache file when run as a script
+if __name__ == '__main__':
+    import time
+
+    with open('five_letter_words.txt', 'r') as words_file:
+        word_list = [line.rstrip() for line in words_file]
+
+    start = time.perf_counter()
+    feedback = FeedbackMatrix(word_list)
+    print(f'Loaded {len(word_list)}x{len(word_list)} matrix in {time.perf_counter() - start:.3f} s')
+    print(f'First guesses: {", ".join(f"{strategy} {feedback.best_guess(range(len(word_list)), strategy)}" for strategy in STRATEGIES)}')
@@ -0,0 +1,88 @@
+"""
+Wordle Multi-Board Sessions
+Goal: Play Quordle, Octordle and the like, where every guess is played on several boards at once, each with
+its own hidden word, until every board is solved.
+
+A MultiSession is a Session of solver.py with one set of candidates per board, all of them bitsets over the
+word ids of the same Solver, so the word list is indexed once however many boards there are. Each guess
+gets its own clues on every board, which narrow down that board's candidates.
+
+A board is solved once a guess comes back all green, and from then on it drops out: its candidates are no
+longer scored, and it takes no clues. The guess is scored against the candidates of every board still being
+played in one pass (see multi_scores in feedback.py), and a board that is down to one word is simply solved
+by guessing that word, so the work of a turn follows the candidates that are left rather than the number
+of boards.
+
+Usage:
+    session = MultiSession(Solver.from_file('five_letter_words.txt', strategy='entropy'), boards=4)
+    word = session.next_guess()
+    session.apply(word, [([0], [3], [1, 2, 4]), ([], [], [0, 1, 2, 3, 4]), ...])     clues of each board
+"""
+
+import random
+
+ALL_POSITIONS = [0, 1, 2, 3, 4]
+
+
+class MultiSession:
+    __slots__ = ('solver', 'candidates', 'solved', 'history', 'rng')
+
+    def __init__(self, solver, boards=4, rng=None):
+        if boards < 1:
+            raise ValueError('there has to be at least one board')
+
+        self.solver = solver
+        self.candidates = [solver.index.all] * boards
+        self.solved = [False] * boards
+        # (guess, candidates and solved of every board before its clues) for every guess applied
+        self.history = []
+        # the random module by default, like Solver.session
+        self.rng = rng or random
+
+    # the boards still being played
+    def active(self):
+        return [board for board, solved in enumerate(self.solved) if not solved]
+
+    # how many words still fit every clue, for each board
+    def remaining(self):
+        return [candidates.bit_count() for candidates in self.candidates]
+
+    # the words that still fit every clue of a board, in word list order
+    def words(self, board):
+        return self.solver.index.words_of(self.candidates[board])
+
+    # the guesses whose clues were applied, in order
+    def guesses(self):
+        return [entry[0] for entry in self.history]
+
+    def is_solved(self):
+        return all(self.solved)
+
+    def next_guess(self):
+        return self.solver.best_multi_guess([self.candidates[board] for board in self.active()], self.rng)
+
+    # narrows down the candidates of every board still being played with the clues of word,
+    # board_clues has a (green, yellow, gray) tuple for each board, which is not looked at for solved boards
+    def apply(self, word, board_clues):
+        if len(board_clues) != len(self.candidates):
+            raise ValueError(f'expected the clues of {len(self.candidates)} boards, got {len(board_clues)}')
+
+        index = self.solver.index
+        self.history.append((word, list(self.candidates), list(self.solved)))
+
+        for board in self.active():
+            green, yellow, gray = board_clues[board]
+            self.candidates[board] = index.filter(self.candidates[board], word, green, yellow, gray)
+
+            if sorted(green) == ALL_POSITIONS:
+                self.solved[board] = True
+
+        return self.remaining()
+
+    # takes back the clues of the last guess, and returns that guess
+    def undo(self):
+        if not self.history:
+            raise ValueError('there are no clues to take back')
+
+        word, self.candidates, self.solved = self.history.pop()
+        return word
@@ -0,0 +1,137 @@
+"""
+Wordle Candidate Partitions
+Goal: Split the candidates into the buckets of words that give the same clues for a guess, turn after
+turn, without starting over from the whole word list each time.
+
+A guess partitions the candidates by pattern (see pattern in word_index.py), each bucket a bitset over
+the word ids. Whatever the clues turn out to be, the candidates of the next turn are exactly one of those
+buckets, so the next turn starts from that bucket as it is, without filtering the word list with the clues.
+
+Partitions are kept per candidate set, and computed once per guess. Every turn partitions only the words
+of the bucket the turn before it ended up in, which shrinks quickly from turn to turn. The set of the next
+turn keeps a link to the set before it, so that a guess that was already partitioned on an earlier turn
+(after an undo, in a forked session, or a guess tried again) is partitioned by intersecting its buckets
+with the new set, one AND per bucket.
+
+When the patterns of every guess against every word are at hand (the matrix of feedback.py, given as
+rows), a partition reads them from there instead of working out every pattern, which keeps the first
+turns, where the sets are biggest, a few milliseconds long.
+
+The adversarial host plays Absurdle: it has not picked an answer, and answers every guess with the clues
+of its biggest bucket, so it keeps as many words open as it can for as long as it can.
+"""
+
+from word_index import clues_of_pattern, pattern
+
+ALL_GREEN = 3 ** 5 - 1
+
+
+class Partitions:
+    # the partitions of the candidates by any guess, parent is the Partitions of the turn before,
+    # rows[guess_id][word_id] the pattern of a guess against a word if they are precomputed, None if not
+    def __init__(self, index, candidates, parent=None, rows=None):
+        self.index = index
+        self.candidates = candidates
+        self.parent = parent
+        self.rows = rows
+        # guess -> {pattern: bucket}, without empty buckets
+        self.cache = {}
+        # word -> id, shared by every turn, only needed to look up rows
+        self.word_ids = parent.word_ids if parent is not None else None
+
+    # the buckets of guess as {pattern: bitset}
+    def of(self, guess):
+        buckets = self.cached(guess)
+
+        if buckets is None:
+            guess_id = self.id_of(guess)
+            if guess_id is None:
+                buckets = {}
+                words = self.index.words
+                for word_id in self.index.ids_of(self.candidates):
+                    code = pattern(guess, words[word_id])
+                    buckets[code] = buckets.get(code, 0) | 1 << word_id
+            else:
+                buckets = self.read_rows(guess_id)
+            self.cache[guess] = buckets
+
+        return buckets
+
+    # the id of guess in rows, None if there are no rows or guess is not in the word list
+    def id_of(self, guess):
+        if self.rows is None:
+            return None
+        if self.word_ids is None:
+            self.word_ids = {word: word_id for word_id, word in enumerate(self.index.words)}
+        return self.word_ids.get(guess)
+
+    # the buckets of the guess with guess_id, grouped from its row of patterns
+    def read_rows(self, guess_id):
+        # NumPy is only needed when there are rows, which come from feedback.py
+        import numpy as np
+
+        ids = np.array(self.index.ids_of(self.candidates), dtype=np.intp)
+        codes = np.asarray(self.rows[guess_id])[ids]
+        order = np.argsort(codes, kind='stable')
+        codes, ids = codes[order], ids[order]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+
+        buckets = {}
+        mask = np.zeros(len(self.index.words), dtype=bool)
+        for first, last in zip(starts, [*starts[1:], len(ids)]):
+            mask[ids[first:last]] = True
+            buckets[int(codes[first])] = int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+            mask[ids[first:last]] = False
+
+        return buckets
+
+    # the buckets of guess if this or an earlier turn already has them, None otherwise
+    def cached(self, guess):
+        buckets = self.cache.get(guess)
+        if buckets is not None or self.parent is None:
+            return buckets
+
+        earlier = self.parent.cached(guess)
+        if earlier is None:
+            return None
+
+        buckets = {}
+        for code, bucket in earlier.items():
+            bucket &= self.candidates
+            if bucket:
+                buckets[code] = bucket
+        self.cache[guess] = buckets
+
+        return buckets
+
+    # the Partitions of the next turn, when the candidates are down to bucket
+    def narrow(self, bucket):
+        return Partitions(self.index, bucket, self, self.rows)
+
+
+class AdversarialHost:
+    # an Absurdle host over the words of index, it starts with every word as a possible answer,
+    # rows are the precomputed patterns if there are any, see Partitions
+    def __init__(self, index, rows=None):
+        self.partitions = Partitions(index, index.all, rows=rows)
+        self.last_pattern = None
+
+    # the words still open
+    def candidates(self):
+        return self.partitions.candidates
+
+    # the clues for guess, as lists of the 0-based positions that are green, yellow and gray
+    def respond(self, guess):
+        buckets = self.partitions.of(guess)
+
+        # the biggest bucket keeps the most words open, a tie goes to the pattern with the least information,
+        # which is the lowest one, and the guess only wins when it is the last word left
+        code = max(buckets, key=lambda code: (buckets[code].bit_count(), -code))
+        self.partitions = self.partitions.narrow(buckets[code])
+        self.last_pattern = code
+
+        return clues_of_pattern(code)
+
+    # whether the last guess was the answer
+    def is_solved(self):
+        return self.last_pattern == ALL_GREEN
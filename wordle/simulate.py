@@ -0,0 +1,167 @@
+"""
+Wordle Simulator
+Goal: Measure how well and how fast the solver plays, by playing it against every word in the word list.
+
+Usage:
+    python simulate.py --strategy entropy
+    python simulate.py --strategy random --workers 4 --seed 1
+    python simulate.py --strategy entropy --mode hard
+    python simulate.py --strategy worst --mode absurdle --max-guesses 10
+    python simulate.py --strategy entropy --boards 4 --limit 500
+
+Every word of five_letter_words.txt is the answer of one game. The solver guesses like demo.py does,
+gets the clues of the game for each guess, and narrows down the candidates with them, until it guesses
+the answer or runs out of guesses. The games are spread over a pool of worker processes.
+
+With --mode hard every guess has to use the clues so far. With --mode absurdle there is no answer, the
+host of partition.py gives the clues that keep the most words open, and every game is the same game
+played with another seed (which only makes a difference to the random strategy).
+
+With --boards every guess is played on that many boards at once (4 for Quordle, 8 for Octordle) with the
+MultiSession of multi.py. Each game draws its answers at random with its own seed, and is won when every
+board is solved. The number of guesses defaults to the number of boards plus 5, like those games allow.
+
+The average number of guesses of the games that were won, how many games took each number of guesses,
+the failure rate, the time per game (mean, median, 95th percentile and worst) and per guess are reported.
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from multi import MultiSession
+from partition import AdversarialHost
+from solver import STRATEGIES, Solver
+from word_index import clues
+
+MODES = ('normal', 'hard', 'absurdle')
+
+# set up in each worker by start_worker
+solver = None
+
+
+def start_worker(path, strategy):
+    global solver
+    solver = Solver.from_file(path, strategy)
+
+
+def play(task):
+    """
+    Plays one game in a worker, task is (game number, mode, max guesses, seed). The game number is the id of
+    the answer, except in absurdle mode. Returns a tuple of (number of guesses, won, seconds taken).
+    """
+    game, mode, max_guesses, seed = task
+
+    start = time.perf_counter()
+    session = solver.session(random.Random(seed * len(solver.words) + game), hard=mode == 'hard')
+    host = None
+    if mode == 'absurdle':
+        host = AdversarialHost(solver.index, solver.feedback_matrix.matrix if solver.feedback_matrix is not None else None)
+
+    for attempt in range(1, max_guesses + 1):
+        word = session.next_guess()
+
+        if host is not None:
+            game_clues = host.respond(word)
+            if host.is_solved():
+                return (attempt, True, time.perf_counter() - start)
+        else:
+            if word == solver.words[game]:
+                return (attempt, True, time.perf_counter() - start)
+            game_clues = clues(word, solver.words[game])
+
+        session.apply(word, *game_clues)
+
+    return (max_guesses, False, time.perf_counter() - start)
+
+
+def play_boards(task):
+    """
+    Plays one game on several boards in a worker, task is (game number, boards, max guesses, seed).
+    Returns a tuple of (number of guesses, won, seconds taken).
+    """
+    game, boards, max_guesses, seed = task
+
+    rng = random.Random(seed * len(solver.words) + game)
+    answers = [solver.words[answer_id] for answer_id in rng.sample(range(len(solver.words)), boards)]
+
+    start = time.perf_counter()
+    session = MultiSession(solver, boards, rng)
+
+    for attempt in range(1, max_guesses + 1):
+        word = session.next_guess()
+        session.apply(word, [clues(word, answer) for answer in answers])
+
+        if session.is_solved():
+            return (attempt, True, time.perf_counter() - start)
+
+    return (max_guesses, False, time.perf_counter() - start)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play the wordle solver against every word in the word list.')
+    parser.add_argument('--words', default='five_letter_words.txt', help='the word list, also the answers')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='entropy', help='how to pick the next guess')
+    parser.add_argument('--mode', choices=MODES, default='normal', help='the rules of the game')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, defaults to the number of cores')
+    parser.add_argument('--boards', type=int, default=1, help='boards played at once, 4 for Quordle and 8 for Octordle')
+    parser.add_argument('--max-guesses', type=int, default=None, help='guesses before a game is lost, 6 for one board')
+    parser.add_argument('--limit', type=int, default=None, help='only play against the first this many words (absurdle and several boards: games, 100 by default)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random strategy')
+    arguments = parser.parse_args()
+
+    if arguments.boards < 1:
+        parser.error('--boards has to be at least 1')
+    if arguments.boards > 1 and arguments.mode != 'normal':
+        parser.error(f'--mode {arguments.mode} is only played on one board')
+    if arguments.max_guesses is None:
+        arguments.max_guesses = 6 if arguments.boards == 1 else arguments.boards + 5
+
+    # builds the feedback cache once here, instead of in every worker at the same time
+    start_worker(arguments.words, arguments.strategy)
+    if arguments.boards > 1:
+        function = play_boards
+        tasks = [(game, arguments.boards, arguments.max_guesses, arguments.seed) for game in range(arguments.limit or 100)]
+    else:
+        if arguments.mode == 'absurdle':
+            games = range(arguments.limit or 100)
+        else:
+            games = range(len(solver.words))[:arguments.limit]
+        function = play
+        tasks = [(game, arguments.mode, arguments.max_guesses, arguments.seed) for game in games]
+
+    start = time.perf_counter()
+    with Pool(arguments.workers, initializer=start_worker, initargs=(arguments.words, arguments.strategy)) as pool:
+        results = pool.map(function, tasks, chunksize=max(1, len(tasks) // 64))
+    elapsed = time.perf_counter() - start
+
+    won = [guesses for guesses, solved, _seconds in results if solved]
+    distribution = Counter(won)
+    latencies = sorted(seconds for _guesses, _solved, seconds in results)
+    games = len(results)
+
+    print(
+        f'{games} games, strategy {arguments.strategy}, mode {arguments.mode}, boards {arguments.boards}, '
+        f'{elapsed:.2f} s ({games / elapsed:.1f} games/sec)'
+    )
+    print(f'average guesses: {sum(won) / len(won) if won else 0:.3f}')
+    print(f'failure rate: {(games - len(won)) / games:.2%} ({games - len(won)} lost)')
+    for guesses in range(1, arguments.max_guesses + 1):
+        print(f'{guesses:>4}: {distribution[guesses]:>6} {"#" * round(50 * distribution[guesses] / games)}')
+    print(f'{"X":>4}: {games - len(won):>6}')
+    print(
+        f'ms/game: mean {sum(latencies) / games * 1000:.2f}, p50 {percentile(latencies, 0.5) * 1000:.2f}, '
+        f'p95 {percentile(latencies, 0.95) * 1000:.2f}, max {latencies[-1] * 1000:.2f}'
+    )
+    print(f'ms/guess: {sum(latencies) / sum(guesses for guesses, _solved, _seconds in results) * 1000:.2f}')
+
+
+# runs only when run as a script
+if __name__ == '__main__':
+    main()
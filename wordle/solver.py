@@ -0,0 +1,168 @@
+"""
+Wordle Solver Sessions
+Goal: Run any number of wordle games in one process, each with its own clues, on one shared word list.
+
+A Solver loads and indexes the word list once, and never changes afterwards. A Session is one game:
+all it holds is the set of candidates that fit the clues so far, as a bitset over the word ids of the
+Solver (see word_index.py), and the sets it had before each clue. So a session costs a few hundred
+bytes, taking back a clue is popping the last set, and forking a session to try out a guess copies
+nothing but those.
+
+Under hard mode every guess has to use the clues given so far: green letters stay where they are, and
+green and yellow letters are in the guess. A hard mode session also keeps the set of words that are
+still allowed as guesses, which the entropy, size and worst strategies choose from.
+
+Every clue narrows the candidates of the turn before, never the whole word list again: the set the clues
+of a guess leave is exactly one bucket of the partitions of partition.py, and the bitset filter of
+word_index.py works that one bucket out with a few ANDs. A session only ever needs that bucket, so it does
+not partition the candidates; the adversarial host of partition.py, which needs every bucket, does.
+
+Usage:
+    solver = Solver.from_file('five_letter_words.txt', strategy='entropy')
+    session = solver.session()
+    word = session.next_guess()
+    session.apply(word, green=[0], yellow=[3], gray=[1, 2, 4])
+"""
+
+import random
+
+from dictionary import load_index
+from word_index import WordIndex, hard_mode_violation
+
+STRATEGIES = ('random', 'entropy', 'size', 'worst')
+
+
+class Solver:
+    def __init__(self, index, strategy='random'):
+        if strategy not in STRATEGIES:
+            raise ValueError(f'unknown strategy {strategy!r}, expected one of {STRATEGIES}')
+
+        self.index = index
+        self.words = index.words
+        self.strategy = strategy
+        self.feedback_matrix = None
+
+        if strategy != 'random':
+            # NumPy is only needed for these strategies
+            from feedback import FeedbackMatrix
+            self.feedback_matrix = FeedbackMatrix(self.words)
+
+    # indexes a list of words
+    @classmethod
+    def from_words(cls, words, strategy='random'):
+        return cls(WordIndex(words), strategy)
+
+    # loads the word list file, one word per line, through its binary dictionary (see dictionary.py)
+    @classmethod
+    def from_file(cls, path, strategy='random'):
+        return cls(load_index(path), strategy)
+
+    # starts a new game, rng is the random.Random the random strategy picks with,
+    # by default the one shared by the random module, as a Random of its own takes a few kilobytes,
+    # under hard mode every guess has to use the clues given so far
+    def session(self, rng=None, hard=False):
+        return Session(self, self.index.all, [], rng or random, self.index.all if hard else None)
+
+    # the guess to make when the candidates are left, allowed is the set of words allowed as guesses,
+    # None for any word
+    def best_guess(self, candidates, rng, allowed=None):
+        if not candidates:
+            raise ValueError('no word fits all the clues')
+
+        if self.feedback_matrix is not None:
+            guess_ids = None if allowed is None or allowed == self.index.all else self.index.ids_of(allowed)
+            return self.feedback_matrix.best_guess(self.index.ids_of(candidates), self.strategy, guess_ids)
+
+        # the candidates fit every clue, so they are always allowed
+        return self.words[rng.choice(self.index.ids_of(candidates))]
+
+    # the guess to play on several boards at once, candidate_sets has the candidates of each board still
+    # being played (see multi.py)
+    def best_multi_guess(self, candidate_sets, rng):
+        if not all(candidate_sets):
+            raise ValueError('no word fits all the clues of one of the boards')
+
+        if self.feedback_matrix is not None:
+            return self.feedback_matrix.best_multi_guess([self.index.ids_of(candidates) for candidates in candidate_sets], self.strategy)
+
+        # a random candidate of the board closest to being solved
+        return self.best_guess(min(candidate_sets, key=int.bit_count), rng)
+
+
+class Session:
+    __slots__ = ('solver', 'candidates', 'history', 'rng', 'allowed')
+
+    def __init__(self, solver, candidates, history, rng, allowed=None):
+        self.solver = solver
+        self.candidates = candidates
+        # (guess, green, yellow, candidates and allowed before its clues) for every clue applied
+        self.history = history
+        self.rng = rng
+        # the words allowed as guesses under hard mode, None when not playing hard mode
+        self.allowed = allowed
+
+    # how many words still fit every clue
+    def remaining(self):
+        return self.candidates.bit_count()
+
+    # the words that still fit every clue, in word list order
+    def words(self):
+        return self.solver.index.words_of(self.candidates)
+
+    # the guesses whose clues were applied, in order
+    def guesses(self):
+        return [entry[0] for entry in self.history]
+
+    def is_hard(self):
+        return self.allowed is not None
+
+    def is_solved(self):
+        return self.remaining() == 1
+
+    def next_guess(self):
+        return self.solver.best_guess(self.candidates, self.rng, self.allowed)
+
+    # what is wrong with guessing word under hard mode, None if nothing is or if not playing hard mode
+    def violation(self, word):
+        if self.allowed is None:
+            return None
+
+        for previous_word, green, yellow, _candidates, _allowed in self.history:
+            problem = hard_mode_violation(word, previous_word, green, yellow)
+            if problem is not None:
+                return problem
+
+        return None
+
+    # narrows down the candidates with the clues of word,
+    # green, yellow and gray are the 0-based positions of each color
+    def apply(self, word, green=(), yellow=(), gray=()):
+        problem = self.violation(word)
+        if problem is not None:
+            raise ValueError(f'{word} is not allowed in hard mode, {problem}')
+
+        index = self.solver.index
+        self.history.append((word, green, yellow, self.candidates, self.allowed))
+        self.candidates = index.filter(self.candidates, word, green, yellow, gray)
+
+        if self.allowed is not None:
+            self.allowed = index.hard_mode_filter(self.allowed, word, green, yellow)
+
+        return self.remaining()
+
+    # takes back the clues of the last guess, and returns that guess
+    def undo(self):
+        if not self.history:
+            raise ValueError('there are no clues to take back')
+
+        word, _green, _yellow, self.candidates, self.allowed = self.history.pop()
+        return word
+
+    # a copy of this game that goes on separately, sharing the solver
+    def fork(self):
+        rng = self.rng
+        if rng is not random:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+
+        return Session(self.solver, self.candidates, list(self.history), rng, self.allowed)
@@ -0,0 +1,157 @@
+"""
+Wordle Word Index
+Goal: Filter the word list by the clues of a guess without going through the words one by one.
+
+Every word gets an id, its line in the word list. A set of words is a Python int used as a bitset,
+where bit i is set if word i is in the set. For every position and letter, the index keeps the set of
+words that have that letter at that position, and for every letter and count the set of words that
+have at least that many copies of the letter. Each clue is then a bitwise AND with one of those sets.
+
+Repeated letters follow the rules of the game: a guessed letter is green where it matches, then the
+other copies of it are yellow from left to right for as long as the answer has unmatched copies of
+it left, and the rest are gray. So the clues for one letter say how many copies the answer has: at
+least as many as there are green and yellow copies, and exactly that many if a copy is also gray.
+"""
+
+
+# the clues the game gives for guess when the answer is answer,
+# as lists of the 0-based positions that are green, yellow and gray
+def clues(guess, answer):
+    green = []
+    unmatched = {}
+
+    for position, (guessed, actual) in enumerate(zip(guess, answer)):
+        if guessed == actual:
+            green.append(position)
+        else:
+            unmatched[actual] = unmatched.get(actual, 0) + 1
+
+    yellow = []
+    gray = []
+    for position, guessed in enumerate(guess):
+        if position in green:
+            continue
+        if unmatched.get(guessed, 0):
+            yellow.append(position)
+            unmatched[guessed] -= 1
+        else:
+            gray.append(position)
+
+    return (green, yellow, gray)
+
+
+# the clues as a base 3 number, each position a digit (gray 0, yellow 1, green 2), the first one the lowest,
+# so that each of the 3^5 = 243 patterns fits in a byte
+def pattern_of_clues(green, yellow):
+    return sum(2 * 3 ** position for position in green) + sum(3 ** position for position in yellow)
+
+
+# the pattern of the clues for guess when the answer is answer
+def pattern(guess, answer):
+    green, yellow, _gray = clues(guess, answer)
+    return pattern_of_clues(green, yellow)
+
+
+# the clues of a pattern, as lists of the 0-based positions that are green, yellow and gray
+def clues_of_pattern(code):
+    colors = [code // 3 ** position % 3 for position in range(5)]
+    return tuple([position for position, color in enumerate(colors) if color == wanted] for wanted in (2, 1, 0))
+
+
+# what is wrong with guess under hard mode after the clues of previous_word, None if nothing is:
+# green letters have to stay where they are, and green and yellow letters have to be used again
+def hard_mode_violation(guess, previous_word, green=(), yellow=()):
+    for index in green:
+        if guess[index] != previous_word[index]:
+            return f'letter {index + 1} must be {previous_word[index].upper()}'
+
+    for letter in set(previous_word[index] for index in (*green, *yellow)):
+        found = sum(1 for index in (*green, *yellow) if previous_word[index] == letter)
+        if guess.count(letter) < found:
+            return f'the guess must contain {letter.upper()}' + (f' {found} times' if found > 1 else '')
+
+    return None
+
+
+class WordIndex:
+    def __init__(self, words):
+        self.words = list(words)
+        self.all = (1 << len(self.words)) - 1
+
+        # at[position][letter] is the set of words with letter at position
+        self.at = [{} for _ in range(5)]
+        # at_least[letter][count] is the set of words with at least count copies of letter, count 0 to 5
+        self.at_least = {}
+
+        for word_id, word in enumerate(self.words):
+            bit = 1 << word_id
+            for position, letter in enumerate(word):
+                self.at[position][letter] = self.at[position].get(letter, 0) | bit
+
+            for letter in set(word):
+                sets = self.at_least.setdefault(letter, [self.all] + [0] * 5)
+                for count in range(1, word.count(letter) + 1):
+                    sets[count] |= bit
+
+    # loads the index of a word list file, one word per line
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r') as words_file:
+            return cls(line.rstrip() for line in words_file)
+
+    # the set of words with letter at position
+    def with_letter_at(self, position, letter):
+        return self.at[position].get(letter, 0)
+
+    # the set of words with at least count copies of letter
+    def with_at_least(self, letter, count):
+        if count == 0:
+            return self.all
+        if count > 5 or letter not in self.at_least:
+            return 0
+        return self.at_least[letter][count]
+
+    # narrows down the candidates with the clues of previous_word,
+    # green, yellow and gray are the 0-based positions of each color
+    def filter(self, candidates, previous_word, green=(), yellow=(), gray=()):
+        for index in green:
+            candidates &= self.with_letter_at(index, previous_word[index])
+
+        # a yellow or gray letter is not where it was guessed, or it would have been green
+        for index in (*yellow, *gray):
+            candidates &= ~self.with_letter_at(index, previous_word[index])
+
+        # the green and yellow copies of a letter are in the word, a gray copy means there are no more than those
+        for letter in set(previous_word[index] for index in (*green, *yellow, *gray)):
+            found = sum(1 for index in (*green, *yellow) if previous_word[index] == letter)
+            candidates &= self.with_at_least(letter, found)
+
+            if any(previous_word[index] == letter for index in gray):
+                candidates &= ~self.with_at_least(letter, found + 1)
+
+        return candidates
+
+    # narrows down the words allowed as guesses under hard mode with the clues of previous_word,
+    # the same rules as hard_mode_violation
+    def hard_mode_filter(self, allowed, previous_word, green=(), yellow=()):
+        for index in green:
+            allowed &= self.with_letter_at(index, previous_word[index])
+
+        for letter in set(previous_word[index] for index in (*green, *yellow)):
+            found = sum(1 for index in (*green, *yellow) if previous_word[index] == letter)
+            allowed &= self.with_at_least(letter, found)
+
+        return allowed
+
+    # lists the ids of the words in a set, in word list order
+    def ids_of(self, candidates):
+        result = []
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            result.append(bit.bit_length() - 1)
+        return result
+
+    # lists the words in a set, in word list order
+    def words_of(self, candidates):
+        return [self.words[word_id] for word_id in self.ids_of(candidates)]